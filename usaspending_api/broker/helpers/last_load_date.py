@@ -1,7 +1,7 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
 from usaspending_api.broker import lookups
-from usaspending_api.broker.models import ExternalDataLoadDate
+from usaspending_api.broker.models import ExternalDataLoadDate, ExternalDataType
 from usaspending_api.common.helpers.date_helper import cast_datetime_to_utc
 
 
@@ -39,3 +39,17 @@ def update_last_load_date(key, last_load_date):
         external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT[key],
         defaults={"last_load_date": cast_datetime_to_utc(last_load_date)},
     )
+
+
+def touch_last_load_date(key):
+    """
+    Set the last_load_date to now.  Used for keys that version data cached by other processes rather than track a
+    load, so the external data type is created if it hasn't been loaded yet (see load_broker_static_data).
+    """
+    external_data_type = next(item for item in lookups.EXTERNAL_DATA_TYPE if item.name == key)
+    ExternalDataType.objects.update_or_create(
+        external_data_type_id=external_data_type.id,
+        name=external_data_type.name,
+        defaults={"description": external_data_type.desc},
+    )
+    update_last_load_date(key, datetime.now(timezone.utc))
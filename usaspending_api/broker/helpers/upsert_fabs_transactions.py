@@ -4,6 +4,7 @@ import time
 from copy import copy
 from datetime import datetime, timezone
 from django.db import connection, transaction
+from io import StringIO
 
 from usaspending_api.awards.models import TransactionFABS, TransactionNormalized, Award
 from usaspending_api.broker.helpers.get_business_categories import get_business_categories
@@ -15,12 +16,33 @@ from usaspending_api.common.helpers.timing_helpers import timer
 from usaspending_api.etl.award_helpers import update_awards, update_assistance_awards
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management.load_base import load_data_into_model, format_date
+from usaspending_api.etl.transaction_loaders.data_load_helpers import format_value_for_copy
 from usaspending_api.references.models import Agency
 
 
 logger = logging.getLogger("console")
 
 BATCH_FETCH_SIZE = 25000
+BULK_CREATE_BATCH_SIZE = 5000
+
+FABS_NORMALIZED_FIELD_MAP = {
+    "type": "assistance_type",
+    "description": "award_description",
+    "funding_amount": "total_funding_amount",
+}
+
+FABS_FIELD_MAP = {
+    "officer_1_name": "high_comp_officer1_full_na",
+    "officer_1_amount": "high_comp_officer1_amount",
+    "officer_2_name": "high_comp_officer2_full_na",
+    "officer_2_amount": "high_comp_officer2_amount",
+    "officer_3_name": "high_comp_officer3_full_na",
+    "officer_3_amount": "high_comp_officer3_amount",
+    "officer_4_name": "high_comp_officer4_full_na",
+    "officer_4_amount": "high_comp_officer4_amount",
+    "officer_5_name": "high_comp_officer5_full_na",
+    "officer_5_amount": "high_comp_officer5_amount",
+}
 
 
 def fetch_fabs_data_generator(dap_uid_list):
@@ -55,104 +77,216 @@ def insert_all_new_fabs(all_new_to_insert):
 
 
 def insert_new_fabs(to_insert):
-    fabs_normalized_field_map = {
-        "type": "assistance_type",
-        "description": "award_description",
-        "funding_amount": "total_funding_amount",
-    }
-
-    fabs_field_map = {
-        "officer_1_name": "high_comp_officer1_full_na",
-        "officer_1_amount": "high_comp_officer1_amount",
-        "officer_2_name": "high_comp_officer2_full_na",
-        "officer_2_amount": "high_comp_officer2_amount",
-        "officer_3_name": "high_comp_officer3_full_na",
-        "officer_3_amount": "high_comp_officer3_amount",
-        "officer_4_name": "high_comp_officer4_full_na",
-        "officer_4_amount": "high_comp_officer4_amount",
-        "officer_5_name": "high_comp_officer5_full_na",
-        "officer_5_amount": "high_comp_officer5_amount",
-    }
+    """
+    Upsert the transactions for a batch of source FABS records, creating summary awards as needed. This produces
+    the same rows as saving each record individually, but awards and existing transactions are looked up once for
+    the whole batch, and agencies come from the reference data cache.  New rows are written with bulk_create and
+    existing ones are updated together from a temp table filled with COPY (see _update_from_temp_table).
 
-    update_award_ids = []
+    Returns the award id of each record.
+    """
     for row in to_insert:
         upper_case_dict_values(row)
 
-        # Find the toptier awards from the subtier awards
-        awarding_agency = Agency.get_by_subtier_only(row["awarding_sub_tier_agency_c"])
-        funding_agency = Agency.get_by_subtier_only(row["funding_sub_tier_agency_co"])
-
-        # Create the summary Award
-        (created, award) = Award.get_or_create_summary_award(
-            generated_unique_award_id=row["unique_award_key"],
-            fain=row["fain"],
-            uri=row["uri"],
-            record_type=row["record_type"],
-        )
-        award.save()
+    awards = _get_or_create_summary_awards(to_insert)
 
-        # Append row to list of Awards updated
+    update_award_ids = []
+    transactions = {}
+    for row in to_insert:
+        award = awards[row["unique_award_key"]] if row["unique_award_key"] else _get_or_create_summary_award(row)
         update_award_ids.append(award.id)
 
-        try:
-            last_mod_date = datetime.strptime(str(row["modified_at"]), "%Y-%m-%d %H:%M:%S.%f").date()
-        except ValueError:
-            last_mod_date = datetime.strptime(str(row["modified_at"]), "%Y-%m-%d %H:%M:%S").date()
-
-        parent_txn_value_map = {
-            "award": award,
-            "awarding_agency": awarding_agency,
-            "funding_agency": funding_agency,
-            "period_of_performance_start_date": format_date(row["period_of_performance_star"]),
-            "period_of_performance_current_end_date": format_date(row["period_of_performance_curr"]),
-            "action_date": format_date(row["action_date"]),
-            "last_modified_date": last_mod_date,
-            "type_description": row["assistance_type_desc"],
-            "transaction_unique_id": row["afa_generated_unique"],
-            "business_categories": get_business_categories(row=row, data_type="fabs"),
-        }
-
-        transaction_normalized_dict = load_data_into_model(
-            TransactionNormalized(),  # thrown away
+        transaction_normalized_dict, financial_assistance_data = _build_fabs_transaction(
             row,
-            field_map=fabs_normalized_field_map,
-            value_map=parent_txn_value_map,
-            as_dict=True,
+            award,
+            Agency.get_by_subtier_only(row["awarding_sub_tier_agency_c"]),
+            Agency.get_by_subtier_only(row["funding_sub_tier_agency_co"]),
         )
+        # Loading the same transaction twice leaves the values of the last one, so only the last one is kept
+        afa_generated_unique = financial_assistance_data["afa_generated_unique"]
+        transactions.pop(afa_generated_unique, None)
+        transactions[afa_generated_unique] = (transaction_normalized_dict, financial_assistance_data)
+
+    existing_transaction_ids = {}
+    for afa_generated_unique, transaction_id in (
+        TransactionFABS.objects.filter(afa_generated_unique__in=list(transactions))
+        .order_by("-transaction_id")
+        .values_list("afa_generated_unique", "transaction_id")
+    ):
+        existing_transaction_ids[afa_generated_unique] = transaction_id  # the lowest id wins, as with first()
+
+    new_transactions = []
+    updated_transactions = []
+    for afa_generated_unique, (transaction_normalized_dict, financial_assistance_data) in transactions.items():
+        if afa_generated_unique in existing_transaction_ids:
+            updated_transactions.append(
+                (existing_transaction_ids[afa_generated_unique], transaction_normalized_dict, financial_assistance_data)
+            )
+        else:
+            new_transactions.append((transaction_normalized_dict, financial_assistance_data))
 
-        financial_assistance_data = load_data_into_model(
-            TransactionFABS(), row, field_map=fabs_field_map, as_dict=True  # thrown away
-        )
+    _update_fabs_transactions(updated_transactions)
+    _create_fabs_transactions(new_transactions)
 
-        # Hack to cut back on the number of warnings dumped to the log.
-        financial_assistance_data["updated_at"] = cast_datetime_to_utc(financial_assistance_data["updated_at"])
-        financial_assistance_data["created_at"] = cast_datetime_to_utc(financial_assistance_data["created_at"])
-        financial_assistance_data["modified_at"] = cast_datetime_to_utc(financial_assistance_data["modified_at"])
+    return update_award_ids
 
-        afa_generated_unique = financial_assistance_data["afa_generated_unique"]
-        unique_fabs = TransactionFABS.objects.filter(afa_generated_unique=afa_generated_unique)
 
-        if unique_fabs.first():
-            transaction_normalized_dict["update_date"] = datetime.now(timezone.utc)
-            transaction_normalized_dict["fiscal_year"] = fy(transaction_normalized_dict["action_date"])
+def _get_or_create_summary_awards(to_insert):
+    """
+    Bulk equivalent of Award.get_or_create_summary_award + save() for every record with a unique_award_key: existing
+    awards are matched by key, and one award per remaining key is created from the first record with that key.
+    """
+    unique_award_keys = {row["unique_award_key"] for row in to_insert if row["unique_award_key"]}
 
-            # Update TransactionNormalized
-            TransactionNormalized.objects.filter(id=unique_fabs.first().transaction.id).update(
-                **transaction_normalized_dict
+    awards = {}
+    for award in Award.objects.filter(generated_unique_award_id__in=unique_award_keys).order_by("-id"):
+        awards[award.generated_unique_award_id] = award  # the lowest id wins, as with first()
+
+    # Saving an existing award only bumps its update_date
+    Award.objects.filter(id__in=[award.id for award in awards.values()]).update(update_date=datetime.now(timezone.utc))
+
+    new_awards = {}
+    for row in to_insert:
+        unique_award_key = row["unique_award_key"]
+        if unique_award_key and unique_award_key not in awards and unique_award_key not in new_awards:
+            # The same award get_or_create_summary_award would create, which identifies FABS awards by fain or uri
+            lookup_kwargs = {}
+            if row["record_type"]:
+                lookup_field = "fain" if str(row["record_type"]) in ("2", "3") else "uri"
+                lookup_kwargs[lookup_field] = row[lookup_field]
+            new_awards[unique_award_key] = Award(
+                generated_unique_award_id=unique_award_key,
+                is_fpds=unique_award_key.startswith("CONT_"),
+                **lookup_kwargs,
             )
+    Award.objects.bulk_create(new_awards.values(), batch_size=BULK_CREATE_BATCH_SIZE)
+
+    return {**awards, **new_awards}
+
+
+def _get_or_create_summary_award(row):
+    (created, award) = Award.get_or_create_summary_award(
+        generated_unique_award_id=row["unique_award_key"],
+        fain=row["fain"],
+        uri=row["uri"],
+        record_type=row["record_type"],
+    )
+    award.save()
+    return award
+
+
+def _build_fabs_transaction(row, award, awarding_agency, funding_agency):
+    """Returns the TransactionNormalized and TransactionFABS field values for a source record"""
+    try:
+        last_mod_date = datetime.strptime(str(row["modified_at"]), "%Y-%m-%d %H:%M:%S.%f").date()
+    except ValueError:
+        last_mod_date = datetime.strptime(str(row["modified_at"]), "%Y-%m-%d %H:%M:%S").date()
+
+    parent_txn_value_map = {
+        "award": award,
+        "awarding_agency": awarding_agency,
+        "funding_agency": funding_agency,
+        "period_of_performance_start_date": format_date(row["period_of_performance_star"]),
+        "period_of_performance_current_end_date": format_date(row["period_of_performance_curr"]),
+        "action_date": format_date(row["action_date"]),
+        "last_modified_date": last_mod_date,
+        "type_description": row["assistance_type_desc"],
+        "transaction_unique_id": row["afa_generated_unique"],
+        "business_categories": get_business_categories(row=row, data_type="fabs"),
+    }
 
-            # Update TransactionFABS
-            unique_fabs.update(**financial_assistance_data)
-        else:
-            # Create TransactionNormalized
-            transaction_normalized = TransactionNormalized(**transaction_normalized_dict)
-            transaction_normalized.save()
+    transaction_normalized_dict = load_data_into_model(
+        TransactionNormalized(),  # thrown away
+        row,
+        field_map=FABS_NORMALIZED_FIELD_MAP,
+        value_map=parent_txn_value_map,
+        as_dict=True,
+    )
+
+    financial_assistance_data = load_data_into_model(
+        TransactionFABS(), row, field_map=FABS_FIELD_MAP, as_dict=True  # thrown away
+    )
+
+    # Hack to cut back on the number of warnings dumped to the log.
+    financial_assistance_data["updated_at"] = cast_datetime_to_utc(financial_assistance_data["updated_at"])
+    financial_assistance_data["created_at"] = cast_datetime_to_utc(financial_assistance_data["created_at"])
+    financial_assistance_data["modified_at"] = cast_datetime_to_utc(financial_assistance_data["modified_at"])
+
+    return transaction_normalized_dict, financial_assistance_data
+
+
+def _update_fabs_transactions(updated_transactions):
+    """Bulk equivalent of filter(...).update(...) on TransactionNormalized and TransactionFABS for each transaction"""
+    if not updated_transactions:
+        return
+
+    transactions_normalized = []
+    transactions_fabs = []
+    normalized_fields = set()
+    fabs_fields = set()
+    update_date = datetime.now(timezone.utc)
+    for transaction_id, transaction_normalized_dict, financial_assistance_data in updated_transactions:
+        transaction_normalized_dict["update_date"] = update_date
+        transaction_normalized_dict["fiscal_year"] = fy(transaction_normalized_dict["action_date"])
+        normalized_fields.update(transaction_normalized_dict)
+        fabs_fields.update(financial_assistance_data)
+        transactions_normalized.append(TransactionNormalized(id=transaction_id, **transaction_normalized_dict))
+        transactions_fabs.append(TransactionFABS(transaction_id=transaction_id, **financial_assistance_data))
+
+    _update_from_temp_table(TransactionNormalized, transactions_normalized, normalized_fields - {"id"})
+    _update_from_temp_table(TransactionFABS, transactions_fabs, fabs_fields - {"transaction", "transaction_id"})
+
+
+def _update_from_temp_table(model, instances, field_names):
+    """
+    Update the given fields of each instance's row, matched on the primary key, by staging the new values in a temp
+    table with one COPY and applying them with one UPDATE ... FROM. This replaces bulk_update, whose UPDATE has a
+    CASE WHEN with a branch per row for every column and so grows to megabytes of SQL for a batch of FABS rows.
+    """
+    table = model._meta.db_table
+    temp_table = f"temp_{table}_update"
+    fields = [model._meta.pk, *(model._meta.get_field(name) for name in sorted(field_names))]
+    column_sql = ",".join(f'"{field.column}"' for field in fields)
+    pk_column = model._meta.pk.column
+
+    rows = StringIO()
+    for instance in instances:
+        values = (field.get_db_prep_save(getattr(instance, field.attname), connection) for field in fields)
+        rows.write("\t".join(format_value_for_copy(value) for value in values) + "\n")
+    rows.seek(0)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Within an outer transaction a previous batch's temp table may still be around
+        cursor.execute(f"DROP TABLE IF EXISTS {temp_table}")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {temp_table} ON COMMIT DROP AS SELECT {column_sql} FROM {table} LIMIT 0"
+        )
+        cursor.copy_expert(f"COPY {temp_table} ({column_sql}) FROM STDIN", rows)
+        set_sql = ",".join(f'"{field.column}" = u."{field.column}"' for field in fields[1:])
+        cursor.execute(
+            f'UPDATE {table} AS t SET {set_sql} FROM {temp_table} AS u WHERE t."{pk_column}" = u."{pk_column}"'
+        )
 
-            # Create TransactionFABS
-            transaction_fabs = TransactionFABS(transaction=transaction_normalized, **financial_assistance_data)
-            transaction_fabs.save()
 
-    return update_award_ids
+def _create_fabs_transactions(new_transactions):
+    """Bulk equivalent of saving a new TransactionNormalized and TransactionFABS for each transaction"""
+    if not new_transactions:
+        return
+
+    transactions_normalized = []
+    for transaction_normalized_dict, _ in new_transactions:
+        transaction_normalized = TransactionNormalized(**transaction_normalized_dict)
+        transaction_normalized.fiscal_year = fy(transaction_normalized.action_date)  # set by save(), not bulk_create()
+        transactions_normalized.append(transaction_normalized)
+    TransactionNormalized.objects.bulk_create(transactions_normalized, batch_size=BULK_CREATE_BATCH_SIZE)
+
+    TransactionFABS.objects.bulk_create(
+        [
+            TransactionFABS(transaction=transaction_normalized, **financial_assistance_data)
+            for transaction_normalized, (_, financial_assistance_data) in zip(transactions_normalized, new_transactions)
+        ],
+        batch_size=BULK_CREATE_BATCH_SIZE,
+    )
 
 
 def upsert_fabs_transactions(ids_to_upsert, externally_updated_award_ids):
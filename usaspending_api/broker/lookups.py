@@ -16,6 +16,16 @@ EXTERNAL_DATA_TYPE = [
     # "opposite" side of the broker data load, data from USAspending DB -> Elasticsearch
     LookupType(100, "es_transactions", "Load elasticsearch with transactions from USAspending"),
     LookupType(101, "es_awards", "Load elasticsearch with awards from USAspending"),
+    # reference data versions, used to invalidate usaspending_api.references.reference_data_cache
+    LookupType(200, "reference_agency", "Agency reference data"),
+    LookupType(201, "reference_country_code", "Country code reference data"),
+    LookupType(202, "reference_object_class", "Object class reference data"),
+    LookupType(203, "reference_disaster_emergency_fund_code", "Disaster emergency fund code reference data"),
+    LookupType(204, "reference_cfda", "CFDA program reference data"),
+    LookupType(205, "reference_psc", "Product and service code reference data"),
+    LookupType(206, "reference_naics", "NAICS reference data"),
+    # version of the data served by the API, used to key usaspending_api.common.cache_decorator responses
+    LookupType(300, "api_data_version", "Data served by the API"),
 ]
 EXTERNAL_DATA_TYPE_DICT = {item.name: item.id for item in EXTERNAL_DATA_TYPE}
 EXTERNAL_DATA_TYPE_DICT_ID = {item.id: item.name for item in EXTERNAL_DATA_TYPE}
@@ -26,6 +26,7 @@ class Command(BaseCommand):
     help = "Sync USAspending DB FPDS data using source transaction for new or modified records and S3 for deleted IDs"
 
     modified_award_ids = []
+    batch_load = False
 
     @staticmethod
     def get_cursor_for_date_query(connection, date, count=False):
@@ -65,7 +66,7 @@ class Command(BaseCommand):
                 if len(id_list) == 0:
                     break
                 logger.info("Loading batch (size: {}) from date query...".format(len(id_list)))
-                self.modified_award_ids.extend(load_fpds_transactions([row[0] for row in id_list]))
+                self.modified_award_ids.extend(load_fpds_transactions([row[0] for row in id_list], self.batch_load))
                 records_processed = records_processed + len(id_list)
                 logger.info("{} out of {} processed".format(records_processed, total_records))
 
@@ -88,7 +89,7 @@ class Command(BaseCommand):
                 id_list = [int(re.search(r"\d+", x).group()) for x in next_batch]
                 total_count += len(id_list)
                 logger.info(f"Loading next batch (size: {len(id_list)}, ids {id_list[0]}-{id_list[-1]})...")
-                self.modified_award_ids.extend(load_fpds_transactions(id_list))
+                self.modified_award_ids.extend(load_fpds_transactions(id_list, self.batch_load))
 
         logger.info(f"Total transaction IDs in file: {total_count}")
 
@@ -139,11 +140,18 @@ class Command(BaseCommand):
             action="store_true",
             help="Script will load or reload all FPDS records in source tables, from all time. This does NOT clear the USAspending database first",
         )
+        parser.add_argument(
+            "--batch-load",
+            action="store_true",
+            help="Load each chunk of transactions with a few set-based statements instead of row by row. A chunk "
+            "that fails is reloaded row by row to identify the failing records.",
+        )
 
     def handle(self, *args, **options):
 
         # Record script execution start time to update the FPDS last updated date in DB as appropriate
         update_time = datetime.now(timezone.utc)
+        self.batch_load = options["batch_load"]
 
         if options["reload_all"]:
             self.load_fpds_incrementally(None)
@@ -152,7 +160,7 @@ class Command(BaseCommand):
             self.load_fpds_incrementally(options["date"])
 
         elif options["ids"]:
-            self.modified_award_ids.extend(load_fpds_transactions(options["ids"]))
+            self.modified_award_ids.extend(load_fpds_transactions(options["ids"], self.batch_load))
 
         elif options["file"]:
             self.load_fpds_from_file(options["file"])
@@ -0,0 +1,77 @@
+import pytest
+
+from datetime import datetime
+from model_mommy import mommy
+
+from usaspending_api.awards.models import Award, TransactionNormalized, TransactionFABS
+from usaspending_api.broker.helpers.upsert_fabs_transactions import insert_new_fabs
+from usaspending_api.references.models import Agency, SubtierAgency
+
+
+def _source_row(afa_generated_unique, unique_award_key, record_type=2, action_date="2020-01-15"):
+    return {
+        "afa_generated_unique": afa_generated_unique,
+        "unique_award_key": unique_award_key,
+        "record_type": record_type,
+        "fain": f"fain_{afa_generated_unique}",
+        "uri": f"uri_{afa_generated_unique}",
+        "awarding_sub_tier_agency_c": "0001",
+        "funding_sub_tier_agency_co": "0002",
+        "assistance_type": "02",
+        "assistance_type_desc": "block grant",
+        "award_description": "description",
+        "total_funding_amount": 100,
+        "federal_action_obligation": 100,
+        "action_date": action_date,
+        "period_of_performance_star": "2020-01-01",
+        "period_of_performance_curr": "2020-12-31",
+        "business_types": "R",
+        "created_at": datetime(2020, 1, 1),
+        "updated_at": datetime(2020, 1, 2),
+        "modified_at": datetime(2020, 1, 3),
+        **{f"high_comp_officer{i}_full_na": None for i in range(1, 6)},
+        **{f"high_comp_officer{i}_amount": None for i in range(1, 6)},
+    }
+
+
+@pytest.mark.django_db
+def test_insert_new_fabs_creates_and_updates_in_bulk():
+    awarding_agency = mommy.make(Agency, subtier_agency=mommy.make(SubtierAgency, subtier_code="0001"))
+    # Two agencies share the funding subtier code, so neither is used
+    funding_subtier = mommy.make(SubtierAgency, subtier_code="0002")
+    mommy.make(Agency, subtier_agency=funding_subtier, _quantity=2)
+
+    mommy.make(Award, id=1, generated_unique_award_id="ASST_AWARD_1")
+    mommy.make(TransactionNormalized, id=1, award_id=1, transaction_unique_id="AFA_1")
+    mommy.make(TransactionFABS, transaction_id=1, afa_generated_unique="AFA_1")
+
+    rows = [
+        _source_row("afa_1", "asst_award_1", action_date="2020-11-01"),
+        _source_row("afa_2", "asst_award_1"),
+        _source_row("afa_3", "asst_award_2", record_type=1),
+        _source_row("afa_4", "asst_award_2"),
+    ]
+    update_award_ids = insert_new_fabs(rows)
+
+    new_award = Award.objects.get(generated_unique_award_id="ASST_AWARD_2")
+    assert update_award_ids == [1, 1, new_award.id, new_award.id]
+    assert Award.objects.count() == 2
+    # Created from the first record with that key: record type 1 awards are identified by uri
+    assert new_award.uri == "URI_AFA_3"
+    assert new_award.fain is None
+
+    # The existing transaction is updated in place, including its fiscal year
+    updated = TransactionNormalized.objects.get(id=1)
+    assert updated.fiscal_year == 2021
+    assert updated.awarding_agency_id == awarding_agency.id
+    assert updated.funding_agency_id is None
+    assert "small_business" in updated.business_categories
+    assert TransactionFABS.objects.get(transaction_id=1).fain == "FAIN_AFA_1"
+
+    new_transactions = {t.transaction_unique_id: t for t in TransactionNormalized.objects.exclude(id=1)}
+    assert set(new_transactions) == {"AFA_2", "AFA_3", "AFA_4"}
+    assert new_transactions["AFA_2"].award_id == 1
+    assert new_transactions["AFA_3"].award_id == new_award.id
+    assert new_transactions["AFA_4"].fiscal_year == 2020
+    assert "small_business" in new_transactions["AFA_4"].business_categories
+    assert TransactionFABS.objects.get(afa_generated_unique="AFA_4").transaction_id == new_transactions["AFA_4"].id
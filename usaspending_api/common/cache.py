@@ -1,10 +1,16 @@
-import hashlib
-import json
+import logging
+import time
 
+from django.conf import settings
 from rest_framework_extensions.key_constructor import bits
 from rest_framework_extensions.key_constructor.constructors import DefaultKeyConstructor
 
-from usaspending_api.common.helpers.dict_helpers import order_nested_object
+from usaspending_api.broker.helpers.last_load_date import get_last_load_date, touch_last_load_date
+from usaspending_api.common.helpers.dict_helpers import fingerprint_nested_object
+
+logger = logging.getLogger("console")
+
+DATA_VERSION_KEY = "api_data_version"
 
 
 class PathKeyBit(bits.QueryParamsKeyBit):
@@ -19,7 +25,8 @@ class PathKeyBit(bits.QueryParamsKeyBit):
 class GetPostQueryParamsKeyBit(bits.QueryParamsKeyBit):
     """
     Override QueryParamsKey method in drf-extensions to ensure that the query params part of our cache key includes
-    directives in a POST request (i.e., request.data) as well as GET parameters
+    directives in a POST request (i.e., request.data) as well as GET parameters.  The parameters are reduced to their
+    fingerprint here so that large filter payloads are only walked once.
     """
 
     def get_source_dict(self, params, view_instance, view_method, request, args, kwargs):
@@ -27,7 +34,39 @@ class GetPostQueryParamsKeyBit(bits.QueryParamsKeyBit):
         params.update(dict(request.data))
         if "auditTrail" in params:
             del params["auditTrail"]
-        return {"request": json.dumps(order_nested_object(params))}
+        return {"request": fingerprint_nested_object(params)}
+
+
+_data_version = {"version": None, "checked_at": None}
+
+
+def get_data_version():
+    """
+    The last time an ETL called bump_data_version.  Each process checks it at most every
+    API_CACHE_DATA_VERSION_CHECK_SECONDS.  None when API responses are not cached.
+    """
+    if settings.CACHES["usaspending-cache"]["BACKEND"] == "django.core.cache.backends.dummy.DummyCache":
+        return None  # Nothing is cached so don't bother looking the version up
+    now = time.monotonic()
+    checked_at = _data_version["checked_at"]
+    if checked_at is None or now - checked_at >= settings.API_CACHE_DATA_VERSION_CHECK_SECONDS:
+        try:
+            last_load_date = get_last_load_date(DATA_VERSION_KEY)
+            _data_version["version"] = last_load_date.isoformat() if last_load_date else None
+        except Exception:
+            logger.exception("Problem while retrieving the data version.  Keeping the previous version.")
+        _data_version["checked_at"] = now
+    return _data_version["version"]
+
+
+class DataVersionKeyBit(bits.KeyBitBase):
+    """
+    Adds the version of the data (see get_data_version) to the key so that responses cached before an ETL changed the
+    data are no longer used, without having to clear the cache.
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        return get_data_version()
 
 
 class USAspendingKeyConstructor(DefaultKeyConstructor):
@@ -38,12 +77,17 @@ class USAspendingKeyConstructor(DefaultKeyConstructor):
 
     path_bit = PathKeyBit()
     request_params = GetPostQueryParamsKeyBit()
+    data_version = DataVersionKeyBit()
 
     def prepare_key(self, key_dict):
-        # Order the key_dict using the order_nested_object function to make sure cache keys are always exactly the same
-        ordered_key_dict = json.dumps(order_nested_object(key_dict))
-        key_hex = hashlib.md5(ordered_key_dict.encode("utf-8")).hexdigest()
-        return key_hex
+        # The fingerprint is independent of the key_dict's order so cache keys are always exactly the same
+        return fingerprint_nested_object(key_dict)
 
 
 usaspending_key_func = USAspendingKeyConstructor()
+
+
+def bump_data_version():
+    """ Called by ETLs that change data served by the API so that responses cached before the change are replaced. """
+    touch_last_load_date(DATA_VERSION_KEY)
+    logger.info("Bumped the API data version.  Previously cached API responses will no longer be used.")
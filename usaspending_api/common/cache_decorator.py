@@ -1,15 +1,35 @@
 # -*- coding: utf-8 -*-
 import logging
+import threading
+import time
+import uuid
+import zlib
 
+from collections import OrderedDict
 from collections.abc import Iterable
 from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
 from django.db.models import QuerySet
+from django.http import HttpResponse
 from rest_framework_extensions.cache.decorators import CacheResponse
-from typing import Any
+from typing import Any, Optional, Tuple
 from usaspending_api.common.experimental_api_flags import is_experimental_elasticsearch_api
 
 logger = logging.getLogger("console")
 
+# zlib level 6 shrinks JSON responses to roughly a tenth of their size; higher levels cost far more for little gain
+COMPRESSION_LEVEL = 6
+
+# Headers set per request that must not be replayed from a cached response
+UNCACHED_HEADERS = ("Cache-Trace", "key")
+
+# How often a request coalesced with one in another process checks whether that response has been cached
+SINGLE_FLIGHT_POLL_SECONDS = 0.1
+
+# Cache keys of the responses being rendered by this process, each with an event set once the render is done
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
 
 def contains_queryset(data: Any) -> bool:
     """Traverse a complex object and return True if a Queryset exists anywhere"""
@@ -26,7 +46,94 @@ def contains_queryset(data: Any) -> bool:
         return False
 
 
+class LocalResponseCache:
+    """
+    Bounded, per-process LRU of cached responses that sits in front of the shared cache so hot responses are
+    served without a network round trip.  Entries expire after ttl seconds and the least recently used entries
+    are evicted once the cached responses add up to more than max_bytes.
+
+    Clearing the shared cache doesn't reach these copies in other processes.  Cache keys include the data version
+    (see DataVersionKeyBit) so copies cached before bump_data_version are no longer looked up once each process
+    rechecks the version, at most API_CACHE_DATA_VERSION_CHECK_SECONDS later.
+    """
+
+    def __init__(self, max_bytes: int, ttl: int):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, size, payload = entry
+            if expires <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key: str, payload: tuple, ttl: Optional[int] = None) -> None:
+        size = _payload_size(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + min(ttl or self.ttl, self.ttl), size, payload)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: str) -> None:
+        self._size -= self._entries.pop(key)[1]
+
+
+local_response_cache = LocalResponseCache(settings.API_LOCAL_CACHE_MAX_BYTES, settings.API_LOCAL_CACHE_TTL_SECONDS)
+
+
+def serialize_response(response: HttpResponse) -> Tuple[int, list, bytes]:
+    """Reduce a rendered response to its status code, headers, and compressed body for caching"""
+    headers = [(header, value) for header, value in response.items() if header not in UNCACHED_HEADERS]
+    return response.status_code, headers, zlib.compress(response.content, COMPRESSION_LEVEL)
+
+
+def deserialize_response(payload: Tuple[int, list, bytes]) -> HttpResponse:
+    status_code, headers, body = payload
+    response = HttpResponse(content=zlib.decompress(body), status=status_code)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+def _payload_size(payload: Tuple[int, list, bytes]) -> int:
+    return len(payload[2]) + sum(len(header) + len(value) for header, value in payload[1])
+
+
 class CustomCacheResponse(CacheResponse):
+    """
+    Caches rendered responses in two tiers: a per-process LRU (see LocalResponseCache) in front of the shared
+    usaspending-cache.  Only the status code, headers, and compressed body are cached rather than the pickled
+    Response object.  The Cache-Trace header reports which tier, if any, served the response.
+
+    Concurrent identical requests that miss the cache are coalesced (see coalesce) so that only one of them runs
+    the view while the others wait for its response to be cached.
+    """
+
+    def __init__(self, *args, local_cache: Optional[LocalResponseCache] = local_response_cache, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Without a shared cache there is nothing to keep the per-process copies consistent with, so skip them too
+        self.enabled = not isinstance(self.cache, DummyCache)
+        self.local_cache = local_cache if self.enabled else None
+
     def process_cache_response(self, view_instance, view_method, request, args, kwargs):
         if is_experimental_elasticsearch_api(request):
             # bypass cache altogether
@@ -37,49 +144,141 @@ class CustomCacheResponse(CacheResponse):
         key = self.calculate_key(
             view_instance=view_instance, view_method=view_method, request=request, args=args, kwargs=kwargs
         )
-        response = None
+
+        def render_response():
+            return self.render_and_cache_response(key, view_instance, view_method, request, args, kwargs)
+
+        response = self.get_cached_response(key, request)
+        if not response:
+            response = self.coalesce(key, request, render_response) if self.enabled else render_response()
+
+        if not hasattr(response, "_closable_objects"):
+            response._closable_objects = []
+
+        response["key"] = key
+        return response
+
+    def get_cached_response(self, key, request):
+        if self.local_cache is not None:
+            payload = self.local_cache.get(key)
+            if payload is not None:
+                response = deserialize_response(payload)
+                response["Cache-Trace"] = "hit-local-cache"
+                return response
+
         try:
-            response = self.cache.get(key)
+            payload = self.cache.get(key)
         except Exception:
             msg = "Problem while retrieving key [{k}] from cache for path:'{p}'"
             logger.exception(msg.format(k=key, p=str(request.path)))
+            return None
 
-        if not response:
-            response = view_method(view_instance, request, *args, **kwargs)
-            response = view_instance.finalize_response(request, response, *args, **kwargs)
+        # Anything else was cached in an older format and is treated as a miss
+        if not isinstance(payload, tuple):
+            return None
+        response = deserialize_response(payload)
+        response["Cache-Trace"] = "hit-cache"
+        if self.local_cache is not None:
+            self.local_cache.set(key, payload, self.timeout)
+        return response
 
-            # While returning a Queryset is functional most of the time, it isn't
-            # fully supported by Django Rest Framework. This check was inserted
-            # in local mode to catch if a Queryset is being returned by the view
-            # which could cause an exception when setting the cache
-            if settings.IS_LOCAL and response and not response.is_rendered:
-                if contains_queryset(response.data):
-                    raise RuntimeError(
-                        "Your view is returning a QuerySet. QuerySets are not"
-                        " really designed to be pickled and can cause caching"
-                        " issues. Please materialize the QuerySet using a List"
-                        " or some other more primitive data structure."
-                    )
+    def coalesce(self, key, request, render_response):
+        """
+        Makes concurrent identical requests wait for the first of them (the leader) to render and cache the
+        response rather than all running the view.  Requests in this process wait on the leader directly.  When
+        API_SINGLE_FLIGHT_CROSS_PROCESS is set the leader also takes a lock in the shared cache, and a leader that
+        finds the lock held waits for the other process instead.  Anyone still without a cached response after
+        waiting API_SINGLE_FLIGHT_WAIT_SECONDS (or after the leader failed to cache one) renders it themselves.
+        """
+        with _in_flight_lock:
+            in_flight = _in_flight.get(key)
+            is_leader = in_flight is None
+            if is_leader:
+                in_flight = _in_flight[key] = threading.Event()
 
-            response["Cache-Trace"] = "no-cache"
-            response.render()  # should be rendered, before pickling while storing to cache
+        if not is_leader:
+            in_flight.wait(settings.API_SINGLE_FLIGHT_WAIT_SECONDS)
+            return self.get_coalesced_response(key, request) or render_response()
 
-            if not response.status_code >= 400 or self.cache_errors:
-                if self.cache_errors:
-                    logger.error(self.cache_errors)
+        lock_key = f"{key}:single-flight"
+        lock_token = uuid.uuid4().hex
+        has_lock = False
+        try:
+            if settings.API_SINGLE_FLIGHT_CROSS_PROCESS:
+                try:
+                    has_lock = self.cache.add(lock_key, lock_token, settings.API_SINGLE_FLIGHT_WAIT_SECONDS)
+                except Exception:
+                    logger.exception(f"Problem while acquiring single flight lock [{lock_key}]")
+                if not has_lock:
+                    response = self.wait_for_other_process(key, lock_key, request)
+                    if response:
+                        return response
+            return render_response()
+        finally:
+            if has_lock:
                 try:
-                    self.cache.set(key, response, self.timeout)
-                    response["Cache-Trace"] = "set-cache"
+                    # A render slower than the lock's timeout may find the lock expired and taken by another process
+                    if self.cache.get(lock_key) == lock_token:
+                        self.cache.delete(lock_key)
                 except Exception:
-                    msg = "Problem while writing to cache: path:'{p}' data:'{d}'"
-                    logger.exception(msg.format(p=str(request.path), d=str(request.data)))
-        else:
-            response["Cache-Trace"] = "hit-cache"
+                    logger.exception(f"Problem while releasing single flight lock [{lock_key}]")
+            with _in_flight_lock:
+                del _in_flight[key]
+            in_flight.set()
 
-        if not hasattr(response, "_closable_objects"):
-            response._closable_objects = []
+    def wait_for_other_process(self, key, lock_key, request):
+        deadline = time.monotonic() + settings.API_SINGLE_FLIGHT_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(SINGLE_FLIGHT_POLL_SECONDS)
+            response = self.get_coalesced_response(key, request)
+            if response:
+                return response
+            try:
+                if not self.cache.get(lock_key):
+                    break  # The other process finished without caching a response
+            except Exception:
+                break
+        return None
+
+    def get_coalesced_response(self, key, request):
+        response = self.get_cached_response(key, request)
+        if response:
+            response["Cache-Trace"] = "hit-coalesced"
+        return response
+
+    def render_and_cache_response(self, key, view_instance, view_method, request, args, kwargs):
+        response = view_method(view_instance, request, *args, **kwargs)
+        response = view_instance.finalize_response(request, response, *args, **kwargs)
+
+        # While returning a Queryset is functional most of the time, it isn't
+        # fully supported by Django Rest Framework. This check was inserted
+        # in local mode to catch if a Queryset is being returned by the view
+        # which could cause an exception when setting the cache
+        if settings.IS_LOCAL and response and not response.is_rendered:
+            if contains_queryset(response.data):
+                raise RuntimeError(
+                    "Your view is returning a QuerySet. QuerySets are not"
+                    " really designed to be pickled and can cause caching"
+                    " issues. Please materialize the QuerySet using a List"
+                    " or some other more primitive data structure."
+                )
+
+        response["Cache-Trace"] = "no-cache"
+        response.render()  # should be rendered, before serializing while storing to cache
+
+        if not response.status_code >= 400 or self.cache_errors:
+            if self.cache_errors:
+                logger.error(self.cache_errors)
+            try:
+                payload = serialize_response(response)
+                self.cache.set(key, payload, self.timeout)
+                if self.local_cache is not None:
+                    self.local_cache.set(key, payload, self.timeout)
+                response["Cache-Trace"] = "set-cache"
+            except Exception:
+                msg = "Problem while writing to cache: path:'{p}' data:'{d}'"
+                logger.exception(msg.format(p=str(request.path), d=str(request.data)))
 
-        response["key"] = key
         return response
 
 
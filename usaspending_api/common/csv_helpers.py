@@ -1,7 +1,10 @@
 import codecs
 import csv
+import mmap
 import os
 
+from typing import List, Tuple
+
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
 
 
@@ -79,6 +82,84 @@ def partition_large_delimited_file(
     return new_csv_list
 
 
+def partition_and_count_delimited_file(
+    file_path: str,
+    row_limit: int = 10000,
+    output_name_template: str = "output_%s.csv",
+    keep_headers: bool = True,
+    quotechar: str = '"',
+) -> Tuple[List[str], int]:
+    """Splits a delimited file into partitions of at most `row_limit` rows and counts its rows in the same pass.
+
+    Unlike `partition_large_delimited_file` the rows are never parsed or re-serialized. The file is memory-mapped and
+    scanned line by line for record terminators; a newline only ends a record when the quote characters seen so far
+    in that record are balanced (an escaped quote is doubled, so it never changes the balance). Each partition is
+    then a byte range of the source, copied as-is behind a copy of the header. The delimiter doesn't matter here.
+
+    Returns the list of partition file paths and the number of rows, excluding the header.
+    """
+    quote = quotechar.encode()
+    output_path = os.path.dirname(file_path)
+    new_file_list = []
+    row_count = 0
+
+    with open(file_path, "rb") as source_file:
+        if os.fstat(source_file.fileno()).st_size == 0:
+            # mmap can't map an empty file; mirror the single (empty) partition of the non-empty case
+            empty_path = os.path.join(output_path, output_name_template % 1)
+            open(empty_path, "wb").close()
+            return [empty_path], 0
+
+        with mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as source:
+            header_end = _find_record_end(source, 0, quote) if keep_headers else 0
+            header = source[:header_end]
+
+            partition_start = header_end
+            for record_end in _iter_record_ends(source, header_end, quote):
+                row_count += 1
+                if row_count % row_limit == 0:
+                    partition_path = os.path.join(output_path, output_name_template % (len(new_file_list) + 1))
+                    _write_byte_range(source, header, partition_start, record_end, partition_path)
+                    new_file_list.append(partition_path)
+                    partition_start = record_end
+
+            if partition_start < len(source) or not new_file_list:
+                partition_path = os.path.join(output_path, output_name_template % (len(new_file_list) + 1))
+                _write_byte_range(source, header, partition_start, len(source), partition_path)
+                new_file_list.append(partition_path)
+
+    return new_file_list, row_count
+
+
+def _iter_record_ends(source, start: int, quote: bytes):
+    """Yields the offset just past each record in `source`, beginning at `start`"""
+    size = len(source)
+    position = start
+    in_quotes = False
+    while position < size:
+        newline = source.find(b"\n", position)
+        if newline == -1:
+            # The final record has no trailing newline
+            yield size
+            return
+        if source[position:newline].count(quote) % 2:
+            in_quotes = not in_quotes
+        position = newline + 1
+        if not in_quotes:
+            yield position
+
+
+def _find_record_end(source, start: int, quote: bytes) -> int:
+    return next(_iter_record_ends(source, start, quote), start)
+
+
+def _write_byte_range(source, header: bytes, start: int, end: int, partition_path: str, chunk_size: int = 2 ** 24):
+    with open(partition_path, "wb") as partition_file:
+        partition_file.write(header)
+        for chunk_start in range(start, end, chunk_size):
+            partition_file.write(source[chunk_start : min(chunk_start + chunk_size, end)])
+
+
 def read_csv_file_as_list_of_dictionaries(file_path):
     """
     Read in the specified CSV file and return as a list of dictionaries ("records").
@@ -0,0 +1,135 @@
+"""
+Serialization of the "*_agg_key" fields that Elasticsearch terms aggregations group on.  Each key holds the values the
+API displays for a bucket so that they don't have to be looked up after the aggregation.
+
+Keys have been written as JSON objects, which the API then parses for every returned bucket.  The compact format
+instead writes the name and version of the key's schema followed by the values of the schema's fields, in order,
+separated by ASCII unit separators.  With "|" standing in for the separator, a state key looks like
+
+    state.1|USA|VA|VIRGINIA|8000000
+
+The ETL writes the compact format when ES_COMPACT_AGG_KEYS is on.  Turn it on only when building new indexes: the
+recipient key is also the routing value, so documents loaded into an existing index must keep the format that index
+was built with.  decode_agg_key reads both formats so the API works against either index while they are rebuilt.
+
+Views sort buckets on _key to sort on the first value of the key, usually a name.  Compact keys sort on their values in
+plain string order, so "ACME" comes before "ACME CORP".  That is not quite the order of JSON keys, where the closing
+quote of a value and JSON's escaping take part in the comparison, so sorted results change slightly once an index is
+rebuilt with compact keys.  Every key of a schema is written in the compact format so they all sort together: a value
+the format can't hold as is (a null, a value containing a control character, a number that isn't an integer, ...) is
+marked and written in place, and sorts before the other values of its field.
+"""
+import json
+
+from django.conf import settings
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+AGG_KEY_VERSION = "1"
+AGG_KEY_DECODE_CACHE_SIZE = 2 ** 16
+
+_SEPARATOR = "\x1f"
+_NULL = "\x1e"
+_JSON = "\x1d"  # Starts a value written as JSON, which escapes all three of these characters
+_RESERVED = (_SEPARATOR, _NULL, _JSON)
+
+# Fields in the order they are written to the key, which is the order of the JSON objects so that buckets are sorted
+# on the same value in either format.  The schema of a key is found by its field names.
+_AGG_KEY_SCHEMAS = {
+    "award_recipient": ("name", "unique_id", "hash", "levels"),
+    "transaction_recipient": ("name", "unique_id", "hash_with_level"),
+    "agency": ("name", "abbreviation", "code", "id"),
+    "agency_abbreviation": ("name", "abbreviation", "id"),
+    "agency_code": ("name", "code", "id"),
+    "agency_name": ("name", "id"),
+    "code": ("code", "description"),
+    "county": ("country_code", "state_code", "state_fips", "county_code", "county_name", "population"),
+    "congressional": ("country_code", "state_code", "state_fips", "congressional_code", "population"),
+    "state": ("country_code", "state_code", "state_name", "population"),
+    "country": ("country_code", "country_name"),
+}
+_SCHEMA_BY_FIELDS = {fields: f"{schema}.{AGG_KEY_VERSION}" for schema, fields in _AGG_KEY_SCHEMAS.items()}
+
+
+def _encode_json(value) -> str:
+    return _JSON + json.dumps(value)
+
+
+def _encode_str(value) -> str:
+    if value is None:
+        return _NULL
+    if type(value) is str and not any(char in value for char in _RESERVED):
+        return value
+    return _encode_json(value)
+
+
+def _encode_int(value) -> str:
+    if value is None:
+        return _NULL
+    return str(value) if type(value) is int else _encode_json(value)
+
+
+def _encode_levels(value) -> str:
+    """Recipient levels are either a non-empty list of one letter levels or an empty string when unknown"""
+    if value == "":
+        return ""
+    if type(value) is list and value and all(type(level) is str and len(level) == 1 for level in value):
+        return _encode_str("".join(value))
+    return _encode_json(value)
+
+
+def _decode_str(value: str) -> Optional[str]:
+    return None if value == _NULL else value
+
+
+def _decode_int(value: str) -> Optional[int]:
+    return None if value == _NULL else int(value)
+
+
+def _decode_levels(value: str):
+    return list(value) if value else ""
+
+
+_ENCODERS = {"id": _encode_int, "population": _encode_int, "levels": _encode_levels}
+_DECODERS = {"id": _decode_int, "population": _decode_int, "levels": _decode_levels}
+
+_DECODERS_BY_SCHEMA = {
+    f"{schema}.{AGG_KEY_VERSION}": tuple((field, _DECODERS.get(field, _decode_str)) for field in fields)
+    for schema, fields in _AGG_KEY_SCHEMAS.items()
+}
+
+
+def encode_compact_agg_key(values: dict) -> Optional[str]:
+    """Compact key for the values, or None when their fields aren't those of a schema"""
+    schema = _SCHEMA_BY_FIELDS.get(tuple(values))
+    if schema is None:
+        return None
+    return _SEPARATOR.join([schema, *(_ENCODERS.get(field, _encode_str)(value) for field, value in values.items())])
+
+
+def encode_agg_key(values: dict) -> str:
+    """Dictionary key order impacts Elasticsearch behavior!!!"""
+    if settings.ES_COMPACT_AGG_KEYS:
+        return encode_compact_agg_key(values) or json.dumps(values)
+    return json.dumps(values)
+
+
+@lru_cache(maxsize=AGG_KEY_DECODE_CACHE_SIZE)
+def decode_agg_key(key: str) -> Mapping:
+    """
+    Values of an aggregation key in either format.  Keys of popular buckets are returned for request after request so
+    the decoded values are cached and shared; they are read-only.
+    """
+    if _SEPARATOR not in key:  # JSON escapes control characters so only compact keys hold a raw separator
+        return MappingProxyType(json.loads(key))
+    schema, *values = key.split(_SEPARATOR)
+    decoders = _DECODERS_BY_SCHEMA.get(schema)
+    if decoders is None or len(decoders) != len(values):
+        raise ValueError(f"Unrecognized aggregation key: {key!r}")
+    return MappingProxyType(
+        {
+            field: json.loads(value[1:]) if value.startswith(_JSON) else decode(value)
+            for (field, decode), value in zip(decoders, values)
+        }
+    )
@@ -1,7 +1,9 @@
-from typing import Union, Optional
+from typing import Callable, Dict, Union, Optional
 
 import certifi
 import logging
+import os
+import threading
 
 from django.conf import settings
 from elasticsearch import Elasticsearch
@@ -14,9 +16,48 @@ logger = logging.getLogger("console")
 CLIENT = None
 ElasticsearchResponse = Optional[Union[dict, Response]]
 
+# Elasticsearch clients are thread safe and each one holds a pool of kept-alive HTTP connections per cluster node, so
+# every process shares one client per configuration instead of opening new connections for every search.  Clients are
+# never shared across a fork since the parent and child would then read and write the same sockets.
+_SHARED_CLIENTS: Dict[str, Elasticsearch] = {}
+_SHARED_CLIENTS_PID = None
+_SHARED_CLIENTS_LOCK = threading.Lock()
+_SHARED_CLIENT_USES: Dict[str, int] = {}
+
+
+def _pooling_config() -> dict:
+    config = {"maxsize": settings.ES_CONNECTIONS_PER_NODE}
+    if settings.ES_SNIFF:
+        config.update(
+            {
+                "sniff_on_start": True,
+                "sniff_on_connection_fail": True,
+                "sniffer_timeout": settings.ES_SNIFFER_TIMEOUT_SECONDS,
+            }
+        )
+    return config
+
+
+def _shared_client(name: str, create_client: Callable[[], Optional[Elasticsearch]]) -> Optional[Elasticsearch]:
+    """Return this process's client for `name`, creating it with `create_client` the first time it is needed"""
+    global _SHARED_CLIENTS_PID
+    with _SHARED_CLIENTS_LOCK:
+        if _SHARED_CLIENTS_PID != os.getpid():
+            _SHARED_CLIENTS.clear()
+            _SHARED_CLIENT_USES.clear()
+            _SHARED_CLIENTS_PID = os.getpid()
+        key = f"{name} {settings.ES_HOSTNAME}"
+        if key not in _SHARED_CLIENTS:
+            client = create_client()
+            if client is None:
+                return None
+            _SHARED_CLIENTS[key] = client
+        _SHARED_CLIENT_USES[key] = _SHARED_CLIENT_USES.get(key, 0) + 1
+        return _SHARED_CLIENTS[key]
 
-def instantiate_elasticsearch_client() -> Elasticsearch:
-    es_kwargs = {"timeout": 300}
+
+def _new_etl_client() -> Elasticsearch:
+    es_kwargs = {"timeout": 300, **_pooling_config()}
 
     if "https" in settings.ES_HOSTNAME:
         es_kwargs.update({"use_ssl": True, "verify_certs": True, "ca_certs": certifi.where()})
@@ -24,11 +65,10 @@ def instantiate_elasticsearch_client() -> Elasticsearch:
     return Elasticsearch(settings.ES_HOSTNAME, **es_kwargs)
 
 
-def create_es_client() -> Elasticsearch:
+def _new_search_client() -> Optional[Elasticsearch]:
     if settings.ES_HOSTNAME is None or settings.ES_HOSTNAME == "":
         logger.error("env var 'ES_HOSTNAME' needs to be set for Elasticsearch connection")
-    global CLIENT
-    es_config = {"hosts": [settings.ES_HOSTNAME], "timeout": settings.ES_TIMEOUT}
+    es_config = {"hosts": [settings.ES_HOSTNAME], "timeout": settings.ES_TIMEOUT, **_pooling_config()}
     try:
         # If the connection string is using SSL with localhost, disable verifying
         # the certificates to allow testing in a development environment
@@ -43,6 +83,50 @@ def create_es_client() -> Elasticsearch:
             ssl_context.verify_mode = CERT_NONE
             es_config["ssl_context"] = ssl_context
 
-        CLIENT = Elasticsearch(**es_config)
+        return Elasticsearch(**es_config)
     except Exception as e:
         logger.error("Error creating the elasticsearch client: {}".format(e))
+
+
+def instantiate_elasticsearch_client() -> Elasticsearch:
+    """Client for the ETL: long timeout and verified certificates"""
+    return _shared_client("etl", _new_etl_client)
+
+
+def create_es_client() -> Elasticsearch:
+    """Client for API searches (see search_wrappers)"""
+    global CLIENT
+    CLIENT = _shared_client("search", _new_search_client)
+    return CLIENT
+
+
+def _idle_connections(pool) -> int:
+    """urllib3 fills a new pool's queue with None placeholders, which are only replaced by connections once used"""
+    if pool.pool is None:
+        return 0
+    with pool.pool.mutex:
+        return sum(1 for connection in pool.pool.queue if connection is not None)
+
+
+def es_client_pool_metrics() -> Dict[str, dict]:
+    """
+    Utilization of this process's shared clients.  For each node, "idle" is the number of kept-alive connections
+    waiting in the pool and "opened" the number of connections ever opened; "opened" growing well past "maxsize"
+    means the pool is too small for the concurrent searches and connections are being thrown away after use.
+    """
+    metrics = {}
+    with _SHARED_CLIENTS_LOCK:
+        if _SHARED_CLIENTS_PID != os.getpid():
+            return metrics
+        for key, client in _SHARED_CLIENTS.items():
+            nodes = {}
+            for connection in client.transport.connection_pool.connections:
+                pool = connection.pool
+                nodes[connection.host] = {
+                    "maxsize": pool.maxsize,
+                    "idle": _idle_connections(pool),
+                    "opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                }
+            metrics[key] = {"uses": _SHARED_CLIENT_USES.get(key, 0), "nodes": nodes}
+    return metrics
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark of fingerprint_nested_object against the order_nested_object, json.dumps and MD5 steps it replaced
+when building API cache keys, on a typical search request and on requests with long filter lists.  Run it from the
+root of the repo with the same environment as the API:
+
+    python -m usaspending_api.common.helpers.benchmark_fingerprint_nested_object
+"""
+import django
+import hashlib
+import json
+import os
+import random
+
+from timeit import repeat
+
+REPEAT = 3
+
+CACHE_KEY_BITS = {
+    "unique_method_id": "SpendingByAwardVisualizationViewSet.post",
+    "format": "json",
+    "language": "en-us",
+    "data_version": "2020-10-01T00:00:00",
+}
+
+
+def generate_requests():
+    random.seed(1)
+    return {
+        "typical": {
+            "filters": {
+                "time_period": [{"start_date": "2019-10-01", "end_date": "2020-09-30"}],
+                "award_type_codes": ["A", "B", "C", "D"],
+                "agencies": [{"type": "awarding", "tier": "toptier", "name": "Department of Defense"}],
+            },
+            "fields": ["Award ID", "Recipient Name", "Award Amount"],
+            "page": 1,
+            "limit": 60,
+            "sort": "Award Amount",
+            "order": "desc",
+        },
+        "5,000 award ids": {
+            "filters": {
+                "award_ids": [f"AWARD{random.randint(0, 10 ** 9)}" for _ in range(5000)],
+                "award_type_codes": ["A", "B"],
+            },
+            "page": 1,
+        },
+        "3,000 TAS filter tree nodes": {
+            "filters": {
+                "tas_codes": {
+                    "require": [
+                        [f"0{i % 99:02}", f"0{i % 99:02}-{i:04}", f"0{i % 99:02}-X-{i:04}-000"] for i in range(3000)
+                    ]
+                }
+            }
+        },
+    }
+
+
+def main():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "usaspending_api.settings")
+    django.setup()
+    from usaspending_api.common.helpers.dict_helpers import fingerprint_nested_object, order_nested_object
+
+    def ordered_md5_key(request):
+        key_bits = {"request_params": {"request": json.dumps(order_nested_object(request))}, **CACHE_KEY_BITS}
+        return hashlib.md5(json.dumps(order_nested_object(key_bits)).encode()).hexdigest()
+
+    def fingerprint_key(request):
+        key_bits = {"request_params": {"request": fingerprint_nested_object(request)}, **CACHE_KEY_BITS}
+        return fingerprint_nested_object(key_bits)
+
+    for name, request in generate_requests().items():
+        number = 2000 if name == "typical" else 20
+        before = min(repeat(lambda: ordered_md5_key(request), number=number, repeat=REPEAT)) / number
+        after = min(repeat(lambda: fingerprint_key(request), number=number, repeat=REPEAT)) / number
+        print(f"{name}: {before * 1e6:,.0f}us ordered MD5, {after * 1e6:,.0f}us fingerprint ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
+import hashlib
+import json
+
 from collections import OrderedDict
 from usaspending_api.search.filters.elasticsearch.naics import NaicsCodes
 from usaspending_api.search.filters.elasticsearch.tas import TasCodes
 from usaspending_api.search.filters.mixins.psc import PSCCodesMixin
 
 
+FILTER_TREE_KEYS = (NaicsCodes.underscore_name, PSCCodesMixin.underscore_name, TasCodes.underscore_name)
+
+
 def upper_case_dict_values(input_dict):
     for key in input_dict:
         if isinstance(input_dict[key], str):
@@ -67,8 +73,7 @@ def order_nested_object(nested_object):
                 (
                     key,
                     order_nested_filter_tree_object(nested_object[key])
-                    if key in (NaicsCodes.underscore_name, PSCCodesMixin.underscore_name, TasCodes.underscore_name)
-                    and isinstance(nested_object[key], dict)
+                    if key in FILTER_TREE_KEYS and isinstance(nested_object[key], dict)
                     else order_nested_object(nested_object[key]),
                 )
                 for key in sorted(nested_object.keys())
@@ -76,3 +81,59 @@ def order_nested_object(nested_object):
         )
     else:
         return nested_object
+
+
+def canonical_encode(nested_object):
+    """
+    Encode a JSON-like object to bytes such that objects order_nested_object would make equal (dict keys and lists in
+    any order, except for the positional inner lists of filter trees) encode the same.  Only lists are put in order
+    here; json.dumps sorts the dict keys while it encodes, so the object is serialized once.
+    """
+    return json.dumps(_canonical_lists(nested_object), sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+def _canonical_lists(nested_object):
+    if isinstance(nested_object, dict):
+        return {
+            key: _canonical_filter_tree(value)
+            if key in FILTER_TREE_KEYS and isinstance(value, dict)
+            else _canonical_lists(value)
+            for key, value in nested_object.items()
+        }
+    elif isinstance(nested_object, (list, tuple)):
+        if _is_scalar_list(nested_object):
+            return sorted(nested_object)  # By far the most common, so skip the recursion
+        return _sorted_canonically([_canonical_lists(element) for element in nested_object])
+    else:
+        return nested_object
+
+
+def _canonical_filter_tree(nested_object):
+    """ See order_nested_filter_tree_object.  The outer require and exclude lists are sorted, the inner ones aren't. """
+    return {
+        key: _sorted_canonically(value)
+        if key in ("require", "exclude") and isinstance(value, list)
+        else _canonical_lists(value)
+        for key, value in nested_object.items()
+    }
+
+
+def _is_scalar_list(elements):
+    element_types = set(map(type, elements))
+    return len(element_types) == 1 and next(iter(element_types)) in (str, int, float)
+
+
+def _sorted_canonically(elements):
+    try:
+        return sorted(elements)
+    except TypeError:
+        # Dicts and mixed types can't be compared so they are sorted by their encoding instead
+        return sorted(elements, key=lambda element: json.dumps(element, sort_keys=True, default=str))
+
+
+def fingerprint_nested_object(nested_object):
+    """
+    Hex digest of the canonical encoding of a JSON-like object (see canonical_encode), e.g. for cache keys.  BLAKE2b
+    is faster than MD5 and a 16 byte digest is the same length as an MD5 one.
+    """
+    return hashlib.blake2b(canonical_encode(nested_object), digest_size=16).hexdigest()
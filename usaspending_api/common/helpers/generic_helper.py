@@ -1,3 +1,5 @@
+import base64
+import json
 import logging
 import re
 import shutil
@@ -11,6 +13,8 @@ from dateutil import parser
 from django.conf import settings
 from django.db import connection
 from fiscalyear import datetime
+from usaspending_api.common.exceptions import InvalidParameterException
+from usaspending_api.common.helpers.dict_helpers import fingerprint_nested_object
 from usaspending_api.common.matview_manager import (
     OVERLAY_VIEWS,
     DEPENDENCY_FILEPATH,
@@ -187,6 +191,31 @@ def get_simple_pagination_metadata(results_plus_one, limit, page):
     return page_metadata
 
 
+def encode_pagination_cursor(sort_values: list, context: dict) -> str:
+    """
+    Opaque token for keyset pagination: the sort values of the last record on a page plus a fingerprint of the
+    request (filters, sort, order, ...) the values belong to, so the token can't be used with a different request.
+    """
+    cursor = {"after": sort_values, "context": fingerprint_nested_object(context)}
+    encoded_cursor = json.dumps(cursor, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(encoded_cursor).decode().rstrip("=")
+
+
+def decode_pagination_cursor(cursor: str, context: dict) -> list:
+    """Return the sort values of an encode_pagination_cursor token after checking it was issued for this request"""
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        sort_values, cursor_context = decoded["after"], decoded["context"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidParameterException("Field 'cursor' is not a cursor returned by this endpoint")
+    if not isinstance(sort_values, list) or cursor_context != fingerprint_nested_object(context):
+        raise InvalidParameterException(
+            "Field 'cursor' does not match this request.  Cursors only work with the filters, sort, and order of the"
+            " request that returned them"
+        )
+    return sort_values
+
+
 def get_generic_filters_message(original_filters, allowed_filters):
     retval = [get_time_period_message()]
     if set(original_filters).difference(allowed_filters):
@@ -2,11 +2,14 @@ import logging
 from django.core.management.base import BaseCommand
 from django.core.cache import caches
 
+from usaspending_api.common.cache import bump_data_version
+
 
 class Command(BaseCommand):
     """
     This command will clear the usaspending-cache (useful after a load or a deletion
-    to ensure end users don't see stale data)
+    to ensure end users don't see stale data).  It also bumps the API data version since
+    clearing the shared cache doesn't reach the responses each API process keeps locally.
     """
 
     help = "Clears the usaspending-cache"
@@ -16,4 +19,5 @@ class Command(BaseCommand):
         self.logger.info("Clearing usaspending-cache...")
         cache = caches["usaspending-cache"]
         cache.clear()
+        bump_data_version()
         self.logger.info("Done.")
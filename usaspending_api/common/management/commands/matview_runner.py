@@ -7,6 +7,7 @@ from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from pathlib import Path
 
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.data_connectors.async_sql_query import async_run_creates
 from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
 from usaspending_api.common.matview_manager import (
@@ -97,6 +98,7 @@ class Command(BaseCommand):
             self.create_views()
             if not self.no_cleanup:
                 self.cleanup()
+            bump_data_version()
 
     @staticmethod
     def clean_or_create_dir(dir_path):
@@ -0,0 +1,112 @@
+import json
+import logging
+import threading
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from time import perf_counter
+
+
+logger = logging.getLogger("console")
+
+# Host of the requests made by django.test.Client
+REPLAY_HOST = "testserver"
+
+
+class Command(BaseCommand):
+    """
+    Replays the most frequently requested API calls found in the server logs so their responses are cached (under the
+    current data version, see usaspending_api.common.cache) before users ask for them.  Meant to be run after the
+    loads that bump the data version.
+
+    Only POST requests are replayed since the logged path of a GET request lacks its query string.  Replayed requests
+    are logged like any other, with the test client's host, and are left out of later runs so they don't count
+    toward the most common requests.
+    """
+
+    help = "Warms the usaspending-cache by replaying the most common cached API requests from server logs"
+
+    top = 100
+    workers = 4
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "request_logs",
+            nargs="+",
+            help=(
+                "One or more server log files (JSON lines as written by usaspending_api.common.logging."
+                "LoggingMiddleware) to find the most common requests in.  Only successful POST requests for cached "
+                "endpoints are replayed."
+            ),
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=self.top,
+            help=f"Number of the most frequent requests to replay.  Default is {self.top:,}.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=self.workers,
+            help=f"Number of requests to replay at the same time.  Default is {self.workers:,}.",
+        )
+
+    def handle(self, *args, **options):
+        if options["top"] < 1 or options["workers"] < 1:
+            raise CommandError("--top and --workers must be at least 1")
+
+        requests = self.find_most_common_requests(options["request_logs"], options["top"])
+        logger.info(f"Replaying the {len(requests):,} most common requests using {options['workers']:,} workers")
+
+        start = perf_counter()
+        results = Counter()
+        clients = threading.local()
+
+        def replay(request):
+            if not hasattr(clients, "client"):
+                clients.client = Client()
+            return self.replay_request(clients.client, *request)
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = {executor.submit(replay, request): request for request in requests}
+            for future in as_completed(futures):
+                path, _ = futures[future]
+                try:
+                    status_code, cache_trace = future.result()
+                except Exception:
+                    logger.exception(f"Problem while replaying POST {path}")
+                    results["error"] += 1
+                    continue
+                if status_code >= 400:
+                    logger.warning(f"POST {path} returned {status_code}")
+                results[cache_trace or f"status {status_code}"] += 1
+
+        summary = ", ".join(f"{count:,} {result}" for result, count in results.most_common())
+        logger.info(f"Warmed the cache in {perf_counter() - start:.2f}s ({summary or 'nothing to replay'})")
+
+    @staticmethod
+    def find_most_common_requests(request_logs, top):
+        requests = Counter()
+        for request_log in request_logs:
+            with open(request_log) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Not every line of a server log is a request
+                    if not isinstance(entry, dict) or "cache_key" not in entry:
+                        continue
+                    if str(entry.get("status_code")) != "200" or entry.get("method") != "POST":
+                        continue
+                    if entry.get("host") == REPLAY_HOST:
+                        continue  # Replayed by an earlier run
+                    requests[(entry["path"], entry.get("request") or "")] += 1
+        return [request for request, count in requests.most_common(top)]
+
+    @staticmethod
+    def replay_request(client, path, body):
+        response = client.post(path, data=body, content_type="application/json")
+        return response.status_code, response.get("Cache-Trace")
@@ -0,0 +1,51 @@
+import json
+import pytest
+
+from usaspending_api.common.cache import DataVersionKeyBit, bump_data_version
+from usaspending_api.common.management.commands.warm_usaspending_cache import Command as WarmCacheCommand
+
+
+@pytest.mark.django_db
+def test_bump_data_version_changes_cache_key(settings):
+    locmem_cache = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    settings.CACHES = {**settings.CACHES, "usaspending-cache": locmem_cache}
+    settings.API_CACHE_DATA_VERSION_CHECK_SECONDS = 0
+    key_bit = DataVersionKeyBit()
+
+    assert key_bit.get_data(None, None, None, None, None, None) is None
+    bump_data_version()
+    first_version = key_bit.get_data(None, None, None, None, None, None)
+    assert first_version is not None
+    bump_data_version()
+    assert key_bit.get_data(None, None, None, None, None, None) > first_version
+
+
+def test_warm_cache_finds_most_common_requests(tmp_path):
+    def log_line(path, request, status_code=200, cache_key="abc", method="POST", host="api.usaspending.gov"):
+        entry = {"method": method, "path": path, "request": request, "status_code": status_code, "host": host}
+        if cache_key:
+            entry["cache_key"] = cache_key
+        return json.dumps(entry)
+
+    request_log = tmp_path / "server.log"
+    request_log.write_text(
+        "\n".join(
+            [
+                log_line("/api/v2/search/spending_by_category/awarding_agency/", '{"filters": {}}'),
+                "not a request",
+                log_line("/api/v2/search/spending_over_time/", '{"group": "fiscal_year"}'),
+                log_line("/api/v2/search/spending_over_time/", '{"group": "fiscal_year"}'),
+                log_line("/api/v2/search/spending_over_time/", '{"group": "month"}', status_code=400),
+                log_line("/api/v2/download/awards/", "{}", cache_key=None),
+                log_line("/api/v2/references/glossary/", "", method="GET"),
+                log_line("/api/v2/search/spending_by_category/awarding_agency/", '{"filters": {}}', host="testserver"),
+                log_line("/api/v2/search/spending_by_category/awarding_agency/", '{"filters": {}}', host="testserver"),
+            ]
+        )
+    )
+
+    assert WarmCacheCommand.find_most_common_requests([str(request_log)], 5) == [
+        ("/api/v2/search/spending_over_time/", '{"group": "fiscal_year"}'),
+        ("/api/v2/search/spending_by_category/awarding_agency/", '{"filters": {}}'),
+    ]
+    assert len(WarmCacheCommand.find_most_common_requests([str(request_log)], 1)) == 1
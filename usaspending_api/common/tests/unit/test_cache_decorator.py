@@ -0,0 +1,157 @@
+import threading
+import time
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from unittest.mock import Mock, patch
+
+from usaspending_api.common.cache_decorator import (
+    CustomCacheResponse,
+    LocalResponseCache,
+    deserialize_response,
+    serialize_response,
+)
+
+
+def _payload(body_size):
+    return 200, [("Content-Type", "application/json")], b"x" * body_size
+
+
+def test_local_response_cache_evicts_least_recently_used():
+    # Each payload is 100 bytes of body plus 28 bytes of headers so three fit
+    cache = LocalResponseCache(max_bytes=3 * 128 + 50, ttl=60)
+    for key in ("a", "b", "c"):
+        cache.set(key, _payload(100))
+    assert cache.get("a") is not None  # "b" is now the least recently used
+
+    cache.set("d", _payload(100))
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in ("a", "c", "d")] == [True, True, True]
+
+    # Too big to ever fit
+    cache.set("e", _payload(1000))
+    assert cache.get("e") is None
+
+
+def test_local_response_cache_expires_entries():
+    cache = LocalResponseCache(max_bytes=10000, ttl=60)
+    with patch("usaspending_api.common.cache_decorator.time.monotonic", return_value=1000):
+        cache.set("short", _payload(10), ttl=5)
+        cache.set("long", _payload(10), ttl=600)  # capped at the cache's own ttl
+    with patch("usaspending_api.common.cache_decorator.time.monotonic", return_value=1010):
+        assert cache.get("short") is None
+        assert cache.get("long") is not None
+    with patch("usaspending_api.common.cache_decorator.time.monotonic", return_value=1061):
+        assert cache.get("long") is None
+
+
+def test_serialize_response_round_trip():
+    response = HttpResponse(b'{"results": []}' * 100, status=200, content_type="application/json")
+    response["Cache-Trace"] = "no-cache"
+    response["Allow"] = "POST, OPTIONS"
+
+    payload = serialize_response(response)
+    assert len(payload[2]) < len(response.content)
+
+    cached = deserialize_response(payload)
+    assert cached.content == response.content
+    assert cached.status_code == 200
+    assert cached["Content-Type"] == "application/json"
+    assert cached["Allow"] == "POST, OPTIONS"
+    assert not cached.has_header("Cache-Trace")
+
+
+class _RenderedResponse(HttpResponse):
+    is_rendered = True
+
+    def render(self):
+        return self
+
+
+def test_concurrent_identical_requests_are_coalesced(settings):
+    settings.API_SINGLE_FLIGHT_WAIT_SECONDS = 5
+    caches["default"].clear()
+    decorator = CustomCacheResponse(cache="default", key_func=lambda **kwargs: "coalesced-key")
+    decorator.local_cache = LocalResponseCache(max_bytes=10000, ttl=60)
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def view_method(view_instance, request):
+        started.set()
+        release.wait(5)
+        return _RenderedResponse(b"expensive")
+
+    view_method = Mock(side_effect=view_method)
+    view_instance = Mock(finalize_response=lambda request, response: response)
+    request = Mock(META={}, path="/api/v2/search/spending_by_category/", data={})
+
+    traces = []
+
+    def call_view():
+        response = decorator.process_cache_response(view_instance, view_method, request, (), {})
+        traces.append((response["Cache-Trace"], response.content))
+
+    threads = [threading.Thread(target=call_view) for _ in range(5)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.2)  # let the followers line up behind the leader
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert view_method.call_count == 1
+    assert sorted(traces) == [("hit-coalesced", b"expensive")] * 4 + [("set-cache", b"expensive")]
+
+
+def test_single_flight_lock_is_only_released_by_its_holder(settings):
+    settings.API_SINGLE_FLIGHT_CROSS_PROCESS = True
+    cache = caches["default"]
+    cache.clear()
+    decorator = CustomCacheResponse(cache="default", key_func=lambda **kwargs: "lock-key")
+    request = Mock(META={}, path="/api/v2/search/spending_by_category/", data={})
+
+    def render_response():
+        assert cache.get("lock-key:single-flight") is not None
+        return _RenderedResponse(b"rendered")
+
+    decorator.coalesce("lock-key", request, render_response)
+    assert cache.get("lock-key:single-flight") is None
+
+    def slow_render_response():
+        # The lock expired during the render and another process took it
+        cache.set("lock-key:single-flight", "other-process")
+        return _RenderedResponse(b"rendered")
+
+    decorator.coalesce("lock-key", request, slow_render_response)
+    assert cache.get("lock-key:single-flight") == "other-process"
+
+
+def test_cache_tiers_are_checked_in_order():
+    caches["default"].clear()
+    local_cache = LocalResponseCache(max_bytes=10000, ttl=60)
+    decorator = CustomCacheResponse(cache="default", key_func=lambda **kwargs: "tiered-key", local_cache=local_cache)
+    view_method = Mock(return_value=_RenderedResponse(b"rendered"))
+    view_instance = Mock(finalize_response=lambda request, response: response)
+    request = Mock(META={}, path="/api/v2/search/spending_by_category/", data={})
+
+    def call_view():
+        response = decorator.process_cache_response(view_instance, view_method, request, (), {})
+        return response["Cache-Trace"], response.content
+
+    assert call_view() == ("set-cache", b"rendered")
+    assert call_view() == ("hit-local-cache", b"rendered")
+
+    # Another process has yet to cache the response locally
+    local_cache.clear()
+    assert call_view() == ("hit-cache", b"rendered")
+    assert call_view() == ("hit-local-cache", b"rendered")
+
+    assert view_method.call_count == 1
+
+
+def test_local_cache_is_skipped_without_shared_cache():
+    decorator = CustomCacheResponse(cache="usaspending-cache", local_cache=LocalResponseCache(max_bytes=10000, ttl=60))
+    assert decorator.local_cache is None
@@ -0,0 +1,55 @@
+import csv
+
+from usaspending_api.common.csv_helpers import partition_and_count_delimited_file
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        csv.writer(f, lineterminator="\n").writerows(rows)
+
+
+def _read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_partition_and_count_respects_quoted_newlines(tmp_path):
+    header = ["id", "description"]
+    rows = [[str(i), f'line one\nline "{i}", two' if i % 2 else "plain"] for i in range(7)]
+    source_path = tmp_path / "source.csv"
+    _write_csv(source_path, [header] + rows)
+
+    files, row_count = partition_and_count_delimited_file(
+        str(source_path), row_limit=3, output_name_template="part_%s.csv"
+    )
+
+    assert row_count == 7
+    assert files == [str(tmp_path / f"part_{i}.csv") for i in (1, 2, 3)]
+    assert _read_csv(files[0]) == [header] + rows[:3]
+    assert _read_csv(files[1]) == [header] + rows[3:6]
+    assert _read_csv(files[2]) == [header] + rows[6:]
+
+
+def test_partition_and_count_copies_bytes_unchanged(tmp_path):
+    source_path = tmp_path / "source.txt"
+    source_path.write_bytes(b'a|b\n1|""\n2|\n3|"x\r\ny"')  # no trailing newline on the last record
+
+    files, row_count = partition_and_count_delimited_file(str(source_path), row_limit=2)
+
+    assert row_count == 3
+    assert (tmp_path / "output_1.csv").read_bytes() == b'a|b\n1|""\n2|\n'
+    assert (tmp_path / "output_2.csv").read_bytes() == b'a|b\n3|"x\r\ny"'
+    assert len(files) == 2
+
+
+def test_partition_and_count_header_only_and_exact_multiple(tmp_path):
+    source_path = tmp_path / "source.csv"
+    _write_csv(source_path, [["id"]])
+    files, row_count = partition_and_count_delimited_file(str(source_path), row_limit=2)
+    assert row_count == 0
+    assert [_read_csv(f) for f in files] == [[["id"]]]
+
+    _write_csv(source_path, [["id"], ["1"], ["2"], ["3"], ["4"]])
+    files, row_count = partition_and_count_delimited_file(str(source_path), row_limit=2)
+    assert row_count == 4
+    assert [_read_csv(f) for f in files] == [[["id"], ["1"], ["2"]], [["id"], ["3"], ["4"]]]
@@ -0,0 +1,32 @@
+from unittest.mock import patch
+
+from usaspending_api.common.elasticsearch.client import (
+    create_es_client,
+    es_client_pool_metrics,
+    instantiate_elasticsearch_client,
+)
+from usaspending_api.common.elasticsearch.search_wrappers import AwardSearch, TransactionSearch
+
+
+def test_clients_are_shared_within_a_process(settings):
+    settings.ES_HOSTNAME = "http://es.example.com:9200"
+    settings.ES_CONNECTIONS_PER_NODE = 7
+
+    client = create_es_client()
+    assert AwardSearch()._using is client
+    assert TransactionSearch()._using is client
+    assert instantiate_elasticsearch_client() is not client
+    assert instantiate_elasticsearch_client() is instantiate_elasticsearch_client()
+
+    metrics = es_client_pool_metrics()[f"search {settings.ES_HOSTNAME}"]
+    assert metrics["uses"] == 3
+    assert metrics["nodes"]["http://es.example.com:9200"]["maxsize"] == 7
+    assert metrics["nodes"]["http://es.example.com:9200"]["idle"] == 0
+
+    # A forked child process gets its own clients
+    with patch("usaspending_api.common.elasticsearch.client.os.getpid", return_value=-1):
+        assert create_es_client() is not client
+
+    # So does a different cluster
+    settings.ES_HOSTNAME = "http://other.example.com:9200"
+    assert create_es_client() is not client
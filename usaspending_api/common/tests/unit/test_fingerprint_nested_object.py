@@ -0,0 +1,42 @@
+from usaspending_api.common.helpers.dict_helpers import canonical_encode, fingerprint_nested_object
+
+
+def test_fingerprint_ignores_key_and_list_order():
+    first = {
+        "filters": {"award_type_codes": ["A", "B"], "agencies": [{"type": "awarding", "name": "X"}, {"name": "Y"}]},
+        "page": 1,
+    }
+    second = {
+        "page": 1,
+        "filters": {"agencies": [{"name": "Y"}, {"name": "X", "type": "awarding"}], "award_type_codes": ["B", "A"]},
+    }
+    assert fingerprint_nested_object(first) == fingerprint_nested_object(second)
+    assert len(fingerprint_nested_object(first)) == 32
+
+
+def test_fingerprint_distinguishes_values():
+    fingerprints = {
+        fingerprint_nested_object(value)
+        for value in (None, True, 1, "1", 1.0, [], {}, [1], ["1"], {"a": "b"}, {"ab": ""}, {"a": ["b"]}, ["a", "b"])
+    }
+    assert len(fingerprints) == 13
+
+    assert canonical_encode(["ab", "c"]) != canonical_encode(["a", "bc"])
+    assert canonical_encode([1, "a", {"b": 2}]) == canonical_encode([{"b": 2}, "a", 1])
+
+
+def test_fingerprint_filter_tree_inner_lists_are_positional():
+    def tas_filter(require):
+        return {"filters": {"tas_codes": {"require": require}}}
+
+    assert fingerprint_nested_object(tas_filter([["A", "B"], ["C"]])) == fingerprint_nested_object(
+        tas_filter([["C"], ["A", "B"]])
+    )
+    assert fingerprint_nested_object(tas_filter([["A", "B"]])) != fingerprint_nested_object(tas_filter([["B", "A"]]))
+
+    # Legacy list style filters and other keys are not filter trees
+    legacy_tas_filter = fingerprint_nested_object({"tas_codes": [["A", "B"]]})
+    assert legacy_tas_filter == fingerprint_nested_object({"tas_codes": [["B", "A"]]})
+    assert fingerprint_nested_object({"other": {"require": [["A", "B"]]}}) == fingerprint_nested_object(
+        {"other": {"require": [["B", "A"]]}}
+    )
@@ -25,6 +25,7 @@ from usaspending_api.conftest_helpers import (
     ensure_broker_server_dblink_exists,
     remove_unittest_queue_data_files,
 )
+from usaspending_api.references.reference_data_cache import clear_reference_data_caches
 
 
 logger = logging.getLogger("console")
@@ -122,6 +123,14 @@ def django_db_setup(
         request.addfinalizer(teardown_database)
 
 
+@pytest.fixture(autouse=True)
+def reference_data_cache():
+    """Reference data is cached for the whole process, so drop it between tests that create their own"""
+    clear_reference_data_caches()
+    yield
+    clear_reference_data_caches()
+
+
 @pytest.fixture
 def elasticsearch_transaction_index(db):
     """
@@ -1,4 +1,3 @@
-import json
 import logging
 from decimal import Decimal
 
@@ -7,6 +6,7 @@ from django.db.models import F, Value, IntegerField, Subquery, OuterRef
 from django.views.decorators.csrf import csrf_exempt
 from typing import List
 from usaspending_api.common.cache_decorator import cache_response
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
 from usaspending_api.disaster.v2.views.disaster_base import (
     DisasterBase,
     LoansPaginationMixin,
@@ -139,7 +139,7 @@ class LoansBySubtierAgencyViewSet(ElasticsearchLoansPaginationMixin, Elasticsear
         return results
 
     def _build_json_result(self, bucket: dict):
-        info = json.loads(bucket.get("key"))
+        info = decode_agg_key(bucket.get("key"))
         return {
             "id": info["id"],
             "code": info["code"],
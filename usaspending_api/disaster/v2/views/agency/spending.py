@@ -1,4 +1,3 @@
-import json
 import logging
 from decimal import Decimal
 
@@ -11,6 +10,7 @@ from rest_framework.response import Response
 from typing import List
 
 from usaspending_api.common.cache_decorator import cache_response
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
 from usaspending_api.common.helpers.generic_helper import get_pagination_metadata
 from usaspending_api.disaster.v2.views.disaster_base import (
     DisasterBase,
@@ -237,7 +237,7 @@ class SpendingBySubtierAgencyViewSet(ElasticsearchSpendingPaginationMixin, Elast
         return results
 
     def _build_json_result(self, bucket: dict):
-        info = json.loads(bucket.get("key"))
+        info = decode_agg_key(bucket.get("key"))
         return {
             "id": info["id"],
             "code": info["code"],
@@ -17,7 +17,7 @@ from usaspending_api.common.data_classes import Pagination
 from usaspending_api.common.helpers.date_helper import now
 from usaspending_api.common.helpers.fiscal_year_helpers import generate_fiscal_year_and_month
 from usaspending_api.common.validator import customize_pagination_with_sort_columns, TinyShield
-from usaspending_api.references.models import DisasterEmergencyFundCode
+from usaspending_api.references.reference_data_cache import disaster_emergency_fund_code
 from usaspending_api.references.models.gtas_sf133_balances import GTASSF133Balances
 from usaspending_api.submissions.helpers import get_last_closed_submission_date
 from usaspending_api.submissions.models import DABSSubmissionWindowSchedule
@@ -116,7 +116,7 @@ class DisasterBase(APIView):
 
     @cached_property
     def filters(self):
-        all_def_codes = sorted(DisasterEmergencyFundCode.objects.values_list("code", flat=True))
+        all_def_codes = sorted(disaster_emergency_fund_code.get())
         object_keys_lookup = {
             "def_codes": {
                 "key": "filter|def_codes",
@@ -1,6 +1,7 @@
 from abc import abstractmethod
 from typing import List, Optional, Dict
 
+from django.conf import settings
 from elasticsearch_dsl import Q as ES_Q, A
 from rest_framework.response import Response
 
@@ -13,6 +14,17 @@ from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.disaster.v2.views.disaster_base import DisasterBase
 
 
+def covid_outlay_sum_aggregation() -> A:
+    """Outlays only count for final balances; see ES_SUM_PRECOMPUTED_FIELDS"""
+    if settings.ES_SUM_PRECOMPUTED_FIELDS:
+        return A("sum", field="financial_accounts_by_award.final_gross_outlay_amount_by_award_cpe")
+    return A(
+        "sum",
+        field="financial_accounts_by_award.gross_outlay_amount_by_award_cpe",
+        script={"source": "doc['financial_accounts_by_award.is_final_balances_for_fy'].value ? _value : 0"},
+    )
+
+
 class ElasticsearchAccountDisasterBase(DisasterBase):
     agg_group_name: str = "group_by_agg_key"  # name used for the tier-1 aggregation group
     agg_key: str
@@ -108,11 +120,7 @@ class ElasticsearchAccountDisasterBase(DisasterBase):
             sort=[{"financial_accounts_by_award.update_date": {"order": "desc"}}],
             _source={"includes": self.top_hits_fields},
         )
-        sum_covid_outlay = A(
-            "sum",
-            field="financial_accounts_by_award.gross_outlay_amount_by_award_cpe",
-            script={"source": "doc['financial_accounts_by_award.is_final_balances_for_fy'].value ? _value : 0"},
-        )
+        sum_covid_outlay = covid_outlay_sum_aggregation()
         sum_covid_obligation = A("sum", field="financial_accounts_by_award.transaction_obligated_amount")
         count_awards_by_dim = A("reverse_nested", **{})
         award_count = A("value_count", field="financial_account_distinct_award_key")
@@ -165,11 +173,7 @@ class ElasticsearchAccountDisasterBase(DisasterBase):
             sort=[{"financial_accounts_by_award.update_date": {"order": "desc"}}],
             _source={"includes": self.sub_top_hits_fields},
         )
-        sub_sum_covid_outlay = A(
-            "sum",
-            field="financial_accounts_by_award.gross_outlay_amount_by_award_cpe",
-            script={"source": "doc['financial_accounts_by_award.is_final_balances_for_fy'].value ? _value : 0"},
-        )
+        sub_sum_covid_outlay = covid_outlay_sum_aggregation()
         sub_sum_covid_obligation = A("sum", field="financial_accounts_by_award.transaction_obligated_amount")
         sub_count_awards_by_dim = A("reverse_nested", **{})
         sub_award_count = A("value_count", field="financial_account_distinct_award_key")
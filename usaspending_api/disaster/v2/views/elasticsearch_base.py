@@ -19,8 +19,8 @@ from usaspending_api.common.helpers.generic_helper import get_pagination_metadat
 from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.disaster.v2.views.disaster_base import DisasterBase, _BasePaginationMixin
 from usaspending_api.search.v2.elasticsearch_helper import (
+    BucketCount,
     get_scaled_sum_aggregations,
-    get_number_of_unique_terms_for_awards,
     get_summed_value_as_float,
 )
 
@@ -68,7 +68,8 @@ class ElasticsearchDisasterBase(DisasterBase):
     sub_agg_group_name: str = "sub_group_by_sub_agg_key"  # name used for the tier-2 aggregation group
 
     filter_query: ES_Q
-    bucket_count: int
+    bucket_count: BucketCount
+    sub_bucket_count: Optional[BucketCount] = None
 
     pagination: Pagination  # Overwritten by a pagination mixin
     sort_column_mapping: Dict[str, str]  # Overwritten by a pagination mixin
@@ -90,9 +91,7 @@ class ElasticsearchDisasterBase(DisasterBase):
             non_zero_queries.append(ES_Q("range", **{field: {"lt": 0}}))
         self.filter_query.must.append(ES_Q("bool", should=non_zero_queries, minimum_should_match=1))
 
-        self.bucket_count = get_number_of_unique_terms_for_awards(
-            self.filter_query, f"{self.agg_key.replace('.keyword', '')}.hash"
-        )
+        response = self.query_elasticsearch()
 
         messages = []
         if self.pagination.sort_key in ("id", "code"):
@@ -102,8 +101,9 @@ class ElasticsearchDisasterBase(DisasterBase):
                     " Results were actually sorted using 'description' field."
                 )
             )
-        if self.bucket_count > 10000 and self.agg_key == settings.ES_ROUTING_FIELD:
-            self.bucket_count = 10000
+        total = self.bucket_count.value
+        if total > 10000 and self.agg_key == settings.ES_ROUTING_FIELD:
+            total = 10000
             messages.append(
                 (
                     "Notice! API Request is capped at 10,000 results. Either download to view all results or"
@@ -111,10 +111,7 @@ class ElasticsearchDisasterBase(DisasterBase):
                 )
             )
 
-        response = self.query_elasticsearch()
-        response["page_metadata"] = get_pagination_metadata(
-            self.bucket_count, self.pagination.limit, self.pagination.page
-        )
+        response["page_metadata"] = get_pagination_metadata(total, self.pagination.limit, self.pagination.page)
         if messages:
             response["messages"] = messages
 
@@ -131,13 +128,17 @@ class ElasticsearchDisasterBase(DisasterBase):
         # Create the initial search using filters
         search = AwardSearch().filter(self.filter_query)
 
+        # Count of unique buckets; when it isn't known yet it is collected along with the aggregations, which are
+        # sized for the most buckets allowed until then
+        self.bucket_count = BucketCount(search, f"{self.agg_key.replace('.keyword', '')}.hash")
+
         # As of writing this the value of settings.ES_ROUTING_FIELD is the only high cardinality aggregation that
         # we support. Since the Elasticsearch clusters are routed by this field we don't care to get a count of
         # unique buckets, but instead we use the upper_limit and don't allow an upper_limit > 10k.
-        if self.bucket_count == 0:
+        if self.bucket_count.value == 0:
             return None
         elif self.agg_key == settings.ES_ROUTING_FIELD:
-            size = self.bucket_count
+            size = min(self.bucket_count.size(maximum=10000), 10000)
             shard_size = size
             group_by_agg_key_values = {
                 "order": [
@@ -147,8 +148,8 @@ class ElasticsearchDisasterBase(DisasterBase):
             }
             bucket_sort_values = None
         else:
-            size = self.bucket_count
-            shard_size = self.bucket_count + 100
+            size = self.bucket_count.size(maximum=10000 - 100)
+            shard_size = size + 100
             group_by_agg_key_values = {}
             bucket_sort_values = {
                 "sort": [
@@ -157,10 +158,7 @@ class ElasticsearchDisasterBase(DisasterBase):
                 ]
             }
 
-        if shard_size > 10000:
-            raise ForbiddenException(
-                "Current filters return too many unique items. Narrow filters to return results or use downloads."
-            )
+        self.raise_if_too_many_buckets(shard_size)
 
         # Define all aggregations needed to build the response
         group_by_agg_key_values.update({"field": self.agg_key, "size": size, "shard_size": shard_size})
@@ -183,6 +181,8 @@ class ElasticsearchDisasterBase(DisasterBase):
         if self.sub_agg_key:
             self.extend_elasticsearch_search_with_sub_aggregation(search)
 
+        self.bucket_count.add_to_search(search)
+
         # Set size to 0 since we don't care about documents returned
         search.update_from_dict({"size": 0})
 
@@ -195,15 +195,12 @@ class ElasticsearchDisasterBase(DisasterBase):
 
         Example: Subtier Agency spending rolled up to Toptier Agency spending
         """
-        sub_bucket_count = get_number_of_unique_terms_for_awards(self.filter_query, f"{self.sub_agg_key}.hash")
-        size = sub_bucket_count
-        shard_size = sub_bucket_count + 100
+        self.sub_bucket_count = BucketCount(search, f"{self.sub_agg_key}.hash", name="sub_bucket_count")
+        size = self.sub_bucket_count.size(maximum=10000 - 100)
+        shard_size = size + 100
         sub_group_by_sub_agg_key_values = {}
 
-        if shard_size > 10000:
-            raise ForbiddenException(
-                "Current filters return too many unique items. Narrow filters to return results or use downloads."
-            )
+        self.raise_if_too_many_buckets(shard_size)
 
         # Sub-aggregation to append to primary agg
         sub_group_by_sub_agg_key_values.update(
@@ -228,6 +225,15 @@ class ElasticsearchDisasterBase(DisasterBase):
         for field, sum_aggregations in sum_aggregations.items():
             search.aggs[self.agg_group_name].aggs[self.sub_agg_group_name].metric(field, sum_aggregations["sum_field"])
 
+        self.sub_bucket_count.add_to_search(search)
+
+    @staticmethod
+    def raise_if_too_many_buckets(shard_size: int) -> None:
+        if shard_size > 10000:
+            raise ForbiddenException(
+                "Current filters return too many unique items. Narrow filters to return results or use downloads."
+            )
+
     def build_totals(self, response: List[dict]) -> dict:
         # Need to use a Postgres in this case since we only look at the first 10k results for Elasticsearch.
         # Since the endpoint is performing aggregations on the entire matview with no grouping or joins
@@ -277,6 +283,14 @@ class ElasticsearchDisasterBase(DisasterBase):
 
         response = search.handle_execute()
         response = response.aggs.to_dict()
+
+        # The aggregations may have been sized for the most buckets allowed; now check that there weren't more
+        bucket_count = self.bucket_count.read_response(response)
+        if self.agg_key != settings.ES_ROUTING_FIELD:
+            self.raise_if_too_many_buckets(bucket_count + 100)
+        if self.sub_bucket_count:
+            self.raise_if_too_many_buckets(self.sub_bucket_count.read_response(response) + 100)
+
         buckets = response.get("group_by_agg_key", {}).get("buckets", [])
 
         totals = self.build_totals(buckets)
@@ -11,7 +11,7 @@ from usaspending_api.disaster.v2.views.disaster_base import (
     latest_faba_of_each_year_queryset,
     latest_gtas_of_each_year_queryset,
 )
-from usaspending_api.references.models import DisasterEmergencyFundCode
+from usaspending_api.references.reference_data_cache import disaster_emergency_fund_code
 
 
 class OverviewViewSet(DisasterBase):
@@ -33,7 +33,7 @@ class OverviewViewSet(DisasterBase):
         )
 
     def _parse_and_validate(self, request):
-        all_def_codes = sorted(list(DisasterEmergencyFundCode.objects.values_list("code", flat=True)))
+        all_def_codes = sorted(disaster_emergency_fund_code.get())
         models = [
             {
                 "key": "def_codes",
@@ -1,7 +1,6 @@
-import json
-
 from typing import List
 
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
 from usaspending_api.disaster.v2.views.elasticsearch_base import (
     ElasticsearchDisasterBase,
     ElasticsearchSpendingPaginationMixin,
@@ -25,7 +24,7 @@ class RecipientSpendingViewSet(ElasticsearchSpendingPaginationMixin, Elasticsear
     def build_elasticsearch_result(self, info_buckets: List[dict]) -> List[dict]:
         results = []
         for bucket in info_buckets:
-            info = json.loads(bucket.get("key"))
+            info = decode_agg_key(bucket.get("key"))
 
             # Build a list of hash IDs to handle multiple levels
             recipient_hash = info.get("hash")
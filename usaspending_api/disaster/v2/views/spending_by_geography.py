@@ -1,5 +1,3 @@
-import json
-
 from decimal import Decimal
 from enum import Enum
 from typing import Optional, List, Dict
@@ -9,16 +7,14 @@ from rest_framework.response import Response
 from elasticsearch_dsl import A, Q as ES_Q
 
 from usaspending_api.common.cache_decorator import cache_response
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
 from usaspending_api.common.elasticsearch.search_wrappers import AwardSearch
 from usaspending_api.common.exceptions import UnprocessableEntityException
 from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.common.validator import TinyShield
 from usaspending_api.disaster.v2.views.disaster_base import DisasterBase
 from usaspending_api.references.abbreviations import code_to_state
-from usaspending_api.search.v2.elasticsearch_helper import (
-    get_scaled_sum_aggregations,
-    get_number_of_unique_terms_for_awards,
-)
+from usaspending_api.search.v2.elasticsearch_helper import BucketCount, get_scaled_sum_aggregations
 
 
 class GeoLayer(Enum):
@@ -128,20 +124,21 @@ class SpendingByGeographyViewSet(DisasterBase):
         search = AwardSearch().filter(filter_query)
 
         # Check number of unique terms (buckets) for performance and restrictions on maximum buckets allowed
-        bucket_count = get_number_of_unique_terms_for_awards(filter_query, f"{self.agg_key}.hash")
+        self.bucket_count = BucketCount(search, f"{self.agg_key}.hash")
 
-        if bucket_count == 0:
+        if self.bucket_count.value == 0:
             return None
         else:
             # Add 1 to handle null case since murmur3 doesn't support "null_value" property
-            bucket_count += 1
+            size = self.bucket_count.size(maximum=10000 - 101) + 1
 
         # Add 100 to make sure that we consider enough records in each shard for accurate results
-        group_by_agg_key = A("terms", field=self.agg_key, size=bucket_count, shard_size=bucket_count + 100)
+        group_by_agg_key = A("terms", field=self.agg_key, size=size, shard_size=size + 100)
         sum_aggregations = get_scaled_sum_aggregations(self.metric_field)
         sum_field = sum_aggregations["sum_field"]
 
         search.aggs.bucket("group_by_agg_key", group_by_agg_key).metric("sum_field", sum_field)
+        self.bucket_count.add_to_search(search)
 
         # Set size to 0 since we don't care about documents returned
         search.update_from_dict({"size": 0})
@@ -157,7 +154,7 @@ class SpendingByGeographyViewSet(DisasterBase):
                 shape_code = None
                 population = None
             else:
-                geo_info = json.loads(bucket.get("key"))
+                geo_info = decode_agg_key(bucket.get("key"))
                 state_code = geo_info["state_code"] or ""
                 population = int(geo_info["population"]) if geo_info["population"] else None
 
@@ -195,8 +192,9 @@ class SpendingByGeographyViewSet(DisasterBase):
         search = self.build_elasticsearch_search_with_aggregation(filter_query)
         if search is None:
             return []
-        response = search.handle_execute()
-        results_dict = self.build_elasticsearch_result(response.aggs.to_dict())
+        response = search.handle_execute().aggs.to_dict()
+        self.bucket_count.read_response(response)
+        results_dict = self.build_elasticsearch_result(response)
 
         if self.geo_layer_filters:
             filtered_shape_codes = set(self.geo_layer_filters) & set(results_dict.keys())
@@ -0,0 +1,97 @@
+"""
+Benchmark of append_files_to_zip_file compressing the split CSV files of a download with ZipFile.write, one file after
+another, against compressing them in a process pool.  Generates the CSV files (4 files of 1 GB each by default),
+zips them both ways, checks that the archives hold the same data, and reports the time each took.  Run it from the
+root of the repo:
+
+    python -m usaspending_api.download.filestreaming.benchmark_zip_file --file-count 4 --file-size-mb 1024
+
+The archive only needs Zip64 once it is over 4 GB; add --compresslevel 0 and more than 4 GB of files to check that.
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import zipfile
+
+from time import perf_counter
+
+from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
+
+GENERATED_ROW_COUNT = 50000  # Rows generated up front and then written over and over, in a different order each time
+
+
+def generate_csv_files(directory, file_count, file_size):
+    random.seed(1)
+    rows = [
+        ",".join(
+            [
+                f"CONT_AWD_{random.randint(0, 10 ** 8)}_9700",
+                f"{random.uniform(-1e6, 1e7):.2f}",
+                f"20{random.randint(10, 20)}-{random.randint(1, 12):02}-{random.randint(1, 28):02}",
+                f"Recipient {random.randint(1, 10 ** 6)} LLC",
+                random.choice(["DEPARTMENT OF DEFENSE", "DEPARTMENT OF ENERGY", "GENERAL SERVICES ADMINISTRATION"]),
+                f"{random.randint(100000, 999999)}",
+                f"{random.randint(10000, 99999)}",
+            ]
+        )
+        + "\n"
+        for _ in range(GENERATED_ROW_COUNT)
+    ]
+    file_paths = []
+    for file_number in range(1, file_count + 1):
+        file_path = os.path.join(directory, f"Contracts_PrimeTransactions_{file_number}.csv")
+        with open(file_path, "wb") as csv_file:
+            while csv_file.tell() < file_size:
+                random.shuffle(rows)
+                csv_file.write("".join(rows).encode())
+        file_paths.append(file_path)
+    return file_paths
+
+
+def time_zip(file_paths, zip_file_path, compresslevel, max_workers):
+    start = perf_counter()
+    append_files_to_zip_file(file_paths, zip_file_path, compresslevel=compresslevel, max_workers=max_workers)
+    return perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file-count", type=int, default=4)
+    parser.add_argument("--file-size-mb", type=int, default=1024)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--compresslevel", type=int, default=None)
+    parser.add_argument("--directory", help="Where to write the CSV and zip files; a temporary directory by default")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(dir=args.directory)
+    try:
+        file_paths = generate_csv_files(directory, args.file_count, args.file_size_mb * 1024 * 1024)
+        total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+        print(f"{len(file_paths)} CSV files, {total_size / 1024 ** 3:.2f} GB, on {os.cpu_count()} CPUs")
+
+        serial_zip_path = os.path.join(directory, "serial.zip")
+        parallel_zip_path = os.path.join(directory, "parallel.zip")
+        serial = time_zip(file_paths, serial_zip_path, args.compresslevel, 1)
+        parallel = time_zip(file_paths, parallel_zip_path, args.compresslevel, args.workers)
+
+        with zipfile.ZipFile(serial_zip_path) as serial_zip, zipfile.ZipFile(parallel_zip_path) as parallel_zip:
+            assert parallel_zip.testzip() is None
+            serial_entries = [(info.filename, info.CRC, info.file_size) for info in serial_zip.infolist()]
+            parallel_entries = [(info.filename, info.CRC, info.file_size) for info in parallel_zip.infolist()]
+            assert parallel_entries == serial_entries
+
+        for name, seconds, zip_path in (
+            ("ZipFile.write", serial, serial_zip_path),
+            (f"{args.workers} workers", parallel, parallel_zip_path),
+        ):
+            size = os.path.getsize(zip_path) / 1024 ** 2
+            print(f"{name}: {seconds:.1f}s, {total_size / 1024 ** 2 / seconds:,.1f} MB/s, {size:,.1f} MB zip")
+        print(f"speedup: {serial / parallel:.2f}x")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,13 @@ import json
 import logging
 import multiprocessing
 import os
+import zipfile
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple, List
 
 import psutil as ps
+import psycopg2
 import re
 import shutil
 import subprocess
@@ -18,7 +21,7 @@ from django.conf import settings
 
 from usaspending_api.awards.v2.filters.filter_helpers import add_date_range_comparison_types
 from usaspending_api.awards.v2.lookups.lookups import contract_type_mapping, assistance_type_mapping, idv_type_mapping
-from usaspending_api.common.csv_helpers import count_rows_in_delimited_file, partition_large_delimited_file
+from usaspending_api.common.csv_helpers import partition_and_count_delimited_file
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers.orm_helpers import generate_raw_quoted_query
 from usaspending_api.common.helpers.s3_helpers import multipart_upload
@@ -28,7 +31,7 @@ from usaspending_api.download.download_utils import construct_data_date_range
 from usaspending_api.download.filestreaming import NAMING_CONFLICT_DISCRIMINATOR
 from usaspending_api.download.filestreaming.download_source import DownloadSource
 from usaspending_api.download.filestreaming.file_description import build_file_description, save_file_description
-from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
+from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file, PartitionedZipEntryWriter
 from usaspending_api.download.helpers import verify_requested_columns_available, write_to_download_log as write_to_log
 from usaspending_api.download.lookups import JOB_STATUS_DICT, VALUE_MAPPINGS, FILE_FORMATS
 from usaspending_api.download.models import DownloadJob
@@ -69,6 +72,7 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
 
         # Generate sources from the JSON request object
         sources = get_download_sources(json_request, origination)
+        sources_to_parse = []
         for source in sources:
             # Parse and write data to the file; if there are no matching columns for a source then add an empty file
             source_column_count = len(source.columns(columns))
@@ -76,11 +80,26 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
                 create_empty_data_file(
                     source, download_job, working_dir, piid, assistance_id, zip_file_path, file_format
                 )
+            elif settings.DOWNLOAD_SOURCE_CONCURRENCY > 1 and not settings.DOWNLOAD_STREAMING_EXPORT:
+                download_job.number_of_columns += source_column_count
+                sources_to_parse.append(source)
             else:
                 download_job.number_of_columns += source_column_count
                 parse_source(
                     source, columns, download_job, working_dir, piid, assistance_id, zip_file_path, limit, file_format
                 )
+        if sources_to_parse:
+            parse_sources_concurrently(
+                sources_to_parse,
+                columns,
+                download_job,
+                working_dir,
+                piid,
+                assistance_id,
+                zip_file_path,
+                limit,
+                file_format,
+            )
         include_data_dictionary = json_request.get("include_data_dictionary")
         if include_data_dictionary:
             add_data_dictionary_to_zip(working_dir, zip_file_path)
@@ -253,9 +272,95 @@ def build_data_file_name(source, download_job, piid, assistance_id):
     return data_file_name
 
 
+def parse_sources_concurrently(
+    sources, columns, download_job, working_dir, piid, assistance_id, zip_file_path, limit, file_format
+):
+    """
+    Export up to DOWNLOAD_SOURCE_CONCURRENCY sources from the DB at once, each in its own psql process, then split
+    and zip each one into the shared zip as soon as its export finishes.  Everything runs from this thread: the
+    processes are started here and polled, and the sources are zipped one at a time.
+
+    Only used with psql exports; the streaming export writes straight into the zip, so sources can't overlap.
+    """
+    max_workers = min(settings.DOWNLOAD_SOURCE_CONCURRENCY, len(sources))
+    write_to_log(message=f"Generating {len(sources)} sources, {max_workers} at a time", download_job=download_job)
+
+    pending = list(sources)
+    running = []
+    started = []
+    try:
+        while pending or running:
+            while pending and len(running) < max_workers:
+                export = start_psql_export(
+                    pending.pop(0), columns, download_job, working_dir, piid, assistance_id, limit, file_format
+                )
+                running.append(export)
+                started.append(export)
+
+            finished = [export for export in running if not export.process.is_alive()]
+            for export in running:
+                if export.process.is_alive() and download_job and not download_job.monthly_download:
+                    if time.perf_counter() - export.start_time > MAX_VISIBILITY_TIMEOUT:
+                        wait_for_process(export.process, export.start_time, download_job)  # Terminates and raises
+            if not finished:
+                time.sleep(WAIT_FOR_PROCESS_SLEEP / 5)
+                continue
+
+            for export in finished:
+                running.remove(export)
+                wait_for_process(export.process, export.start_time, download_job)  # Raises if the export failed
+                zip_psql_export(export, zip_file_path, file_format, download_job)
+                _log_source_duration(export.source, export.source_start_time, download_job)
+    except Exception:
+        # Stop the exports still running so they don't hold up the failure
+        _kill_spawned_processes(download_job)
+        raise
+    finally:
+        for export in started:
+            export.remove_query_file()
+
+
 def parse_source(source, columns, download_job, working_dir, piid, assistance_id, zip_file_path, limit, file_format):
     """Write to delimited text file(s) and zip file(s) using the source data"""
+    if settings.DOWNLOAD_STREAMING_EXPORT:
+        source_start_time = time.perf_counter()
+        data_file_name, _, export_query = prepare_source_export(
+            source, columns, download_job, working_dir, piid, assistance_id, limit, file_format
+        )
+        stream_export_to_zip(export_query, zip_file_path, data_file_name, file_format, download_job)
+        _log_source_duration(source, source_start_time, download_job)
+        return
+
+    export = start_psql_export(source, columns, download_job, working_dir, piid, assistance_id, limit, file_format)
+    try:
+        wait_for_process(export.process, export.start_time, download_job)
+        zip_psql_export(export, zip_file_path, file_format, download_job)
+    finally:
+        export.remove_query_file()
+
+    _log_source_duration(source, export.source_start_time, download_job)
+
+
+@dataclass
+class PsqlExport:
+    """A source being exported to a delimited text file by psql in a separate process"""
+
+    source: DownloadSource
+    data_file_name: str
+    source_path: str
+    temp_file: int
+    temp_file_path: str
+    process: multiprocessing.Process
+    source_start_time: float
+    start_time: float
+
+    def remove_query_file(self):
+        os.close(self.temp_file)
+        os.remove(self.temp_file_path)
+
 
+def prepare_source_export(source, columns, download_job, working_dir, piid, assistance_id, limit, file_format):
+    """Name the source's data file and generate its export query; values, limits, dates fixed"""
     data_file_name = build_data_file_name(source, download_job, piid, assistance_id)
 
     source_query = source.row_emitter(columns)
@@ -265,68 +370,149 @@ def parse_source(source, columns, download_job, working_dir, piid, assistance_id
 
     write_to_log(message=f"Preparing to download data as {source.file_name}", download_job=download_job)
 
-    # Generate the query file; values, limits, dates fixed
     export_query = generate_export_query(source_query, limit, source, columns, file_format)
+    return data_file_name, source_path, export_query
+
+
+def start_psql_export(
+    source, columns, download_job, working_dir, piid, assistance_id, limit, file_format
+) -> PsqlExport:
+    """Create a separate process to run the PSQL command; the caller waits for it (see wait_for_process)"""
+    source_start_time = time.perf_counter()
+    data_file_name, source_path, export_query = prepare_source_export(
+        source, columns, download_job, working_dir, piid, assistance_id, limit, file_format
+    )
     temp_file, temp_file_path = generate_export_query_temp_file(export_query, download_job)
 
     start_time = time.perf_counter()
     try:
-        # Create a separate process to run the PSQL command; wait
         psql_process = multiprocessing.Process(target=execute_psql, args=(temp_file_path, source_path, download_job))
         psql_process.start()
-        wait_for_process(psql_process, start_time, download_job)
+    except Exception:
+        os.close(temp_file)
+        os.remove(temp_file_path)
+        raise
+    return PsqlExport(
+        source, data_file_name, source_path, temp_file, temp_file_path, psql_process, source_start_time, start_time
+    )
 
-        delim = FILE_FORMATS[file_format]["delimiter"]
 
-        # Log how many rows we have
-        write_to_log(message="Counting rows in delimited text file", download_job=download_job)
-        try:
-            download_job.number_of_rows += count_rows_in_delimited_file(
-                filename=source_path, has_header=True, delimiter=delim
-            )
-        except Exception:
-            write_to_log(
-                message="Unable to obtain delimited text file line count", is_error=True, download_job=download_job
-            )
-        download_job.save()
+def zip_psql_export(export: PsqlExport, zip_file_path, file_format, download_job):
+    """
+    Create a separate process to split the large data file into smaller files and write them to the zip; wait.
+    The rows are counted while splitting, so the data file is only read once.
+    """
+    row_count = multiprocessing.Value("q", 0)
+    zip_process = multiprocessing.Process(
+        target=split_and_zip_data_files,
+        args=(zip_file_path, export.source_path, export.data_file_name, file_format, download_job, row_count),
+    )
+    zip_process.start()
+    wait_for_process(zip_process, export.start_time, download_job)
+    download_job.number_of_rows += row_count.value
+    download_job.save()
+
+
+def _log_source_duration(source, source_start_time, download_job):
+    duration = time.perf_counter() - source_start_time
+    write_to_log(
+        message=f"Generated {source.file_name} in {duration:.4f}s",
+        download_job=download_job,
+        other_params={"source_file_name": source.file_name, "source_duration": round(duration, 4)},
+    )
+
+
+def stream_export_to_zip(export_query, zip_file_path, data_file_name, file_format, download_job):
+    """Run the export in a separate process (so it can be terminated on timeout) and record its row count"""
+    start_time = time.perf_counter()
+    row_count = multiprocessing.Value("q", 0)
+    copy_process = multiprocessing.Process(
+        target=execute_copy_to_zip,
+        args=(export_query, zip_file_path, data_file_name, file_format, download_job, row_count),
+    )
+    copy_process.start()
+    wait_for_process(copy_process, start_time, download_job)
+    download_job.number_of_rows += row_count.value
+    download_job.save()
+
 
-        # Create a separate process to split the large data files into smaller file and write to zip; wait
-        zip_process = multiprocessing.Process(
-            target=split_and_zip_data_files,
-            args=(zip_file_path, source_path, data_file_name, file_format, download_job),
+def execute_copy_to_zip(export_query, zip_file_path, data_file_name, file_format, download_job, row_count=None):
+    """
+    Stream the results of the export query with COPY ... TO STDOUT directly into row-limited entries of the zip
+    file. This is a single pass over the data: no full-size intermediate file is written, re-read, split or counted.
+    """
+    try:
+        log_time = time.perf_counter()
+        extension = FILE_FORMATS[file_format]["extension"]
+        # The server runs the same COPY that psql would, so drop the backslash of psql's client-side \COPY command
+        copy_sql = export_query[1:] if export_query.startswith("\\") else export_query
+        options = ""
+        if download_job and not download_job.monthly_download:
+            # Since terminating the process isn't guaranteed to end the DB statement, add timeout to client connection
+            options = f"-c statement_timeout={settings.DOWNLOAD_DB_TIMEOUT_IN_HOURS}h"
+
+        connection = psycopg2.connect(dsn=retrieve_db_string(), options=options)
+        try:
+            with connection.cursor() as cursor:
+                with zipfile.ZipFile(
+                    zip_file_path,
+                    "a",
+                    compression=zipfile.ZIP_DEFLATED,
+                    allowZip64=True,
+                    compresslevel=settings.DOWNLOAD_ZIP_COMPRESSION_LEVEL,
+                ) as zf:
+                    writer = PartitionedZipEntryWriter(zf, f"{data_file_name}_%s.{extension}", EXCEL_ROW_LIMIT)
+                    cursor.copy_expert(copy_sql, writer)
+                    writer.close()
+        finally:
+            connection.close()
+
+        if row_count is not None:
+            row_count.value = writer.row_count
+        msg = (
+            f"Streamed {writer.row_count:,} rows into {len(writer.entry_names)} files in the zip, "
+            f"took {time.perf_counter() - log_time:.4f} seconds"
         )
-        zip_process.start()
-        wait_for_process(zip_process, start_time, download_job)
-        download_job.save()
+        write_to_log(message=msg, download_job=download_job)
     except Exception as e:
+        logger.error(e)
+        logger.error(f"Faulty SQL: {export_query}")
         raise e
-    finally:
-        # Remove temporary files
-        os.close(temp_file)
-        os.remove(temp_file_path)
 
 
-def split_and_zip_data_files(zip_file_path, source_path, data_file_name, file_format, download_job=None):
+def split_and_zip_data_files(
+    zip_file_path, source_path, data_file_name, file_format, download_job=None, row_count=None
+):
+    """Split the data file into row-limited files and zip them; the number of rows is stored in ``row_count``"""
     try:
         # Split data files into separate files
         # e.g. `Assistance_prime_transactions_delta_%s.csv`
         log_time = time.perf_counter()
-        delim = FILE_FORMATS[file_format]["delimiter"]
         extension = FILE_FORMATS[file_format]["extension"]
 
         output_template = f"{data_file_name}_%s.{extension}"
         write_to_log(message="Beginning the delimited text file partition", download_job=download_job)
-        list_of_files = partition_large_delimited_file(
-            file_path=source_path, delimiter=delim, row_limit=EXCEL_ROW_LIMIT, output_name_template=output_template
+        list_of_files, rows_in_file = partition_and_count_delimited_file(
+            file_path=source_path, row_limit=EXCEL_ROW_LIMIT, output_name_template=output_template
         )
+        if row_count is not None:
+            row_count.value = rows_in_file
 
-        msg = f"Partitioning data into {len(list_of_files)} files took {time.perf_counter() - log_time:.4f}s"
+        msg = (
+            f"Partitioning {rows_in_file:,} rows into {len(list_of_files)} files "
+            f"took {time.perf_counter() - log_time:.4f}s"
+        )
         write_to_log(message=msg, download_job=download_job)
 
         # Zip the split files into one zipfile
         write_to_log(message="Beginning zipping and compression", download_job=download_job)
         log_time = time.perf_counter()
-        append_files_to_zip_file(list_of_files, zip_file_path)
+        append_files_to_zip_file(
+            list_of_files,
+            zip_file_path,
+            compresslevel=settings.DOWNLOAD_ZIP_COMPRESSION_LEVEL,
+            max_workers=settings.DOWNLOAD_ZIP_WORKERS,
+        )
 
         write_to_log(
             message=f"Writing to zipfile took {time.perf_counter() - log_time:.4f}s", download_job=download_job
@@ -1,8 +1,49 @@
 import os
+import shutil
+import struct
+import time
 import zipfile
+import zlib
 
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
 
-def append_files_to_zip_file(file_paths, zip_file_path):
+DEFLATE_CHUNK_SIZE = 1024 * 1024
+
+# Layouts from the zip specification (APPNOTE.TXT); all fields are little-endian
+LOCAL_FILE_HEADER = struct.Struct("<4s2B4HL2L2H")
+CENTRAL_DIRECTORY_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+ZIP64_END_OF_CENTRAL_DIRECTORY = struct.Struct("<4sQ2H2L4Q")
+ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR = struct.Struct("<4sLQL")
+END_OF_CENTRAL_DIRECTORY = struct.Struct("<4s4H2LH")
+LOCAL_FILE_HEADER_SIGNATURE = b"PK\x03\x04"
+CENTRAL_DIRECTORY_HEADER_SIGNATURE = b"PK\x01\x02"
+ZIP64_END_OF_CENTRAL_DIRECTORY_SIGNATURE = b"PK\x06\x06"
+ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR_SIGNATURE = b"PK\x06\x07"
+END_OF_CENTRAL_DIRECTORY_SIGNATURE = b"PK\x05\x06"
+
+ZIP64_EXTRA_FIELD_ID = 0x0001
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+ZIP64_VERSION = 45
+DEFLATE_VERSION = 20
+UNIX_HOST = 3
+UTF8_NAME_FLAG = 0x800
+MAX_ARCHIVE_COMMENT = 0xFFFF
+DOS_EPOCH = 315532800  # Zip timestamps can't be earlier than 1980
+
+
+class DeflatedFile(NamedTuple):
+    """A file's raw deflate stream, written to ``deflated_path`` by ``deflate_file``, and what its entry records"""
+
+    file_path: str
+    deflated_path: str
+    crc: int
+    file_size: int
+    compress_size: int
+
+
+def append_files_to_zip_file(file_paths, zip_file_path, compresslevel=None, max_workers=1):
     """
     Create zip archive at the specified zip_file_path if it does not exist, and add all the files at provided
     file_paths to it.
@@ -12,8 +53,253 @@ def append_files_to_zip_file(file_paths, zip_file_path):
     it will throw a UserWarning and duplicate the file.
     Use caution in this case by removing the zip in the finally of an exception and also checking for and removing
     the zip if it exists before you begin to create it from scratch
+
+    ``compresslevel`` is the zlib level (0-9).  With more than one of ``max_workers`` and of files, the files are
+    compressed concurrently (see ``append_files_to_zip_file_in_parallel``).
     """
-    with zipfile.ZipFile(zip_file_path, "a", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
+    if max_workers > 1 and len(file_paths) > 1:
+        append_files_to_zip_file_in_parallel(file_paths, zip_file_path, compresslevel, max_workers)
+        return
+
+    with zipfile.ZipFile(
+        zip_file_path, "a", compression=zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=compresslevel
+    ) as zip_file:
         for file_path in file_paths:
             archive_name = os.path.basename(file_path)
             zip_file.write(file_path, archive_name)
+
+
+def append_files_to_zip_file_in_parallel(
+    file_paths: List[str], zip_file_path: str, compresslevel: Optional[int] = None, max_workers: int = 2
+) -> None:
+    """
+    Deflate each file into a temporary file in a process pool, then write the archive from this process: the local
+    header and compressed data of every entry and, once all of them are written, a single central directory, with
+    the Zip64 records where sizes, offsets or the number of entries need them.
+    Entries of an existing archive are kept; the new entries are written over its central directory, which is then
+    written again after them.
+
+    zipfile can't add data that is already compressed, so the archive is written here rather than with ZipFile.
+    The result reads the same as one written by ``ZipFile.write``, but no warning is given for duplicate names.
+    """
+    level = zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel
+    try:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+            deflated_files = list(executor.map(deflate_file, file_paths, [level] * len(file_paths)))
+
+        mode = "r+b" if os.path.exists(zip_file_path) and os.path.getsize(zip_file_path) > 0 else "wb"
+        with open(zip_file_path, mode) as archive:
+            if mode == "r+b":
+                central_directory, entry_count, comment = read_central_directory(archive)
+            else:
+                central_directory, entry_count, comment = b"", 0, b""
+            for deflated_file in deflated_files:
+                central_directory += write_deflated_entry(archive, deflated_file)
+                entry_count += 1
+            write_end_of_central_directory(archive, central_directory, entry_count, comment)
+            archive.truncate()
+    finally:
+        for file_path in file_paths:
+            if os.path.exists(deflated_path(file_path)):
+                os.remove(deflated_path(file_path))
+
+
+def deflated_path(file_path: str) -> str:
+    return f"{file_path}.deflate"
+
+
+def deflate_file(file_path: str, level: int) -> DeflatedFile:
+    """Write the raw deflate stream of a file, the way zip entries store it, to a sibling temp file"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc, file_size, compress_size = 0, 0, 0
+    with open(file_path, "rb") as source, open(deflated_path(file_path), "wb") as dest:
+        for chunk in iter(lambda: source.read(DEFLATE_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            compress_size += dest.write(compressor.compress(chunk))
+        compress_size += dest.write(compressor.flush())
+    return DeflatedFile(file_path, deflated_path(file_path), crc, file_size, compress_size)
+
+
+def read_central_directory(archive) -> Tuple[bytes, int, bytes]:
+    """
+    Read the central directory, its number of entries and the archive comment of an existing archive, and leave the
+    archive positioned at the start of its central directory, where new entries are written.
+    """
+    archive.seek(0, os.SEEK_END)
+    archive_size = archive.tell()
+    tail_size = min(archive_size, END_OF_CENTRAL_DIRECTORY.size + MAX_ARCHIVE_COMMENT)
+    archive.seek(archive_size - tail_size)
+    tail = archive.read(tail_size)
+    end_position = tail.rfind(END_OF_CENTRAL_DIRECTORY_SIGNATURE)
+    if end_position < 0:
+        raise zipfile.BadZipFile(f"{archive.name} is not a zip file")
+    end_record = END_OF_CENTRAL_DIRECTORY.unpack_from(tail, end_position)
+    _, _, _, _, entry_count, directory_size, directory_offset, comment_length = end_record
+    comment_start = end_position + END_OF_CENTRAL_DIRECTORY.size
+    comment = tail[comment_start : comment_start + comment_length]
+
+    locator_offset = archive_size - tail_size + end_position - ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.size
+    if locator_offset >= 0:
+        archive.seek(locator_offset)
+        signature, _, zip64_end_offset, _ = ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.unpack(
+            archive.read(ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.size)
+        )
+        if signature == ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR_SIGNATURE:
+            archive.seek(zip64_end_offset)
+            zip64_end_record = archive.read(ZIP64_END_OF_CENTRAL_DIRECTORY.size)
+            entry_count, directory_size, directory_offset = ZIP64_END_OF_CENTRAL_DIRECTORY.unpack(zip64_end_record)[7:]
+
+    archive.seek(directory_offset)
+    central_directory = archive.read(directory_size)
+    archive.seek(directory_offset)
+    return central_directory, entry_count, comment
+
+
+def write_deflated_entry(archive, deflated_file: DeflatedFile) -> bytes:
+    """
+    Write the local header and data of a deflated file where the archive is positioned, the same way ZipFile.write
+    would, and return the entry's central directory header
+    """
+    header_offset = archive.tell()
+    stat = os.stat(deflated_file.file_path)
+    year, month, day, hour, minute, second = time.localtime(max(stat.st_mtime, DOS_EPOCH))[:6]
+    dos_date = (year - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+
+    archive_name = os.path.basename(deflated_file.file_path)
+    try:
+        name, flags = archive_name.encode("ascii"), 0
+    except UnicodeEncodeError:
+        name, flags = archive_name.encode("utf-8"), UTF8_NAME_FLAG
+
+    file_size, compress_size = deflated_file.file_size, deflated_file.compress_size
+    zip64 = max(file_size, compress_size) >= ZIP64_LIMIT
+    version = ZIP64_VERSION if zip64 or header_offset >= ZIP64_LIMIT else DEFLATE_VERSION
+    common_fields = (flags, zipfile.ZIP_DEFLATED, dos_time, dos_date, deflated_file.crc)
+
+    # The local header holds both sizes in its Zip64 extra field when either of them is too big for the header
+    if zip64:
+        local_sizes = (ZIP64_LIMIT, ZIP64_LIMIT)
+        local_extra = struct.pack("<2H2Q", ZIP64_EXTRA_FIELD_ID, 16, file_size, compress_size)
+    else:
+        local_sizes = (compress_size, file_size)
+        local_extra = b""
+    local_header = LOCAL_FILE_HEADER.pack(
+        LOCAL_FILE_HEADER_SIGNATURE, version, 0, *common_fields, *local_sizes, len(name), len(local_extra)
+    )
+    archive.write(local_header + name + local_extra)
+    with open(deflated_file.deflated_path, "rb") as deflated:
+        shutil.copyfileobj(deflated, archive, DEFLATE_CHUNK_SIZE)
+
+    # The central directory's Zip64 extra field only holds the values too big for the header, in this order
+    zip64_values = [value for value in (file_size, compress_size, header_offset) if value >= ZIP64_LIMIT]
+    directory_extra = b""
+    if zip64_values:
+        directory_extra = struct.pack(
+            f"<2H{len(zip64_values)}Q", ZIP64_EXTRA_FIELD_ID, 8 * len(zip64_values), *zip64_values
+        )
+    directory_sizes = (min(compress_size, ZIP64_LIMIT), min(file_size, ZIP64_LIMIT))
+    directory_header = CENTRAL_DIRECTORY_HEADER.pack(
+        CENTRAL_DIRECTORY_HEADER_SIGNATURE,
+        version,
+        UNIX_HOST,
+        version,
+        0,
+        *common_fields,
+        *directory_sizes,
+        len(name),
+        len(directory_extra),
+        0,  # comment length
+        0,  # disk number
+        0,  # internal attributes
+        (stat.st_mode & 0xFFFF) << 16,
+        min(header_offset, ZIP64_LIMIT),
+    )
+    return directory_header + name + directory_extra
+
+
+def write_end_of_central_directory(archive, central_directory: bytes, entry_count: int, comment: bytes) -> None:
+    """Write the central directory where the archive is positioned, followed by its end records"""
+    directory_offset = archive.tell()
+    archive.write(central_directory)
+    directory_size = len(central_directory)
+    if entry_count >= ZIP64_COUNT_LIMIT or directory_size >= ZIP64_LIMIT or directory_offset >= ZIP64_LIMIT:
+        zip64_end_offset = archive.tell()
+        zip64_end_record = ZIP64_END_OF_CENTRAL_DIRECTORY.pack(
+            ZIP64_END_OF_CENTRAL_DIRECTORY_SIGNATURE,
+            ZIP64_END_OF_CENTRAL_DIRECTORY.size - 12,  # Size of the rest of the record
+            ZIP64_VERSION,
+            ZIP64_VERSION,
+            0,  # disk number
+            0,  # disk the central directory starts on
+            entry_count,  # entries on this disk
+            entry_count,
+            directory_size,
+            directory_offset,
+        )
+        locator = ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.pack(
+            ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR_SIGNATURE, 0, zip64_end_offset, 1
+        )
+        archive.write(zip64_end_record + locator)
+    end_record = END_OF_CENTRAL_DIRECTORY.pack(
+        END_OF_CENTRAL_DIRECTORY_SIGNATURE,
+        0,  # disk number
+        0,  # disk the central directory starts on
+        min(entry_count, ZIP64_COUNT_LIMIT),  # entries on this disk
+        min(entry_count, ZIP64_COUNT_LIMIT),
+        min(directory_size, ZIP64_LIMIT),
+        min(directory_offset, ZIP64_LIMIT),
+        len(comment),
+    )
+    archive.write(end_record + comment)
+
+
+class PartitionedZipEntryWriter:
+    """
+    File-like sink for psycopg2's ``copy_expert`` that writes ``COPY ... TO STDOUT`` output straight into entries
+    of an open zip archive, starting a new entry (with the header repeated) every ``row_limit`` rows.
+
+    This relies on psycopg2 calling ``write()`` once per COPY data message, and Postgres sending one message per
+    row (including the header and rows with embedded newlines), so rows are counted without parsing the data.
+    """
+
+    def __init__(self, zip_file: zipfile.ZipFile, output_name_template: str, row_limit: int, has_header: bool = True):
+        self.zip_file = zip_file
+        self.output_name_template = output_name_template
+        self.row_limit = row_limit
+        self.has_header = has_header
+        self.header = None
+        self.row_count = 0
+        self.entry_names = []
+        self._entry = None
+        self._entry_row_count = 0
+
+    def write(self, data: bytes) -> None:
+        if self.has_header and self.header is None:
+            self.header = data
+            self._open_next_entry()
+            return
+        if self._entry is None or self._entry_row_count >= self.row_limit:
+            self._open_next_entry()
+        self._entry.write(data)
+        self._entry_row_count += 1
+        self.row_count += 1
+
+    def close(self) -> None:
+        if not self.entry_names:
+            self._open_next_entry()  # Same as a psql export, an empty result still yields an (empty) file
+        if self._entry is not None:
+            self._entry.close()
+            self._entry = None
+
+    def _open_next_entry(self) -> None:
+        if self._entry is not None:
+            self._entry.close()
+        name = self.output_name_template % (len(self.entry_names) + 1)
+        # Entry sizes aren't known upfront, so Zip64 extensions must be enabled in case one exceeds 2 GiB
+        self._entry = self.zip_file.open(name, "w", force_zip64=True)
+        self.entry_names.append(name)
+        self._entry_row_count = 0
+        if self.header is not None:
+            self._entry.write(self.header)
@@ -1,3 +1,7 @@
+import os
+import pytest
+import zipfile
+
 from unittest.mock import MagicMock
 
 from usaspending_api.awards.v2.lookups.lookups import award_type_mapping, contract_type_mapping, idv_type_mapping
@@ -127,3 +131,67 @@ def test_idv_treasury_account_funding_csv_sources():
     VALUE_MAPPINGS["idv_federal_account_funding"]["filter_function"] = original
     assert csv_sources[0].file_type == "treasury_account"
     assert csv_sources[0].source_type == "idv_federal_account_funding"
+
+
+def _fake_psql_export(temp_sql_file_path, source_path, download_job):
+    name = os.path.basename(source_path)
+    if name.startswith("bad"):
+        raise Exception("psql failed")
+    with open(source_path, "w") as f:
+        f.write("header\n" + f"{name} row\n" * 3)
+
+
+@pytest.fixture
+def concurrent_sources(monkeypatch, settings, tmp_path):
+    settings.DOWNLOAD_SOURCE_CONCURRENCY = 2
+    settings.DOWNLOAD_STREAMING_EXPORT = False
+    monkeypatch.setattr(download_generation, "WAIT_FOR_PROCESS_SLEEP", 0.05)
+    monkeypatch.setattr(download_generation, "execute_psql", _fake_psql_export)
+    monkeypatch.setattr(
+        download_generation,
+        "prepare_source_export",
+        lambda source, columns, download_job, working_dir, *args: (
+            source.file_name,
+            str(tmp_path / f"{source.file_name}.csv"),
+            f"copy ({source.file_name})",
+        ),
+    )
+    query_files = []
+    original_generate_export_query_temp_file = download_generation.generate_export_query_temp_file
+
+    def generate_export_query_temp_file(export_query, download_job):
+        temp_file = original_generate_export_query_temp_file(export_query, download_job, temp_dir=str(tmp_path))
+        query_files.append(temp_file[1])
+        return temp_file
+
+    monkeypatch.setattr(download_generation, "generate_export_query_temp_file", generate_export_query_temp_file)
+    return query_files
+
+
+def _parse_sources_concurrently(file_names, zip_file_path, working_dir):
+    sources = [MagicMock(file_name=file_name) for file_name in file_names]
+    download_job = MagicMock(monthly_download=False, number_of_rows=0)
+    download_generation.parse_sources_concurrently(
+        sources, [], download_job, working_dir, None, None, zip_file_path, None, "csv"
+    )
+    return download_job
+
+
+def test_parse_sources_concurrently(concurrent_sources, tmp_path):
+    zip_file_path = str(tmp_path / "download.zip")
+    download_job = _parse_sources_concurrently(["contracts", "assistance", "sub_awards"], zip_file_path, tmp_path)
+
+    assert download_job.number_of_rows == 9
+    with zipfile.ZipFile(zip_file_path) as zf:
+        assert sorted(zf.namelist()) == ["assistance_1.csv", "contracts_1.csv", "sub_awards_1.csv"]
+        assert zf.read("contracts_1.csv") == b"header\n" + b"contracts.csv row\n" * 3
+    assert len(concurrent_sources) == 3
+    assert not any(os.path.exists(query_file) for query_file in concurrent_sources)
+
+
+def test_parse_sources_concurrently_failure(concurrent_sources, tmp_path):
+    with pytest.raises(Exception, match="Command failed"):
+        _parse_sources_concurrently(["contracts", "bad_assistance", "sub_awards"], str(tmp_path / "d.zip"), tmp_path)
+
+    assert concurrent_sources  # Query files of the exports that were started are still removed
+    assert not any(os.path.exists(query_file) for query_file in concurrent_sources)
@@ -2,7 +2,7 @@ import os
 import zipfile
 
 from tempfile import NamedTemporaryFile
-from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
+from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file, PartitionedZipEntryWriter
 
 
 def test_append_files_to_zip_file():
@@ -20,3 +20,76 @@ def test_append_files_to_zip_file():
                         os.path.basename(include_file_1.name),
                         os.path.basename(include_file_2.name),
                     ]
+
+
+def test_partitioned_zip_entry_writer():
+    with NamedTemporaryFile() as zip_file:
+        with zipfile.ZipFile(zip_file.name, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            writer = PartitionedZipEntryWriter(zf, "data_%s.csv", row_limit=2)
+            for row in (b"a,b\n", b"1,2\n", b'3,"multi\nline"\n', b"5,6\n"):
+                writer.write(row)
+            writer.close()
+
+        assert writer.row_count == 3
+        with zipfile.ZipFile(zip_file.name, "r") as zf:
+            assert zf.namelist() == ["data_1.csv", "data_2.csv"]
+            assert zf.read("data_1.csv") == b'a,b\n1,2\n3,"multi\nline"\n'
+            assert zf.read("data_2.csv") == b"a,b\n5,6\n"
+
+
+def test_partitioned_zip_entry_writer_no_rows():
+    with NamedTemporaryFile() as zip_file:
+        with zipfile.ZipFile(zip_file.name, "w") as zf:
+            writer = PartitionedZipEntryWriter(zf, "data_%s.csv", row_limit=2)
+            writer.close()
+
+        with zipfile.ZipFile(zip_file.name, "r") as zf:
+            assert zf.namelist() == ["data_1.csv"]
+            assert zf.read("data_1.csv") == b""
+
+
+def test_append_files_to_zip_file_with_compresslevel():
+    with NamedTemporaryFile() as fast_zip_file:
+        with NamedTemporaryFile() as small_zip_file:
+            with NamedTemporaryFile() as include_file:
+                include_file.write(b"".join(b"%d,this is a test\n" % i for i in range(10000)))
+                include_file.flush()
+                append_files_to_zip_file([include_file.name], fast_zip_file.name, compresslevel=1)
+                append_files_to_zip_file([include_file.name], small_zip_file.name, compresslevel=9)
+
+                with zipfile.ZipFile(fast_zip_file.name, "r") as fast_zf:
+                    with zipfile.ZipFile(small_zip_file.name, "r") as small_zf:
+                        fast_info, small_info = fast_zf.infolist()[0], small_zf.infolist()[0]
+                        assert fast_zf.read(fast_info) == small_zf.read(small_info)
+                        assert fast_info.compress_size > small_info.compress_size
+
+
+def _entries(zf):
+    return [(z.filename, z.CRC, z.file_size, z.compress_size, z.date_time, z.external_attr) for z in zf.infolist()]
+
+
+def test_append_files_to_zip_file_in_parallel():
+    with NamedTemporaryFile() as zip_file:
+        with NamedTemporaryFile() as serial_zip_file:
+            with NamedTemporaryFile() as include_file_1:
+                with NamedTemporaryFile() as include_file_2:
+                    include_file_1.write(b"this is a test\n" * 1000)
+                    include_file_1.flush()
+                    include_file_2.write(b"")
+                    include_file_2.flush()
+                    file_paths = [include_file_1.name, include_file_2.name]
+                    with zipfile.ZipFile(zip_file.name, "w") as zf:
+                        zf.writestr("readme.txt", "already in the zip")
+                        zf.comment = b"comment"
+
+                    append_files_to_zip_file(file_paths, zip_file.name, compresslevel=1, max_workers=2)
+                    append_files_to_zip_file(file_paths, serial_zip_file.name, compresslevel=1)
+
+                    with zipfile.ZipFile(zip_file.name, "r") as zf:
+                        with zipfile.ZipFile(serial_zip_file.name, "r") as serial_zf:
+                            assert zf.testzip() is None
+                            assert zf.comment == b"comment"
+                            assert zf.read("readme.txt") == b"already in the zip"
+                            # Same entries as ZipFile.write, compressed the same, after the one already in the zip
+                            assert _entries(zf)[1:] == _entries(serial_zf)
+                    assert not os.path.exists(f"{include_file_1.name}.deflate")
@@ -6,7 +6,9 @@ from usaspending_api.etl.elasticsearch_loader_helpers.delete_data import (
 from usaspending_api.etl.elasticsearch_loader_helpers.extract_data import (
     count_of_records_to_process,
     extract_records,
+    extract_records_in_batches,
     obtain_extract_sql,
+    sample_partition_bounds,
 )
 from usaspending_api.etl.elasticsearch_loader_helpers.index_config import (
     create_award_type_aliases,
@@ -17,7 +19,7 @@ from usaspending_api.etl.elasticsearch_loader_helpers.index_config import (
     toggle_refresh_on,
     check_new_index_name_is_ok,
 )
-from usaspending_api.etl.elasticsearch_loader_helpers.load_data import load_data
+from usaspending_api.etl.elasticsearch_loader_helpers.load_data import load_data, load_data_in_batches
 from usaspending_api.etl.elasticsearch_loader_helpers.transform_data import (
     transform_award_data,
     transform_covid19_faba_data,
@@ -28,6 +30,7 @@ from usaspending_api.etl.elasticsearch_loader_helpers.utilities import (
     execute_sql_statement,
     format_log,
     gen_random_name,
+    PartitionResult,
     TaskSpec,
 )
 from usaspending_api.etl.elasticsearch_loader_helpers.controller import Controller
@@ -43,10 +46,14 @@ __all__ = [
     "deleted_transactions",
     "execute_sql_statement",
     "extract_records",
+    "extract_records_in_batches",
     "format_log",
     "gen_random_name",
     "load_data",
+    "load_data_in_batches",
     "obtain_extract_sql",
+    "PartitionResult",
+    "sample_partition_bounds",
     "set_final_index_config",
     "swap_aliases",
     "take_snapshot",
@@ -1,19 +1,23 @@
-import json
 import logging
 
-from typing import Optional, List
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, Optional, List, Tuple
 
+from usaspending_api.common.elasticsearch.aggregate_key import encode_agg_key
 
 logger = logging.getLogger("script")
 
+_MISSING = object()  # Stand-in for a field absent from the record, which some key functions treat differently
+
 
 def award_recipient_agg_key(record: dict) -> str:
     """Dictionary key order impacts Elasticsearch behavior!!!"""
     if record["recipient_hash"] is None or record["recipient_levels"] is None:
-        return json.dumps(
+        return encode_agg_key(
             {"name": record["recipient_name"], "unique_id": record["recipient_unique_id"], "hash": "", "levels": ""}
         )
-    return json.dumps(
+    return encode_agg_key(
         {
             "name": record["recipient_name"],
             "unique_id": record["recipient_unique_id"],
@@ -26,10 +30,10 @@ def award_recipient_agg_key(record: dict) -> str:
 def transaction_recipient_agg_key(record: dict) -> str:
     """Dictionary key order impacts Elasticsearch behavior!!!"""
     if record["recipient_hash"] is None or record["recipient_levels"] is None:
-        return json.dumps(
+        return encode_agg_key(
             {"name": record["recipient_name"], "unique_id": record["recipient_unique_id"], "hash_with_level": ""}
         )
-    return json.dumps(
+    return encode_agg_key(
         {
             "name": record["recipient_name"],
             "unique_id": record["recipient_unique_id"],
@@ -73,21 +77,21 @@ def _agency_agg_key(agency_type, agency_tier, record: dict) -> Optional[str]:
     if f"{agency_type}_{agency_tier}_agency_code" in record:
         result["code"] = record[f"{agency_type}_{agency_tier}_agency_code"]
     result["id"] = record[f"{agency_type}_toptier_agency_id"]
-    return json.dumps(result)
+    return encode_agg_key(result)
 
 
 def naics_agg_key(record: dict) -> Optional[str]:
     """Dictionary key order impacts Elasticsearch behavior!!!"""
     if record["naics_code"] is None:
         return None
-    return json.dumps({"code": record["naics_code"], "description": record["naics_description"]})
+    return encode_agg_key({"code": record["naics_code"], "description": record["naics_description"]})
 
 
 def psc_agg_key(record: dict) -> Optional[str]:
     """Dictionary key order impacts Elasticsearch behavior!!!"""
     if record["product_or_service_code"] is None:
         return None
-    return json.dumps(
+    return encode_agg_key(
         {"code": record["product_or_service_code"], "description": record["product_or_service_description"]}
     )
 
@@ -104,7 +108,7 @@ def _county_agg_key(location_type, record: dict) -> Optional[str]:
     """Dictionary key order impacts Elasticsearch behavior!!!"""
     if record[f"{location_type}_state_code"] is None or record[f"{location_type}_county_code"] is None:
         return None
-    return json.dumps(
+    return encode_agg_key(
         {
             "country_code": record[f"{location_type}_country_code"],
             "state_code": record[f"{location_type}_state_code"],
@@ -128,7 +132,7 @@ def _congressional_agg_key(location_type, record: dict) -> Optional[str]:
     """Dictionary key order impacts Elasticsearch behavior!!!"""
     if record[f"{location_type}_state_code"] is None or record[f"{location_type}_congressional_code"] is None:
         return None
-    return json.dumps(
+    return encode_agg_key(
         {
             "country_code": record[f"{location_type}_country_code"],
             "state_code": record[f"{location_type}_state_code"],
@@ -151,7 +155,7 @@ def _state_agg_key(location_type, record: dict) -> Optional[str]:
     """Dictionary key order impacts Elasticsearch behavior!!!"""
     if record[f"{location_type}_state_code"] is None:
         return None
-    return json.dumps(
+    return encode_agg_key(
         {
             "country_code": record[f"{location_type}_country_code"],
             "state_code": record[f"{location_type}_state_code"],
@@ -173,9 +177,105 @@ def _country_agg_key(location_type, record: dict) -> Optional[str]:
     """Dictionary key order impacts Elasticsearch behavior!!!"""
     if record[f"{location_type}_country_code"] is None:
         return None
-    return json.dumps(
+    return encode_agg_key(
         {
             "country_code": record[f"{location_type}_country_code"],
             "country_name": record[f"{location_type}_country_name"],
         }
     )
+
+
+def _agency_input_fields(agency_type: str, agency_tier: str) -> Tuple[str, ...]:
+    prefix = f"{agency_type}_{agency_tier}_agency"
+    return f"{prefix}_name", f"{prefix}_abbreviation", f"{prefix}_code", f"{agency_type}_toptier_agency_id"
+
+
+def _location_input_fields(location_type: str, *fields: str) -> Tuple[str, ...]:
+    return tuple(f"{location_type}_{field}" for field in fields)
+
+
+_COUNTY_FIELDS = ("country_code", "state_code", "state_fips", "county_code", "county_name", "county_population")
+_CONGRESSIONAL_FIELDS = ("country_code", "state_code", "state_fips", "congressional_code", "congressional_population")
+_STATE_FIELDS = ("country_code", "state_code", "state_name", "state_population")
+_COUNTRY_FIELDS = ("country_code", "country_name")
+
+# Every record field read by each cached key function. A function's output must depend on nothing else to be cached
+AGG_KEY_INPUT_FIELDS: Dict[Callable, Tuple[str, ...]] = {
+    awarding_subtier_agency_agg_key: _agency_input_fields("awarding", "subtier"),
+    awarding_toptier_agency_agg_key: _agency_input_fields("awarding", "toptier"),
+    funding_subtier_agency_agg_key: _agency_input_fields("funding", "subtier"),
+    funding_toptier_agency_agg_key: _agency_input_fields("funding", "toptier"),
+    naics_agg_key: ("naics_code", "naics_description"),
+    psc_agg_key: ("product_or_service_code", "product_or_service_description"),
+    pop_county_agg_key: _location_input_fields("pop", *_COUNTY_FIELDS),
+    recipient_location_county_agg_key: _location_input_fields("recipient_location", *_COUNTY_FIELDS),
+    pop_congressional_agg_key: _location_input_fields("pop", *_CONGRESSIONAL_FIELDS),
+    recipient_location_congressional_agg_key: _location_input_fields("recipient_location", *_CONGRESSIONAL_FIELDS),
+    pop_state_agg_key: _location_input_fields("pop", *_STATE_FIELDS),
+    recipient_location_state_agg_key: _location_input_fields("recipient_location", *_STATE_FIELDS),
+    pop_country_agg_key: _location_input_fields("pop", *_COUNTRY_FIELDS),
+    recipient_location_country_agg_key: _location_input_fields("recipient_location", *_COUNTRY_FIELDS),
+}
+
+
+# Agency, code, and location values repeat massively across records, so their serialized keys are memoized on the
+# values of the fields each function reads. Each cache holds the function's distinct keys with room to spare.
+# Recipient keys are nearly as many as the records themselves and aren't cached.
+AGG_KEY_CACHE_SIZES: Dict[Callable, int] = {
+    awarding_subtier_agency_agg_key: 2 ** 12,
+    awarding_toptier_agency_agg_key: 2 ** 10,
+    funding_subtier_agency_agg_key: 2 ** 12,
+    funding_toptier_agency_agg_key: 2 ** 10,
+    naics_agg_key: 2 ** 13,
+    psc_agg_key: 2 ** 13,
+    pop_county_agg_key: 2 ** 13,
+    recipient_location_county_agg_key: 2 ** 13,
+    pop_congressional_agg_key: 2 ** 11,
+    recipient_location_congressional_agg_key: 2 ** 11,
+    pop_state_agg_key: 2 ** 9,
+    recipient_location_state_agg_key: 2 ** 9,
+    pop_country_agg_key: 2 ** 9,
+    recipient_location_country_agg_key: 2 ** 9,
+}
+
+
+def _agg_key_from_values(func: Callable) -> Callable[[tuple], Optional[str]]:
+    fields = AGG_KEY_INPUT_FIELDS[func]
+
+    @lru_cache(maxsize=AGG_KEY_CACHE_SIZES[func])
+    def _from_values(values: tuple) -> Optional[str]:
+        return func({f: v for f, v in zip(fields, values) if v is not _MISSING})
+
+    return _from_values
+
+
+# Shared by every cached_agg_key for the life of the process
+_AGG_KEY_FROM_VALUES: Dict[Callable, Callable[[tuple], Optional[str]]] = {
+    func: _agg_key_from_values(func) for func in AGG_KEY_CACHE_SIZES
+}
+
+
+def cached_agg_key(func: Callable) -> Callable[[dict], Optional[str]]:
+    """
+    Return a drop-in replacement for ``func`` that serializes each distinct combination of input values only once,
+    or ``func`` itself when its keys aren't cached (see AGG_KEY_CACHE_SIZES).
+    Output is identical to ``func`` as long as all values of a given field share a type (as they do when read
+    from a single DB column), since e.g. 1 and 1.0 hit the same cache entry but serialize differently.
+    """
+    from_values = _AGG_KEY_FROM_VALUES.get(func)
+    if from_values is None:
+        return func
+    fields = AGG_KEY_INPUT_FIELDS[func]
+    getter = itemgetter(*fields)
+
+    def _cached_func(record: dict) -> Optional[str]:
+        try:
+            values = getter(record)
+        except KeyError:  # optional fields (e.g. agency abbreviation) are absent from some record types
+            values = tuple(record.get(f, _MISSING) for f in fields)
+        try:
+            return from_values(values)
+        except TypeError:  # an unexpected unhashable value; compute the key directly
+            return func(record)
+
+    return _cached_func
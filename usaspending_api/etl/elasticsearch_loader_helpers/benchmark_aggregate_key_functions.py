@@ -0,0 +1,109 @@
+"""
+Micro-benchmark of the aggregation key functions with and without cached_agg_key, on generated transaction records
+whose agency, code, location and recipient values have roughly the cardinality of the real data.  Run it from the
+root of the repo with the same environment as the ETL:
+
+    python -m usaspending_api.etl.elasticsearch_loader_helpers.benchmark_aggregate_key_functions
+"""
+import django
+import os
+import random
+
+from time import perf_counter
+
+RECORD_COUNT = 200000
+
+
+def generate_records(count):
+    random.seed(1)
+    records = []
+    for _ in range(count):
+        record = {}
+        for agency_type in ("awarding", "funding"):
+            subtier = random.randint(1, 1500)
+            toptier = subtier % 150 + 1
+            record.update(
+                {
+                    f"{agency_type}_toptier_agency_name": f"Toptier Agency {toptier}",
+                    f"{agency_type}_toptier_agency_abbreviation": f"TA{toptier}",
+                    f"{agency_type}_toptier_agency_code": f"{toptier:03}",
+                    f"{agency_type}_toptier_agency_id": toptier,
+                    f"{agency_type}_subtier_agency_name": f"Subtier Agency {subtier}",
+                    f"{agency_type}_subtier_agency_abbreviation": f"SA{subtier}",
+                    f"{agency_type}_subtier_agency_code": f"{subtier:04}",
+                }
+            )
+        for location_type in ("pop", "recipient_location"):
+            if random.random() < 0.05:
+                country = random.randint(1, 250)
+                record.update(
+                    {
+                        f"{location_type}_country_code": f"C{country}",
+                        f"{location_type}_country_name": f"Country {country}",
+                        f"{location_type}_state_code": None,
+                        f"{location_type}_county_code": None,
+                        f"{location_type}_congressional_code": None,
+                    }
+                )
+                continue
+            state, county = random.randint(1, 56), random.randint(1, 60)
+            record.update(
+                {
+                    f"{location_type}_country_code": "USA",
+                    f"{location_type}_country_name": "UNITED STATES",
+                    f"{location_type}_state_code": f"S{state}",
+                    f"{location_type}_state_fips": f"{state:02}",
+                    f"{location_type}_state_name": f"State {state}",
+                    f"{location_type}_state_population": state * 100000,
+                    f"{location_type}_county_code": f"{county:03}",
+                    f"{location_type}_county_name": f"County {state}-{county}",
+                    f"{location_type}_county_population": state * county * 100,
+                    f"{location_type}_congressional_code": f"{random.randint(1, 8):02}",
+                    f"{location_type}_congressional_population": state * 10000,
+                }
+            )
+        naics, psc = random.randint(1, 2000), random.randint(1, 5000)
+        record.update(
+            {
+                "naics_code": f"{naics:06}",
+                "naics_description": f"NAICS {naics}",
+                "product_or_service_code": f"P{psc:03}",
+                "product_or_service_description": f"PSC {psc}",
+                "recipient_name": f"Recipient {random.randint(1, count)}",
+                "recipient_unique_id": f"{random.randint(1, count):09}",
+                "recipient_hash": f"{random.getrandbits(128):032x}",
+                "recipient_levels": random.choice([["C"], ["P"], ["C", "R"], None]),
+            }
+        )
+        records.append(record)
+    return records
+
+
+def main():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "usaspending_api.settings")
+    django.setup()
+    from usaspending_api.etl.elasticsearch_loader_helpers import aggregate_key_functions as funcs
+
+    key_funcs = [func for func in funcs.AGG_KEY_CACHE_SIZES] + [funcs.transaction_recipient_agg_key]
+    records = generate_records(RECORD_COUNT)
+
+    start = perf_counter()
+    expected = [[func(record) for func in key_funcs] for record in records]
+    uncached = perf_counter() - start
+
+    cached_funcs = [funcs.cached_agg_key(func) for func in key_funcs]
+    start = perf_counter()
+    keys = [[func(record) for func in cached_funcs] for record in records]
+    cached = perf_counter() - start
+
+    assert keys == expected
+    print(f"{len(key_funcs)} key functions on {RECORD_COUNT:,} records")
+    print(f"uncached: {RECORD_COUNT / uncached:,.0f} records/s")
+    print(f"cached:   {RECORD_COUNT / cached:,.0f} records/s")
+    for func, from_values in funcs._AGG_KEY_FROM_VALUES.items():
+        info = from_values.cache_info()
+        print(f"  {func.__name__}: {info.currsize:,} of {info.maxsize:,} cached, {info.hits / RECORD_COUNT:.1%} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import json
+import logging
+import os
+
+from django.conf import settings
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from usaspending_api.etl.elasticsearch_loader_helpers.utilities import format_log
+
+logger = logging.getLogger("script")
+
+NULL_PARTITION_KEY = "NULL"
+
+
+class PartitionCheckpoint:
+    """
+    Local record of the partition plan for a new index and which of its partitions finished loading, so that a
+    failed run can be resumed against the same index. Only the parent process of the ETL reads or writes it.
+    """
+
+    def __init__(self, index_name: str, directory: Optional[str] = None):
+        self.path = Path(directory or settings.ES_ETL_CHECKPOINT_DIR) / f"{index_name}.json"
+        self.partition_bounds: List[Tuple[int, int]] = []
+        self.completed = set()
+
+    @staticmethod
+    def partition_key(lower_bound: Optional[int], upper_bound: Optional[int], is_null_partition: bool = False) -> str:
+        if is_null_partition:
+            return NULL_PARTITION_KEY
+        return f"{lower_bound}-{upper_bound}"
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> None:
+        contents = json.loads(self.path.read_text())
+        self.partition_bounds = [tuple(bounds) for bounds in contents["partition_bounds"]]
+        self.completed = set(contents["completed"])
+        msg = f"Loaded checkpoint '{self.path}': {len(self.completed):,} of the planned partitions are complete"
+        logger.info(format_log(msg))
+
+    def save(self) -> None:
+        """Write to a temp file and rename it so an interrupted write never leaves a corrupt checkpoint"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        contents = {"partition_bounds": self.partition_bounds, "completed": sorted(self.completed)}
+        temp_path.write_text(json.dumps(contents))
+        os.replace(temp_path, self.path)
+
+    def mark_complete(self, partition_key: str) -> None:
+        self.completed.add(partition_key)
+        self.save()
+
+    def delete(self) -> None:
+        if self.exists():
+            self.path.unlink()
+            logger.info(format_log(f"Removed checkpoint '{self.path}'"))
@@ -1,29 +1,38 @@
 import logging
+import queue
 
 from django.core.management import call_command
+from elasticsearch import Elasticsearch
 from math import ceil
-from multiprocessing import Pool, Event, Value
-from time import perf_counter
-from typing import Generator, List, Tuple
+from statistics import median
+from multiprocessing import Pool, Event, Process, Queue, Value
+from time import perf_counter, time
+from typing import Generator, List, Optional, Tuple
 
 from usaspending_api.broker.helpers.last_load_date import update_last_load_date
-from usaspending_api.common.elasticsearch.client import instantiate_elasticsearch_client
+from usaspending_api.common.elasticsearch.client import es_client_pool_metrics, instantiate_elasticsearch_client
 from usaspending_api.etl.elasticsearch_loader_helpers import (
     count_of_records_to_process,
     create_index,
     deleted_awards,
     deleted_transactions,
     extract_records,
+    extract_records_in_batches,
     format_log,
     gen_random_name,
     load_data,
+    load_data_in_batches,
     obtain_extract_sql,
+    PartitionResult,
+    sample_partition_bounds,
     set_final_index_config,
     swap_aliases,
     TaskSpec,
     toggle_refresh_on,
 )
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.helpers.sql_helpers import close_all_django_db_conns
+from usaspending_api.etl.elasticsearch_loader_helpers.checkpoint import PartitionCheckpoint
 
 logger = logging.getLogger("script")
 
@@ -46,6 +55,10 @@ class Controller:
     def __init__(self, config):
         self.config = config
         self.tasks = []
+        self.partition_bounds = []
+        self.partition_keys = {}
+        # Only new indexes are checkpointed; incremental loads are short and write through the shared load alias
+        self.checkpoint = PartitionCheckpoint(config["index_name"]) if config["create_new_index"] else None
 
     def prepare_for_etl(self) -> None:
         logger.info(format_log("Assessing data to process"))
@@ -55,7 +68,25 @@ class Controller:
             self.processes = []
             return
 
-        self.config["partitions"] = self.determine_partitions()
+        if self.config.get("resume"):
+            self.load_partition_plan_from_checkpoint()
+        elif self.config.get("adaptive_partitions"):
+            self.partition_bounds = sample_partition_bounds(
+                self.config, self.record_count, self.min_id, self.max_id, self.determine_partitions()
+            )
+            self.config["partitions"] = len(self.partition_bounds)
+        else:
+            self.config["partitions"] = self.determine_partitions()
+
+        if self.checkpoint and not self.config.get("resume"):
+            # Persist the plan itself, since re-planning on resume (from changed data or a new sample) would yield
+            # different partition bounds than those recorded as complete
+            if not self.partition_bounds:
+                self.partition_bounds = [self.get_id_range_for_partition(i) for i in range(self.config["partitions"])]
+            self.checkpoint.partition_bounds = self.partition_bounds
+            self.checkpoint.completed = set()
+            self.checkpoint.save()
+
         self.config["processes"] = min(self.config["processes"], self.config["partitions"])
         self.tasks = self.construct_tasks()
 
@@ -73,18 +104,118 @@ class Controller:
             call_command("es_configure", "--template-only", f"--load-type={self.config['data_type']}")
             create_index(self.config["index_name"], instantiate_elasticsearch_client())
 
+    def load_partition_plan_from_checkpoint(self) -> None:
+        if not self.checkpoint or not self.checkpoint.exists():
+            raise RuntimeError(f"No checkpoint found to resume loading index '{self.config['index_name']}'")
+        self.checkpoint.load()
+        self.partition_bounds = list(self.checkpoint.partition_bounds)
+        planned_max_id = self.partition_bounds[-1][1]
+        if self.max_id > planned_max_id:
+            # Records added since the original run would otherwise be left out of the index
+            self.partition_bounds.append((planned_max_id + 1, self.max_id))
+            self.checkpoint.partition_bounds = self.partition_bounds
+            self.checkpoint.save()
+        self.config["partitions"] = len(self.partition_bounds)
+
     def dispatch_tasks(self) -> None:
+        if self.config.get("pipeline"):
+            return self.dispatch_pipelined_tasks()
+
         _abort = Event()  # Event which when set signals an error occurred in a subprocess
         parallel_procs = self.config["processes"]
+        results = []
         with Pool(parallel_procs, maxtasksperchild=1, initializer=init_shared_abort, initargs=(_abort,)) as pool:
-            pool.map(extract_transform_load, self.tasks)
+            # chunksize=1 lets each idle process pull the next partition as soon as it finishes its current one,
+            # rather than pre-assigning fixed slices of the task list which leaves the run waiting on a few processes
+            for result in pool.imap_unordered(extract_transform_load, self.tasks, chunksize=1):
+                if result:
+                    results.append(result)
+                    self.checkpoint_partition(result)
 
         msg = f"Total documents indexed: {total_doc_success.value}, total document fails: {total_doc_fail.value}"
         logger.info(format_log(msg))
+        self.report_partition_results(results)
 
         if _abort.is_set():
             raise RuntimeError("One or more partitions failed!")
 
+    def dispatch_pipelined_tasks(self) -> None:
+        """
+        Run extract, transform and index as separate pools of processes connected by bounded queues, so the
+        database and the Elasticsearch cluster are both kept busy. The bounded queues apply backpressure: when
+        indexing falls behind, extraction blocks instead of piling batches up in memory.
+        """
+        _abort = Event()
+        queue_size = self.config["pipeline_queue_size"]
+        task_queue, results_queue = Queue(), Queue()
+        transform_queue, index_queue = Queue(maxsize=queue_size), Queue(maxsize=queue_size)
+
+        stages = [
+            [
+                Process(target=_pipeline_extract, args=(task_queue, transform_queue, results_queue, _abort))
+                for _ in range(self.config["extract_workers"])
+            ],
+            [
+                Process(target=_pipeline_transform, args=(transform_queue, index_queue, _abort))
+                for _ in range(self.config["transform_workers"])
+            ],
+            [
+                Process(target=_pipeline_index, args=(index_queue, results_queue, _abort))
+                for _ in range(self.config["index_workers"])
+            ],
+        ]
+        downstream_queues = [transform_queue, index_queue, None]
+        logger.info(
+            format_log(
+                f"Starting pipeline with {len(stages[0])} extract, {len(stages[1])} transform "
+                f"and {len(stages[2])} index processes (queue size: {queue_size})"
+            )
+        )
+
+        for task in self.tasks:
+            task_queue.put(task)
+        for _ in stages[0]:
+            task_queue.put(None)  # one sentinel per extract process
+        for process in [p for stage in stages for p in stage]:
+            process.start()
+
+        tracker = PipelineTracker()
+        stopped_stages = set()
+        while len(stopped_stages) < len(stages):
+            try:
+                self.checkpoint_partition(tracker.record(results_queue.get(timeout=1)))
+            except queue.Empty:
+                pass
+            for i, stage in enumerate(stages):
+                if i not in stopped_stages and not any(p.is_alive() for p in stage):
+                    # A stage is done once all of its processes exit, which in turn shuts down the next stage
+                    stopped_stages.add(i)
+                    if downstream_queues[i] is not None:
+                        for _ in stages[i + 1]:
+                            downstream_queues[i].put(None)
+
+        while True:
+            try:
+                self.checkpoint_partition(tracker.record(results_queue.get(timeout=1)))
+            except queue.Empty:
+                break
+
+        with total_doc_success.get_lock():
+            total_doc_success.value += tracker.success
+        with total_doc_fail.get_lock():
+            total_doc_fail.value += tracker.fail
+
+        msg = f"Total documents indexed: {total_doc_success.value}, total document fails: {total_doc_fail.value}"
+        logger.info(format_log(msg))
+        self.report_partition_results(tracker.completed)
+
+        if _abort.is_set() or len(tracker.completed) != len(self.tasks):
+            raise RuntimeError("One or more partitions failed!")
+
+    def checkpoint_partition(self, result: Optional[PartitionResult]) -> None:
+        if self.checkpoint and result:
+            self.checkpoint.mark_complete(self.partition_keys[result.partition_number])
+
     def complete_process(self) -> None:
         client = instantiate_elasticsearch_client()
         if self.config["create_new_index"]:
@@ -94,6 +225,7 @@ class Controller:
             else:
                 logger.info(format_log("Closing old indices and adding aliases"))
                 swap_aliases(client, self.config)
+            self.checkpoint.delete()
 
         close_all_django_db_conns()
 
@@ -104,8 +236,36 @@ class Controller:
             )
             update_last_load_date(f"{self.config['stored_date_key']}", self.config["processing_start_datetime"])
 
+        log_es_client_pool_metrics()
+        bump_data_version()
+
+    def report_partition_results(self, results: List[PartitionResult]) -> None:
+        if not results:
+            return
+        counts = [r.record_count for r in results]
+        durations = [r.duration for r in results]
+        logger.info(
+            format_log(
+                f"Processed {len(results):,} partitions | "
+                f"records min/median/max: {min(counts):,}/{median(counts):,.0f}/{max(counts):,} | "
+                f"seconds min/median/max: {min(durations):.2f}/{median(durations):.2f}/{max(durations):.2f}"
+            )
+        )
+        for result in sorted(results, key=lambda r: r.duration, reverse=True)[:5]:
+            lower_bound, upper_bound = self.get_id_range_for_partition(result.partition_number)
+            logger.info(
+                format_log(
+                    f"Slowest: partition #{result.partition_number} (IDs {lower_bound} to {upper_bound}) "
+                    f"{result.record_count:,} records in {result.duration:.2f}s",
+                    name=result.name,
+                )
+            )
+
     def determine_partitions(self) -> int:
         """Create partition size less than or equal to max_size for more even distribution"""
+        if self.config.get("adaptive_partitions"):
+            # Sampled partition bounds follow the row density, so the ID range width is irrelevant
+            return max(ceil(self.record_count / self.config["partition_size"]), 1)
         if self.config["partition_size"] > (self.max_id - self.min_id):
             return 1
         # return ceil(self.record_count / self.config["partition_size"])
@@ -119,10 +279,20 @@ class Controller:
         if self.config["extra_null_partition"]:
             task_list.insert(0, self.configure_task(self.config["partitions"], name_gen, True))
 
+        if self.config.get("resume"):
+            completed = self.checkpoint.completed
+            remaining = [t for t in task_list if self.partition_keys[t.partition_number] not in completed]
+            msg = f"Resuming: skipping {len(task_list) - len(remaining):,} partitions completed by a previous run"
+            logger.info(format_log(msg))
+            task_list = remaining
+
         return task_list
 
     def configure_task(self, partition_number: int, name_gen: Generator, is_null_partition: bool = False) -> TaskSpec:
         lower_bound, upper_bound = self.get_id_range_for_partition(partition_number)
+        self.partition_keys[partition_number] = PartitionCheckpoint.partition_key(
+            lower_bound, upper_bound, is_null_partition
+        )
         sql_config = {**self.config, **{"lower_bound": lower_bound, "upper_bound": upper_bound}}
         sql_str = obtain_extract_sql(sql_config, is_null_partition)
 
@@ -139,9 +309,15 @@ class Controller:
             sql=sql_str,
             transform_func=self.config["data_transform_func"],
             view=self.config["sql_view"],
+            stream_batch_size=self.config.get("stream_batch_size"),
         )
 
     def get_id_range_for_partition(self, partition_number: int) -> Tuple[int, int]:
+        if self.partition_bounds:
+            # The extra NULL partition is numbered after the last bounded one and doesn't use an ID range
+            if partition_number >= len(self.partition_bounds):
+                return None, None
+            return self.partition_bounds[partition_number]
         range_size = ceil((self.max_id - self.min_id) / self.config["partitions"])
         lower_bound = self.min_id + (range_size * partition_number)
         upper_bound = min(self.min_id + ((range_size * (partition_number + 1) - 1)), self.max_id)
@@ -159,10 +335,10 @@ class Controller:
             raise RuntimeError(f"No delete function implemented for type {self.config['data_type']}")
 
 
-def extract_transform_load(task: TaskSpec) -> None:
+def extract_transform_load(task: TaskSpec) -> Optional[PartitionResult]:
     if abort.is_set():
         logger.warning(format_log(f"Skipping partition #{task.partition_number} due to previous error", name=task.name))
-        return
+        return None
 
     start = perf_counter()
     msg = f"Started processing on partition #{task.partition_number}: {task.name}"
@@ -170,16 +346,19 @@ def extract_transform_load(task: TaskSpec) -> None:
 
     client = instantiate_elasticsearch_client()
     try:
-        records = task.transform_func(task, extract_records(task))
-        if abort.is_set():
-            f"Prematurely ending partition #{task.partition_number} due to error in another process"
-            logger.warning(format_log(msg, name=task.name))
-            return
-        if len(records) > 0:
-            success, fail = load_data(task, records, client)
+        if task.stream_batch_size:
+            success, fail = stream_transform_load(task, client)
         else:
-            logger.info(format_log("No records to index", name=task.name))
-            success, fail = 0, 0
+            records = task.transform_func(task, extract_records(task))
+            if abort.is_set():
+                f"Prematurely ending partition #{task.partition_number} due to error in another process"
+                logger.warning(format_log(msg, name=task.name))
+                return None
+            if len(records) > 0:
+                success, fail = load_data(task, records, client)
+            else:
+                logger.info(format_log("No records to index", name=task.name))
+                success, fail = 0, 0
         with total_doc_success.get_lock():
             total_doc_success.value += success
         with total_doc_fail.get_lock():
@@ -192,5 +371,113 @@ def extract_transform_load(task: TaskSpec) -> None:
             logger.error(format_log(f"{task.name} failed!", name=task.name))
             abort.set()
     else:
-        msg = f"Partition #{task.partition_number} was successfully processed in {perf_counter() - start:.2f}s"
+        duration = perf_counter() - start
+        msg = f"Partition #{task.partition_number} was successfully processed in {duration:.2f}s"
         logger.info(format_log(msg, name=task.name))
+        log_es_client_pool_metrics(name=task.name)
+        return PartitionResult(task.name, task.partition_number, success + fail, duration)
+    return None
+
+
+def log_es_client_pool_metrics(name: Optional[str] = None) -> None:
+    """Log how this process's shared ES clients have used their connection pools (see es_client_pool_metrics)"""
+    for client_key, metrics in es_client_pool_metrics().items():
+        for host, node in metrics["nodes"].items():
+            msg = (
+                f"ES client '{client_key}' used {metrics['uses']:,} times | {host}: {node['requests']:,} requests, "
+                f"{node['opened']:,} connections opened, {node['idle']:,} of {node['maxsize']:,} idle"
+            )
+            logger.info(format_log(msg, name=name))
+
+
+def stream_transform_load(task: TaskSpec, client: Elasticsearch) -> Tuple[int, int]:
+    """Generator pipeline: batches flow from a server-side cursor, through the transform, into the bulk indexer"""
+
+    def _transformed_batches():
+        for batch in extract_records_in_batches(task):
+            if abort.is_set():
+                msg = f"Prematurely ending partition #{task.partition_number} due to error in another process"
+                raise RuntimeError(msg)
+            yield task.transform_func(task, batch)
+
+    return load_data_in_batches(task, _transformed_batches(), client)
+
+
+class PipelineTracker:
+    """Assembles per-partition results from the messages emitted by the pipeline's extract and index stages"""
+
+    def __init__(self):
+        self.success, self.fail = 0, 0
+        self.completed = []
+        self._partitions = {}
+
+    def record(self, message: tuple) -> Optional[PartitionResult]:
+        """Returns the partition's result if this message completed it"""
+        kind, name, partition_number = message[:3]
+        state = self._partitions.setdefault(
+            partition_number, {"batches": None, "indexed": 0, "records": 0, "start": None}
+        )
+        if kind == "extracted":
+            state["batches"], state["start"] = message[3], message[4]
+        elif kind == "indexed":
+            state["indexed"] += 1
+            state["records"] += message[3] + message[4]
+            self.success += message[3]
+            self.fail += message[4]
+
+        if state["batches"] is not None and state["indexed"] == state["batches"]:
+            duration = time() - state["start"]
+            msg = f"Partition #{partition_number} was successfully processed in {duration:.2f}s"
+            logger.info(format_log(msg, name=name))
+            result = PartitionResult(name, partition_number, state["records"], duration)
+            self.completed.append(result)
+            del self._partitions[partition_number]
+            return result
+        return None
+
+
+def _pipeline_extract(task_queue: Queue, transform_queue: Queue, results_queue: Queue, _abort: Event) -> None:
+    for task in iter(task_queue.get, None):
+        if _abort.is_set():
+            continue
+        start = time()
+        try:
+            batches = extract_records_in_batches(task) if task.stream_batch_size else [extract_records(task)]
+            batch_count = 0
+            for batch in batches:
+                if _abort.is_set():
+                    break
+                transform_queue.put((task, batch))
+                batch_count += 1
+            else:
+                results_queue.put(("extracted", task.name, task.partition_number, batch_count, start))
+        except Exception:
+            logger.exception(format_log(f"{task.name} failed!", name=task.name, action="Extract"))
+            _abort.set()
+
+
+def _pipeline_transform(transform_queue: Queue, index_queue: Queue, _abort: Event) -> None:
+    # Downstream stages keep draining their queue after an abort so that upstream processes never block on put()
+    for task, batch in iter(transform_queue.get, None):
+        if _abort.is_set():
+            continue
+        try:
+            index_queue.put((task, task.transform_func(task, batch)))
+        except Exception:
+            logger.exception(format_log(f"{task.name} failed!", name=task.name, action="Transform"))
+            _abort.set()
+
+
+def _pipeline_index(index_queue: Queue, results_queue: Queue, _abort: Event) -> None:
+    client = instantiate_elasticsearch_client()
+    for task, records in iter(index_queue.get, None):
+        if _abort.is_set():
+            continue
+        try:
+            success, fail = load_data(task, records, client) if records else (0, 0)
+        except Exception:
+            logger.exception(format_log(f"{task.name} failed!", name=task.name, action="Index"))
+            _abort.set()
+        else:
+            results_queue.put(("indexed", task.name, task.partition_number, success, fail))
+    log_es_client_pool_metrics(name="Index")
@@ -5,7 +5,7 @@ import pandas as pd
 from collections import defaultdict
 from django.conf import settings
 from time import perf_counter
-from typing import Tuple, List, Optional
+from typing import Callable, Tuple, List, Optional
 
 from elasticsearch import Elasticsearch
 from elasticsearch_dsl import Search, Q as ES_Q
@@ -25,15 +25,38 @@ from usaspending_api.etl.elasticsearch_loader_helpers.utilities import (
 logger = logging.getLogger("script")
 
 
-def _delete_query(response: dict) -> dict:
-    return {"query": {"ids": {"values": [i["_id"] for i in response["hits"]["hits"]]}}}
+# Parameters for every _delete_by_query issued by the ETL. Refreshing is skipped because incremental loads disable
+# index refresh until the end of the run, and docs from prior runs (the only ones deleted) are already searchable.
+# Slicing parallelizes the delete across shards. Version conflicts don't abort the delete part way through; the docs
+# that hit one are left in place and reported, and the delete is re-run for them (see _run_delete_by_query).
+DELETE_BY_QUERY_PARAMS = {"refresh": False, "slices": "auto", "conflicts": "proceed"}
+DELETE_BY_QUERY_CONFLICT_RETRIES = 3
+
+
+def _run_delete_by_query(delete: Callable[[], dict], task_id: Optional[Tuple[int, str]] = None) -> int:
+    """
+    Run a _delete_by_query until none of the matching documents are skipped because of a version conflict, and return
+    the number of documents deleted. Conflicted documents still match the query, so re-running it picks them up.
+    Raises a RuntimeError if the delete reports failures or documents are still conflicted after the retries.
+    """
+    deleted = 0
+    for attempt in range(DELETE_BY_QUERY_CONFLICT_RETRIES + 1):
+        response = delete()
+        deleted += response["deleted"]
+        if response["failures"]:
+            raise RuntimeError(f"_delete_by_query failed after deleting {deleted:,} documents: {response['failures']}")
+        if not response["version_conflicts"]:
+            return deleted
+        msg = f"{response['version_conflicts']:,} document(s) not deleted due to version conflicts"
+        if attempt < DELETE_BY_QUERY_CONFLICT_RETRIES:
+            logger.warning(format_log(f"{msg}. Retrying", name=task_id, action="Delete"))
+    raise RuntimeError(f"{msg} after {DELETE_BY_QUERY_CONFLICT_RETRIES} retries")
 
 
 def _delete_from_es(
     client: Elasticsearch,
     id_list: List[dict],
     index: str,
-    max_query_size: int,
     use_aliases: bool = False,
     task_id: Optional[Tuple[int, str]] = None,
 ) -> None:
@@ -56,30 +79,30 @@ def _delete_from_es(
 
     if use_aliases:
         index = f"{index}-*"
-    start_ = client.count(index=index)["count"]
-    logger.info(format_log(f"Starting amount of indices ----- {start_:,}", name=task_id, action="Delete"))
     col_to_items_dict = defaultdict(list)
     for line in id_list:
         col_to_items_dict[line["col"]].append(line["key"])
 
+    record_count = 0
     for column, values in col_to_items_dict.items():
         logger.info(format_log(f"Deleting {len(values):,} of '{column}'", name=task_id, action="Delete"))
+        # Unique key fields may be analyzed text (no keyword sub-field), so match_phrase queries are used rather
+        # than a terms query. Chunk size keeps each query under the default limit of 1024 boolean clauses.
         values_generator = chunks(values, 1000)
         for v in values_generator:
             # IMPORTANT: This delete routine looks at just 1 index at a time. If there are duplicate records across
             # multiple indexes, those duplicates will not be caught by this routine. It is left as is because at the
             # time of this comment, we are migrating to using a single index.
             body = filter_query(column, v)
-            response = client.search(index=index, body=json.dumps(body), size=max_query_size)
-            delete_body = _delete_query(response)
             try:
-                client.delete_by_query(index=index, body=json.dumps(delete_body), refresh=True, size=max_query_size)
+                record_count += _run_delete_by_query(
+                    lambda: client.delete_by_query(index=index, body=json.dumps(body), **DELETE_BY_QUERY_PARAMS),
+                    task_id,
+                )
             except Exception:
                 logger.exception(format_log("", name=task_id, action="Delete"))
                 raise SystemExit(1)
 
-    end_ = client.count(index=index)["count"]
-    record_count = start_ - end_
     duration = perf_counter() - start
     msg = f"Delete operation took {duration:.2f}s. Removed {record_count:,} document{'s' if record_count != 1 else ''}"
     logger.info(format_log(msg, name=task_id, action="Delete"))
@@ -125,9 +148,8 @@ def delete_docs_by_unique_key(client: Elasticsearch, key: str, value_list: list,
             q = ES_Q("terms", **{key: chunk_of_values})
             # Invoking _delete_by_query as per the elasticsearch-dsl docs:
             #   https://elasticsearch-dsl.readthedocs.io/en/latest/search_dsl.html#delete-by-query
-            response = Search(using=client, index=index).filter(q).delete()
-            chunk_deletes = response["deleted"]
-            deleted += chunk_deletes
+            search = Search(using=client, index=index).filter(q).params(**DELETE_BY_QUERY_PARAMS)
+            deleted += _run_delete_by_query(search.delete, task_id)
     except Exception:
         is_error = True
         logger.exception(format_log("", name=task_id, action="Delete"))
@@ -218,13 +240,7 @@ def deleted_awards(client: Elasticsearch, config: dict) -> None:
         {"key": deleted_award[config["unique_key_field"]], "col": config["unique_key_field"]}
         for deleted_award in deleted_award_ids
     ]
-    _delete_from_es(
-        client,
-        award_id_list,
-        index=config["query_alias_prefix"],
-        max_query_size=config["max_query_size"],
-        use_aliases=True,
-    )
+    _delete_from_es(client, award_id_list, index=config["query_alias_prefix"], use_aliases=True)
 
     return
 
@@ -232,9 +248,7 @@ def deleted_awards(client: Elasticsearch, config: dict) -> None:
 def deleted_transactions(client: Elasticsearch, config: dict) -> None:
     deleted_ids = _gather_deleted_ids(config)
     id_list = [{"key": deleted_id, "col": config["unique_key_field"]} for deleted_id in deleted_ids]
-    _delete_from_es(
-        client, id_list, index=config["query_alias_prefix"], max_query_size=config["max_query_size"], use_aliases=True
-    )
+    _delete_from_es(client, id_list, index=config["query_alias_prefix"], use_aliases=True)
 
 
 def _gather_deleted_ids(config: dict) -> list:
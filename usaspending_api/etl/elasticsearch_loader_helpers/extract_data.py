@@ -1,9 +1,14 @@
 import logging
 
 from time import perf_counter
-from typing import List, Tuple
+from typing import Generator, List, Tuple
 
-from usaspending_api.etl.elasticsearch_loader_helpers.utilities import TaskSpec, format_log, execute_sql_statement
+from usaspending_api.etl.elasticsearch_loader_helpers.utilities import (
+    TaskSpec,
+    format_log,
+    execute_sql_statement,
+    execute_sql_statement_in_batches,
+)
 
 logger = logging.getLogger("script")
 
@@ -31,6 +36,20 @@ MIN_MAX_COUNT_SQL = """
     "\n", ""
 )
 
+# Quantiles of the primary key are computed over a random sample of rows rather than the whole view, since only
+# approximately equal row counts are needed per partition
+PARTITION_BOUNDS_SQL = """
+    SELECT percentile_disc(ARRAY[{quantiles}]) WITHIN GROUP (ORDER BY "{primary_key}") AS bounds
+    FROM "{sql_view}"
+    {optional_predicate} "{primary_key}" IS NOT NULL AND random() < {sample_rate}
+""".replace(
+    "\n", ""
+)
+
+# Sampled rows per partition. Higher values yield more evenly-sized partitions at the cost of a slower sample query
+PARTITION_SAMPLE_ROWS_PER_PARTITION = 100
+PARTITION_SAMPLE_MIN_ROWS = 10000
+
 
 def obtain_min_max_count_sql(config: dict) -> str:
     if "optional_predicate" not in config:
@@ -52,6 +71,49 @@ def obtain_extract_sql(config: dict, is_null_partition: bool = False) -> str:
     return sql.format(**config).format(**config)  # fugly. Allow string values to have expressions
 
 
+def obtain_partition_bounds_sql(config: dict, partitions: int, sample_rate: float) -> str:
+    quantiles = ", ".join(f"{i / partitions:.8f}" for i in range(1, partitions))
+    sql_config = {**config, "quantiles": quantiles, "sample_rate": f"{sample_rate:.8f}"}
+    if not sql_config.get("optional_predicate"):
+        sql_config["optional_predicate"] = "WHERE"
+    else:
+        sql_config["optional_predicate"] += " AND "
+    return PARTITION_BOUNDS_SQL.format(**sql_config).format(**sql_config)  # Allow string values to have expressions
+
+
+def partition_bounds_from_quantiles(quantiles: List[int], min_id: int, max_id: int) -> List[Tuple[int, int]]:
+    """
+    Convert ascending primary key quantiles into contiguous, non-overlapping (lower, upper) ID ranges covering
+    [min_id, max_id]. Duplicate quantiles (from very dense ID ranges or a small sample) are collapsed.
+    """
+    bounds, lower = [], min_id
+    for cut in sorted(set(q for q in quantiles if q is not None)):
+        if lower <= cut < max_id:
+            bounds.append((lower, cut))
+            lower = cut + 1
+    bounds.append((lower, max_id))
+    return bounds
+
+
+def sample_partition_bounds(
+    config: dict, record_count: int, min_id: int, max_id: int, partitions: int
+) -> List[Tuple[int, int]]:
+    """Plan up to ``partitions`` ID ranges holding roughly equal numbers of records, based on a sample of the IDs"""
+    start = perf_counter()
+    if partitions <= 1:
+        return [(min_id, max_id)]
+
+    sample_size = max(partitions * PARTITION_SAMPLE_ROWS_PER_PARTITION, PARTITION_SAMPLE_MIN_ROWS)
+    sample_rate = min(1.0, sample_size / record_count)
+    sql = obtain_partition_bounds_sql(config, partitions, sample_rate)
+    quantiles = execute_sql_statement(sql, True, config["verbose"])[0]["bounds"] or []
+    bounds = partition_bounds_from_quantiles(quantiles, min_id, max_id)
+
+    msg = f"Planned {len(bounds):,} partitions from a {sample_rate:.2%} sample, took {perf_counter() - start:.2f}s"
+    logger.info(format_log(msg, action="Extract"))
+    return bounds
+
+
 def count_of_records_to_process(config: dict) -> Tuple[int, int, int]:
     start = perf_counter()
     results = execute_sql_statement(obtain_min_max_count_sql(config), True, config["verbose"])[0]
@@ -74,3 +136,26 @@ def extract_records(task: TaskSpec) -> List[dict]:
     msg = f"{len(records):,} records extracted in {perf_counter() - start:.2f}s"
     logger.info(format_log(msg, name=task.name, action="Extract"))
     return records
+
+
+def extract_records_in_batches(task: TaskSpec) -> Generator[List[dict], None, None]:
+    """
+    Stream the partition's records from a server-side cursor in batches of ``task.stream_batch_size``.
+    Since the consumer processes each batch before the next one is fetched, the logged duration
+    covers the whole extract/transform/load of the partition rather than only the extraction.
+    """
+    start = perf_counter()
+    logger.info(format_log(f"Streaming data from source", name=task.name, action="Extract"))
+    cursor_name = f"es_etl_partition_{task.partition_number}"
+    record_count = 0
+
+    try:
+        for batch in execute_sql_statement_in_batches(task.sql, task.stream_batch_size, cursor_name):
+            record_count += len(batch)
+            yield batch
+    except Exception as e:
+        logger.exception(f"Failed on partition {task.name} with '{task.sql}'")
+        raise e
+
+    msg = f"{record_count:,} records streamed in {perf_counter() - start:.2f}s"
+    logger.info(format_log(msg, name=task.name, action="Extract"))
@@ -2,7 +2,7 @@ import logging
 
 from elasticsearch import Elasticsearch, helpers
 from time import perf_counter
-from typing import List, Tuple
+from typing import Generator, Iterable, List, Tuple
 
 from usaspending_api.etl.elasticsearch_loader_helpers.delete_data import delete_docs_by_unique_key
 from usaspending_api.etl.elasticsearch_loader_helpers.utilities import TaskSpec, format_log
@@ -36,9 +36,34 @@ def load_data(worker: TaskSpec, records: List[dict], client: Elasticsearch) -> T
     return success, failed
 
 
+def load_data_in_batches(worker: TaskSpec, batches: Iterable[List[dict]], client: Elasticsearch) -> Tuple[int, int]:
+    """
+    Index batches of transformed records as they arrive, so that indexing overlaps with extraction and
+    only a single batch needs to be held in memory. For incremental loads the docs in each batch are
+    deleted right before that batch is indexed (see ``streaming_post_to_es`` for why).
+    """
+    start = perf_counter()
+    logger.info(format_log(f"Starting streaming Index operation", name=worker.name, action="Index"))
+    if worker.is_incremental:
+        docs = _delete_batch_then_yield_docs(client, batches, worker.index, worker.name)
+    else:
+        docs = (doc for batch in batches for doc in batch)
+    success, failed = streaming_post_to_es(client, docs, worker.index, worker.name, delete_before_index=False)
+    logger.info(format_log(f"Index operation took {perf_counter() - start:.2f}s", name=worker.name, action="Index"))
+    return success, failed
+
+
+def _delete_batch_then_yield_docs(
+    client: Elasticsearch, batches: Iterable[List[dict]], index_name: str, job_name: str, delete_key: str = "_id"
+) -> Generator[dict, None, None]:
+    for batch in batches:
+        delete_docs_by_unique_key(client, delete_key, [doc[delete_key] for doc in batch], job_name, index_name)
+        yield from batch
+
+
 def streaming_post_to_es(
     client: Elasticsearch,
-    chunk: list,
+    chunk: Iterable[dict],
     index_name: str,
     job_name: str = None,
     delete_before_index: bool = True,
@@ -49,7 +74,8 @@ def streaming_post_to_es(
 
     Args:
         client: Elasticsearch client
-        chunk (List[dict]): list of dictionary objects holding field_name:value data
+        chunk (Iterable[dict]): list (or generator) of dictionary objects holding field_name:value data.
+            A generator is only supported when delete_before_index is False
         index_name (str): name of targetted index
         job_name (str): name of ES ETL job being run, used in logging
         delete_before_index (bool): When true, attempts to delete given documents by a unique key before indexing them.
@@ -1,5 +1,6 @@
 import logging
 
+from decimal import Decimal, ROUND_HALF_UP
 from django.conf import settings
 from time import perf_counter
 from typing import Callable, Dict, List, Optional
@@ -43,7 +44,10 @@ def transform_award_data(worker: TaskSpec, records: List[dict]) -> List[dict]:
         "pop_county_population",
         "pop_congressional_population",
     ]
-    return transform_data(worker, records, converters, agg_key_creations, drop_fields, settings.ES_ROUTING_FIELD)
+    cents_fields = ["total_covid_obligation", "total_covid_outlay", "total_loan_value"]
+    return transform_data(
+        worker, records, converters, agg_key_creations, drop_fields, settings.ES_ROUTING_FIELD, cents_fields
+    )
 
 
 def transform_transaction_data(worker: TaskSpec, records: List[dict]) -> List[dict]:
@@ -81,7 +85,10 @@ def transform_transaction_data(worker: TaskSpec, records: List[dict]) -> List[di
         "awarding_toptier_agency_id",
         "funding_toptier_agency_id",
     ]
-    return transform_data(worker, records, converters, agg_key_creations, drop_fields, settings.ES_ROUTING_FIELD)
+    cents_fields = ["generated_pragmatic_obligation", "face_value_loan_guarantee"]
+    return transform_data(
+        worker, records, converters, agg_key_creations, drop_fields, settings.ES_ROUTING_FIELD, cents_fields
+    )
 
 
 def transform_covid19_faba_data(worker: TaskSpec, records: List[dict]) -> List[dict]:
@@ -112,8 +119,11 @@ def transform_covid19_faba_data(worker: TaskSpec, records: List[dict]) -> List[d
                 "_id": es_id_field,
             }
         results[temp_key]["obligated_sum"] += obligated_sum
+        # Outlays only count for final balances; having the value to sum saves a script per document in aggregations
+        record["final_gross_outlay_amount_by_award_cpe"] = 0
         if record.get("is_final_balances_for_fy"):
             results[temp_key]["outlay_sum"] += outlay_sum
+            record["final_gross_outlay_amount_by_award_cpe"] = outlay_sum
         results[temp_key]["financial_accounts_by_award"].append(record)
 
     if len(results) != len(records):
@@ -132,16 +142,21 @@ def transform_data(
     agg_key_creations: Dict[str, Callable],
     drop_fields: List[str],
     routing_field: Optional[str] = None,
+    cents_fields: Optional[List[str]] = None,
 ) -> List[dict]:
     logger.info(format_log(f"Transforming data", name=worker.name, action="Transform"))
 
     start = perf_counter()
+    cached_agg_key_creations = [(key, funcs.cached_agg_key(func)) for key, func in agg_key_creations.items()]
+    es_id_field = worker.field_for_es_id
 
     for record in records:
         for field, converter in converters.items():
             record[field] = converter(record[field])
-        for key, transform_func in agg_key_creations.items():
+        for key, transform_func in cached_agg_key_creations:
             record[key] = transform_func(record)
+        for field in cents_fields or []:
+            record[f"{field}_cents"] = to_cents(record[field])
 
         # Route all documents with the same recipient to the same shard
         # This allows for accuracy and early-termination of "top N" recipient category aggregation queries
@@ -156,7 +171,7 @@ def transform_data(
         # IF and ONLY IF a routing meta field is not also provided (one whose value differs
         # from the doc _id field). If explicit routing is done, UPSERTs may cause duplicates,
         # so docs must be deleted before UPSERTed. (More info in streaming_post_to_es(...))
-        record["_id"] = record[worker.field_for_es_id]
+        record["_id"] = record[es_id_field]
 
         # Removing data which were used for creating aggregate keys and aren't necessary standalone
         for key in drop_fields:
@@ -165,3 +180,13 @@ def transform_data(
     duration = perf_counter() - start
     logger.info(format_log(f"Transformation operation took {duration:.2f}s", name=worker.name, action="Transform"))
     return records
+
+
+def to_cents(value) -> Optional[int]:
+    """
+    Dollar amounts are also indexed as whole cents (long fields named "<field>_cents") so aggregations can sum them
+    exactly without running a script that scales the scaled_float values for every document
+    """
+    if value is None:
+        return None
+    return int((Decimal(value) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
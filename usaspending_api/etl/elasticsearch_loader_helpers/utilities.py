@@ -29,6 +29,17 @@ class TaskSpec:
     is_incremental: bool
     execute_sql_func: callable = None
     transform_func: callable = None
+    stream_batch_size: Optional[int] = None
+
+
+@dataclass
+class PartitionResult:
+    """Outcome of processing a single ETL task, used for the end-of-run partition report"""
+
+    name: str
+    partition_number: int
+    record_count: int
+    duration: float
 
 
 def chunks(items: List[Any], size: int) -> List[Any]:
@@ -66,6 +77,34 @@ def execute_sql_statement(cmd: str, results: bool = False, verbose: bool = False
     return rows
 
 
+def execute_sql_statement_in_batches(
+    cmd: str, batch_size: int, cursor_name: str, verbose: bool = False
+) -> Generator[List[dict], None, None]:
+    """
+    Execute SQL using a server-side (named) cursor on a single-use psycopg2 connection and yield the
+    results as lists of row dictionaries no larger than ``batch_size``. Only one batch is held in memory
+    at a time, regardless of the size of the full result set.
+    """
+    if verbose:
+        print(cmd)
+
+    connection = psycopg2.connect(dsn=get_database_dsn_string())
+    try:
+        # Named cursors must run inside a transaction, so autocommit is intentionally left off
+        with connection.cursor(name=cursor_name) as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(cmd)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                columns = [col[0] for col in cursor.description]
+                yield [dict(zip(columns, row)) for row in rows]
+        connection.rollback()  # read-only transaction, nothing to commit
+    finally:
+        connection.close()
+
+
 def db_rows_to_dict(cursor: psycopg2.extensions.cursor) -> List[dict]:
     """Return a dictionary of all row results from a database connection cursor"""
     columns = [col[0] for col in cursor.description]
@@ -0,0 +1,83 @@
+import logging
+
+from datetime import datetime
+from django.db import transaction
+from usaspending_api.etl.management import load_base
+from usaspending_api.etl.management.commands import load_submission
+from usaspending_api.etl.submission_loader_helpers.file_a import get_file_a, load_file_a
+from usaspending_api.etl.submission_loader_helpers.file_b import get_file_b, load_file_b
+from usaspending_api.etl.submission_loader_helpers.file_c import get_file_c, load_file_c
+from usaspending_api.etl.submission_loader_helpers.submission_attributes import get_submission_attributes
+from usaspending_api.etl.submission_loader_helpers.treasury_appropriation_account import TAS_ID_TO_ACCOUNT
+
+logger = logging.getLogger("script")
+
+LOAD_METHODS = {False: "INSERT", True: "COPY"}
+
+
+class Command(load_submission.Command):
+    """
+    Loads the File A, B, and C data of a single Broker submission with batched INSERTs and again with COPY (see
+    load_submission --copy-load), each in a transaction that is rolled back, and reports the rows per second of each
+    file.  Only the loads are timed; each file is read from Broker before its load starts.  Nothing is committed, but
+    the submission is loaded into the tables of the configured database, so run it against a scratch copy.
+    """
+
+    help = "Compares rows/sec of loading a Broker submission's File A, B, and C with INSERTs and with COPY"
+
+    def add_arguments(self, parser):
+        parser.add_argument("submission_id", help="Broker submission_id to load", type=int)
+        parser.add_argument(
+            "--file-c-chunk-size",
+            type=int,
+            default=self.file_c_chunk_size,
+            help="Number of File C records processed in a single batch, as in load_submission",
+        )
+        load_base.Command.add_arguments(self, parser)
+
+    def handle_loading(self, db_cursor, *args, **options):
+        self.submission_id = options["submission_id"]
+        self.file_c_chunk_size = options["file_c_chunk_size"]
+        self.db_cursor = db_cursor
+
+        submission_data = self.validate_submission_data(self.get_broker_submission())
+        results = {copy_load: self.time_loads(submission_data, copy_load) for copy_load in LOAD_METHODS}
+
+        self.stdout.write(f"Submission {self.submission_id}")
+        for file in ("A", "B", "C"):
+            row_count = results[False][file][0]
+            rates = {copy_load: self.rate(*results[copy_load][file]) for copy_load in LOAD_METHODS}
+            self.stdout.write(
+                f"File {file}: {row_count:,} rows, {rates[False]:,.0f} rows/sec using INSERT, {rates[True]:,.0f} "
+                f"rows/sec using COPY ({rates[True] / max(rates[False], 1):.1f}x)"
+            )
+
+    def time_loads(self, submission_data, copy_load):
+        """ Row count and load duration of each file, loaded in a transaction that is then rolled back """
+        logger.info(f"Loading submission {self.submission_id} using {LOAD_METHODS[copy_load]}")
+        TAS_ID_TO_ACCOUNT.clear()  # So that both runs look the TAS up
+        results = {}
+        with transaction.atomic():
+            submission_attributes = get_submission_attributes(self.submission_id, dict(submission_data))
+
+            appropriation_data = get_file_a(submission_attributes, self.db_cursor)
+            start_time = datetime.now()
+            load_file_a(submission_attributes, appropriation_data, self.db_cursor, copy_load)
+            results["A"] = len(appropriation_data), datetime.now() - start_time
+
+            prg_act_obj_cls_data = get_file_b(submission_attributes, self.db_cursor)
+            start_time = datetime.now()
+            load_file_b(submission_attributes, prg_act_obj_cls_data, self.db_cursor, copy_load)
+            results["B"] = len(prg_act_obj_cls_data), datetime.now() - start_time
+
+            certified_award_financial = get_file_c(submission_attributes, self.db_cursor, self.file_c_chunk_size)
+            start_time = datetime.now()
+            load_file_c(submission_attributes, self.db_cursor, certified_award_financial, copy_load)
+            results["C"] = certified_award_financial.count, datetime.now() - start_time
+
+            transaction.set_rollback(True)
+        return results
+
+    @staticmethod
+    def rate(row_count, duration):
+        return row_count / max(duration.total_seconds(), 0.001)
@@ -73,6 +73,12 @@ class Command(BaseCommand):
             "is always a safe format. Wrap in quotes if date/time contains spaces.",
             metavar="",
         )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Resume a failed --create-new-index run: load into the same existing --index-name, re-using "
+            "the partitions planned by that run and skipping those recorded as complete in its checkpoint",
+        )
         parser.add_argument(
             "--skip-delete-index",
             action="store_true",
@@ -102,6 +108,66 @@ class Command(BaseCommand):
             default=250000,
             metavar="(default: 250,000)",
         )
+        parser.add_argument(
+            "--adaptive-partitions",
+            action="store_true",
+            help="Plan partitions from a random sample of the primary key so that each holds roughly "
+            "--partition-size records, instead of splitting the ID range into equal widths. Useful when "
+            "the ID space is sparse or skewed",
+        )
+        parser.add_argument(
+            "--stream-extract",
+            action="store_true",
+            help="Stream each partition from a server-side cursor in batches of --stream-batch-size records, "
+            "piping them through the transform and into the bulk indexer. Bounds per-process memory "
+            "regardless of --partition-size. Not supported for --load-type=covid19-faba",
+        )
+        parser.add_argument(
+            "--stream-batch-size",
+            type=int,
+            help="Number of records fetched per server-side cursor round trip when --stream-extract is provided",
+            default=10000,
+            metavar="(default: 10,000)",
+        )
+        parser.add_argument(
+            "--pipeline",
+            action="store_true",
+            help="Run extract, transform and index as separate stages of processes connected by bounded queues "
+            "instead of one process per partition running all three steps. Stage parallelism is set with "
+            "--extract-workers, --transform-workers and --index-workers (--processes is ignored). "
+            "Best combined with --stream-extract",
+        )
+        parser.add_argument(
+            "--extract-workers",
+            type=int,
+            help="Number of processes extracting partitions from the DB when --pipeline is provided",
+            default=2,
+            choices=range(1, 101),
+            metavar="[1-100]",
+        )
+        parser.add_argument(
+            "--transform-workers",
+            type=int,
+            help="Number of processes transforming records when --pipeline is provided",
+            default=2,
+            choices=range(1, 101),
+            metavar="[1-100]",
+        )
+        parser.add_argument(
+            "--index-workers",
+            type=int,
+            help="Number of processes bulk-indexing documents when --pipeline is provided",
+            default=4,
+            choices=range(1, 101),
+            metavar="[1-100]",
+        )
+        parser.add_argument(
+            "--pipeline-queue-size",
+            type=int,
+            help="Max number of record batches waiting between two pipeline stages, which bounds memory usage",
+            default=10,
+            metavar="(default: 10)",
+        )
         parser.add_argument(
             "--drop-db-view",
             action="store_true",
@@ -150,21 +216,39 @@ class Command(BaseCommand):
 
 def parse_cli_args(options: dict, es_client) -> dict:
     passthrough_values = (
+        "adaptive_partitions",
         "create_new_index",
         "drop_db_view",
+        "extract_workers",
         "index_name",
+        "index_workers",
         "load_type",
         "partition_size",
+        "pipeline",
+        "pipeline_queue_size",
         "process_deletes",
         "deletes_only",
         "processes",
+        "resume",
         "skip_counts",
         "skip_delete_index",
+        "transform_workers",
     )
     config = set_config(passthrough_values, options)
+    config["stream_batch_size"] = options["stream_batch_size"] if options["stream_extract"] else None
+
+    if config["stream_batch_size"] and config["data_type"] == "covid19-faba":
+        # The FABA transform groups records across the whole partition, so it can't operate on arbitrary batches
+        raise SystemExit("Fatal error: '--stream-extract' is not supported for '--load-type=covid19-faba'.")
+    if config["stream_batch_size"] is not None and config["stream_batch_size"] < 1:
+        raise SystemExit("Fatal error: '--stream-batch-size' must be a positive integer.")
+    if config["pipeline"] and config["pipeline_queue_size"] < 1:
+        raise SystemExit("Fatal error: '--pipeline-queue-size' must be a positive integer.")
 
     if config["create_new_index"] and not config["index_name"]:
         raise SystemExit("Fatal error: '--create-new-index' requires '--index-name'.")
+    elif config["resume"] and not config["create_new_index"]:
+        raise SystemExit("Fatal error: '--resume' requires '--create-new-index'.")
     elif config["create_new_index"]:
         config["index_name"] = config["index_name"].lower()
         config["starting_date"] = config["initial_datetime"]
@@ -191,7 +275,7 @@ def parse_cli_args(options: dict, es_client) -> dict:
             logger.error(f"Write alias '{config['write_alias']}' is missing")
             raise SystemExit(1)
     else:
-        if config["index_name"] and es_client.indices.exists(config["index_name"]):
+        if config["index_name"] and es_client.indices.exists(config["index_name"]) and not config["resume"]:
             logger.error(f"Data load into existing index. Change index name or run an incremental load")
             raise SystemExit(1)
 
@@ -1,4 +1,5 @@
 import logging
+import queue
 
 from datetime import timedelta
 from django.core.management import call_command
@@ -6,7 +7,10 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.db.models import Max
 from django.utils.crypto import get_random_string
+from multiprocessing import Manager, Process, Queue
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.helpers.date_helper import now, datetime_command_line_argument_type
+from usaspending_api.common.helpers.sql_helpers import close_all_django_db_conns
 from usaspending_api.etl.submission_loader_helpers.final_of_fy import populate_final_of_fy
 from usaspending_api.etl.submission_loader_helpers.submission_ids import get_new_or_updated_submission_ids
 from usaspending_api.submissions import dabs_loader_queue_helpers as dlqh
@@ -23,7 +27,7 @@ class Command(BaseCommand):
     help = (
         "The goal of this management command is coordinate the loading of multiple submissions "
         "simultaneously using the load_submission single submission loader.  To load submissions "
-        "in parallel, kick off multiple runs at the same time.  Runs will be coordinated via the "
+        "in parallel, use --workers or kick off multiple runs at the same time.  Runs will be coordinated via the "
         "dabs_loader_queue table in the database which allows loaders to be run from different "
         "machines in different environments.  Using the database as the queue sidesteps the AWS "
         "SQS 24 hour message lifespan limitation.  There is no hard cap on the number of jobs that "
@@ -38,6 +42,9 @@ class Command(BaseCommand):
     processor_id = None
     heartbeat_timer = None
     file_c_chunk_size = 100000
+    workers = 1
+    copy_load = False
+    progress_queue = None
     do_not_retry = []
 
     def add_arguments(self, parser):
@@ -90,6 +97,24 @@ class Command(BaseCommand):
             ),
         )
 
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=self.workers,
+            help=(
+                "Number of processes that claim and load submissions from the queue at the same time.  "
+                "This is the same as kicking off that many runs at once except that progress is reported "
+                "and final_of_fy is updated once for all of them.  Each worker loads one submission at a "
+                f"time so keep an eye on database load.  Default is {self.workers:,}."
+            ),
+        )
+
+        parser.add_argument(
+            "--copy-load",
+            action="store_true",
+            help="Passed along to load_submission.  Loads File A, B, and C records using COPY instead of INSERTs.",
+        )
+
         parser.epilog = (
             "And to answer your next question, yes this can be run standalone.  The parallelization "
             "code is pretty minimal and should not add significant time to the overall run time of "
@@ -107,17 +132,19 @@ class Command(BaseCommand):
 
         if self.submission_ids:
             self.add_specific_submissions_to_queue()
-            processed_count = self.load_specific_submissions()
+            processed_count = self.run_workers(self.load_specific_submissions)
         else:
             since_datetime = self.start_datetime or self.calculate_load_submissions_since_datetime()
             self.add_submissions_since_datetime_to_queue(since_datetime)
-            processed_count = self.load_incremental_submissions()
+            processed_count = self.run_workers(self.load_incremental_submissions)
 
         ready, in_progress, abandoned, failed, unrecognized = dlqh.get_queue_status()
         failed_unrecognized_and_abandoned_count = len(failed) + len(unrecognized) + len(abandoned)
         in_progress_count = len(in_progress)
 
         self.update_final_of_fy(processed_count, in_progress_count)
+        if processed_count > 0:
+            bump_data_version()
 
         # Only return unstable state if something's in a bad state and we're the last one standing.
         # Should cut down on Slack noise a bit.
@@ -130,6 +157,8 @@ class Command(BaseCommand):
         self.start_datetime = options.get("start_datetime")
         self.report_queue_status_only = options.get("report_queue_status_only")
         self.file_c_chunk_size = options.get("file_c_chunk_size")
+        self.workers = options.get("workers")
+        self.copy_load = options.get("copy_load")
         self.processor_id = f"{now()}/{get_random_string()}"
 
         logger.info(f'processor_id = "{self.processor_id}"')
@@ -190,7 +219,8 @@ class Command(BaseCommand):
             if count == 0:
                 logger.info(f"Submission {submission_id} has already been picked up by another processor.  Skipping.")
             else:
-                self.load_submission(submission_id, force_reload=True)
+                succeeded = self.load_submission(submission_id, force_reload=True)
+                self.report_progress(submission_id, succeeded)
                 processed_count += 1
         return processed_count
 
@@ -211,14 +241,76 @@ class Command(BaseCommand):
     def load_incremental_submissions(self):
         processed_count = 0
         while True:
-            submission_id, force_reload = dlqh.claim_next_available_submission(self.processor_id, self.do_not_retry)
+            submission_id, force_reload = dlqh.claim_next_available_submission(
+                self.processor_id, list(self.do_not_retry)
+            )
             if submission_id is None:
                 logger.info("No more available submissions in the queue.  Exiting.")
                 break
-            self.load_submission(submission_id, force_reload)
+            succeeded = self.load_submission(submission_id, force_reload)
+            self.report_progress(submission_id, succeeded)
             processed_count += 1
         return processed_count
 
+    def run_workers(self, load_submissions):
+        """
+        Runs load_submissions in this process or, if more than one worker was requested, in that many
+        child processes which claim submissions from the same queue.  Workers report each submission they
+        finish back to this process so progress can be logged in one place.  Returns the count of
+        submissions processed by all workers.
+        """
+        if self.workers < 2:
+            return load_submissions()
+
+        # Django would otherwise share this process's database connection with the workers
+        close_all_django_db_conns()
+
+        with Manager() as manager:
+            # Shared so that a submission that fails in one worker isn't retried by another
+            self.do_not_retry = manager.list(self.do_not_retry)
+            self.progress_queue = Queue()
+            processes = [
+                Process(target=self.run_worker, args=(worker_number, load_submissions), name=f"worker-{worker_number}")
+                for worker_number in range(1, self.workers + 1)
+            ]
+            for process in processes:
+                process.start()
+
+            processed_count = failed_count = 0
+            while any(process.is_alive() for process in processes) or not self.progress_queue.empty():
+                try:
+                    submission_id, succeeded = self.progress_queue.get(timeout=1)
+                except queue.Empty:
+                    continue
+                processed_count += 1
+                if not succeeded:
+                    failed_count += 1
+                logger.info(
+                    f"Submission {submission_id} {'loaded' if succeeded else 'FAILED'}.  {processed_count:,} "
+                    f"submissions processed by {self.workers:,} workers so far, {failed_count:,} of which failed."
+                )
+
+            for process in processes:
+                process.join()
+                if process.exitcode != 0:
+                    logger.error(f"Process {process.name} exited with code {process.exitcode}")
+
+            self.do_not_retry = list(self.do_not_retry)
+            self.progress_queue = None
+
+        self.report_queue_status()
+        return processed_count
+
+    def run_worker(self, worker_number, load_submissions):
+        # Each worker claims submissions (and keeps their heartbeats alive) under its own processor id
+        self.processor_id = f"{self.processor_id}/worker-{worker_number}"
+        logger.info(f'Worker {worker_number} processor_id = "{self.processor_id}"')
+        load_submissions()
+
+    def report_progress(self, submission_id, succeeded):
+        if self.progress_queue is not None:
+            self.progress_queue.put((submission_id, succeeded))
+
     def cancel_heartbeat_timer(self):
         if self.heartbeat_timer:
             self.heartbeat_timer.cancel()
@@ -238,6 +330,8 @@ class Command(BaseCommand):
         args = ["--file-c-chunk-size", self.file_c_chunk_size, "--skip-final-of-fy-calculation"]
         if force_reload:
             args.append("--force-reload")
+        if self.copy_load:
+            args.append("--copy-load")
         self.start_heartbeat_timer(submission_id)
         try:
             call_command("load_submission", submission_id, *args)
@@ -246,11 +340,13 @@ class Command(BaseCommand):
             logger.exception(f"Submission {submission_id} failed to load")
             dlqh.fail_processing(submission_id, self.processor_id, e)
             self.do_not_retry.append(submission_id)
-            self.report_queue_status()
+            if self.progress_queue is None:
+                self.report_queue_status()
             return False
         self.cancel_heartbeat_timer()
         dlqh.complete_processing(submission_id, self.processor_id)
-        self.report_queue_status()
+        if self.progress_queue is None:
+            self.report_queue_status()
         return True
 
     @staticmethod
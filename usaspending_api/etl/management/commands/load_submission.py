@@ -4,6 +4,7 @@ import signal
 from datetime import datetime
 from django.core.management.base import CommandError
 from django.db import transaction
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management import load_base
 from usaspending_api.etl.submission_loader_helpers.file_a import get_file_a, load_file_a
@@ -30,6 +31,7 @@ class Command(load_base.Command):
     file_c_chunk_size = 100000
     force_reload = False
     skip_final_of_fy_calculation = False
+    copy_load = False
     db_cursor = None
 
     help = (
@@ -64,6 +66,14 @@ class Command(load_base.Command):
                 "bigger should be faster... right up until you run out of memory.  Balance carefully."
             ),
         )
+        parser.add_argument(
+            "--copy-load",
+            action="store_true",
+            help=(
+                "Streams File A, B, and C records into their tables using COPY instead of batched INSERTs.  "
+                "Much faster for large submissions.  The rows loaded are the same either way."
+            ),
+        )
         super(Command, self).add_arguments(parser)
 
     def handle_loading(self, db_cursor, *args, **options):
@@ -72,6 +82,7 @@ class Command(load_base.Command):
         self.force_reload = options["force_reload"]
         self.file_c_chunk_size = options["file_c_chunk_size"]
         self.skip_final_of_fy_calculation = options["skip_final_of_fy_calculation"]
+        self.copy_load = options["copy_load"]
         self.db_cursor = db_cursor
 
         logger.info(f"Starting processing for submission {self.submission_id}...")
@@ -86,6 +97,10 @@ class Command(load_base.Command):
 
         self.load_in_transaction()
 
+        # When run by load_multiple_submissions the data version is bumped once all submissions are loaded
+        if not self.skip_final_of_fy_calculation:
+            bump_data_version()
+
     @transaction.atomic
     def load_in_transaction(self):
         def signal_handler(signal, frame):
@@ -115,8 +130,8 @@ class Command(load_base.Command):
         )
         logger.info("Loading File A data")
         start_time = datetime.now()
-        load_file_a(submission_attributes, appropriation_data, self.db_cursor)
-        logger.info(f"Finished loading File A data, took {datetime.now() - start_time}")
+        load_file_a(submission_attributes, appropriation_data, self.db_cursor, self.copy_load)
+        self.log_load_rate("A", len(appropriation_data), start_time)
 
         logger.info("Getting File B data")
         prg_act_obj_cls_data = get_file_b(submission_attributes, self.db_cursor)
@@ -126,8 +141,8 @@ class Command(load_base.Command):
         )
         logger.info("Loading File B data")
         start_time = datetime.now()
-        load_file_b(submission_attributes, prg_act_obj_cls_data, self.db_cursor)
-        logger.info(f"Finished loading File B data, took {datetime.now() - start_time}")
+        load_file_b(submission_attributes, prg_act_obj_cls_data, self.db_cursor, self.copy_load)
+        self.log_load_rate("B", len(prg_act_obj_cls_data), start_time)
 
         logger.info("Getting File C data")
         certified_award_financial = get_file_c(submission_attributes, self.db_cursor, self.file_c_chunk_size)
@@ -137,8 +152,8 @@ class Command(load_base.Command):
         )
         logger.info("Loading File C data")
         start_time = datetime.now()
-        load_file_c(submission_attributes, self.db_cursor, certified_award_financial)
-        logger.info(f"Finished loading File C data, took {datetime.now() - start_time}")
+        load_file_c(submission_attributes, self.db_cursor, certified_award_financial, self.copy_load)
+        self.log_load_rate("C", certified_award_financial.count, start_time)
 
         if self.skip_final_of_fy_calculation:
             logger.info("Skipping final_of_fy calculation as requested.")
@@ -154,6 +169,15 @@ class Command(load_base.Command):
 
         logger.info("Committing transaction...")
 
+    def log_load_rate(self, file, row_count, start_time):
+        """ Includes rows per second so the COPY and INSERT loads can be compared from the logs. """
+        duration = datetime.now() - start_time
+        rate = row_count / max(duration.total_seconds(), 0.001)
+        logger.info(
+            f"Finished loading File {file} data, took {duration} ({row_count:,} rows, {rate:,.0f} rows/sec using "
+            f"{'COPY' if self.copy_load else 'INSERT'})"
+        )
+
     def get_broker_submission(self):
         self.db_cursor.execute(
             f"""
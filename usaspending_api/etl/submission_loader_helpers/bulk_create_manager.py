@@ -1,3 +1,9 @@
+from io import StringIO
+
+from django.db import connections, router
+from usaspending_api.etl.transaction_loaders.data_load_helpers import format_value_for_copy
+
+
 class BulkCreateManager:
     """ Hide the ugliness of batching saves. """
 
@@ -22,3 +28,40 @@ class BulkCreateManager:
             self.model.objects.bulk_create(self.instances, self.count)
             self.instances = []
             self.count = 0
+
+
+class CopyBulkCreateManager(BulkCreateManager):
+    """
+    Same interface as BulkCreateManager, but streams the instances into the model's table with COPY FROM
+    STDIN instead of multi-row INSERTs.  Field values are prepared the way bulk_create prepares them
+    (auto_now dates included) so the two produce the same rows.  Primary keys are left to the database
+    and are not set on the instances.
+    """
+
+    batch_size = 50000
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.connection = connections[router.db_for_write(model)]
+        self.fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+        self.rows = StringIO()
+
+    def append(self, instance):
+        values = (f.get_db_prep_save(f.pre_save(instance, True), self.connection) for f in self.fields)
+        self.rows.write("\t".join(format_value_for_copy(value) for value in values) + "\n")
+        self.count += 1
+        if self.count >= self.batch_size:
+            self._bulk_create()
+
+    def _bulk_create(self):
+        if self.count > 0:
+            columns = ", ".join(self.connection.ops.quote_name(f.column) for f in self.fields)
+            self.rows.seek(0)
+            with self.connection.cursor() as cursor:
+                cursor.copy_expert(f"copy {self.model._meta.db_table} ({columns}) from stdin", self.rows)
+            self.rows = StringIO()
+            self.count = 0
+
+
+def get_bulk_create_manager(model, copy_load=False):
+    return CopyBulkCreateManager(model) if copy_load else BulkCreateManager(model)
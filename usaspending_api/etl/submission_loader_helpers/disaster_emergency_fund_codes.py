@@ -1,22 +1,15 @@
 from typing import Optional
 
 from usaspending_api.references.models import DisasterEmergencyFundCode
-
-
-DISASTER_EMERGENCY_FUND_CODES = None
+from usaspending_api.references.reference_data_cache import disaster_emergency_fund_code
 
 
 def get_disaster_emergency_fund(row: dict) -> Optional[dict]:
-    """Encapsulate fetching DEFC to utilize a 'poor man's caching' pattern"""
-    global DISASTER_EMERGENCY_FUND_CODES
-    if not DISASTER_EMERGENCY_FUND_CODES:  # testing for falsy values instead of just null
-        DISASTER_EMERGENCY_FUND_CODES = {defc.code: defc for defc in DisasterEmergencyFundCode.objects.all()}
-    disaster_emergency_fund_code = row["disaster_emergency_fund_code"]
-    if not disaster_emergency_fund_code:
+    """Look up the DEFC for a row in the process-wide reference data cache"""
+    code = row["disaster_emergency_fund_code"]
+    if not code:
         return None
     try:
-        return DISASTER_EMERGENCY_FUND_CODES[disaster_emergency_fund_code]
+        return disaster_emergency_fund_code.get()[code]
     except KeyError:
-        raise DisasterEmergencyFundCode.DoesNotExist(
-            f"Unable to find disaster emergency fund code for '{disaster_emergency_fund_code}'."
-        )
+        raise DisasterEmergencyFundCode.DoesNotExist(f"Unable to find disaster emergency fund code for '{code}'.")
@@ -5,7 +5,7 @@ from usaspending_api.accounts.models import AppropriationAccountBalances
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.submission_loader_helpers.skipped_tas import update_skipped_tas
 from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import get_bulk_create_manager
 from usaspending_api.etl.submission_loader_helpers.treasury_appropriation_account import (
     bulk_treasury_appropriation_account_tas_lookup,
     get_treasury_appropriation_account_tas_lookup,
@@ -22,8 +22,11 @@ def get_file_a(submission_attributes, db_cursor):
     return dictfetchall(db_cursor)
 
 
-def load_file_a(submission_attributes, appropriation_data, db_cursor):
-    """ Process and load file A broker data (aka TAS balances, aka appropriation account balances). """
+def load_file_a(submission_attributes, appropriation_data, db_cursor, copy_load=False):
+    """
+    Process and load file A broker data (aka TAS balances, aka appropriation account balances).  copy_load streams
+    the rows into the table with COPY rather than batched INSERTs.
+    """
     reverse = re.compile("gross_outlay_amount_by_tas_cpe")
 
     # dictionary to capture TAS that were skipped and some metadata
@@ -35,7 +38,7 @@ def load_file_a(submission_attributes, appropriation_data, db_cursor):
     bulk_treasury_appropriation_account_tas_lookup(appropriation_data, db_cursor)
 
     # Create account objects
-    save_manager = BulkCreateManager(AppropriationAccountBalances)
+    save_manager = get_bulk_create_manager(AppropriationAccountBalances, copy_load)
     for row in appropriation_data:
 
         # Check and see if there is an entry for this TAS
@@ -5,7 +5,7 @@ from usaspending_api.accounts.models import AppropriationAccountBalances
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.submission_loader_helpers.skipped_tas import update_skipped_tas
 from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import get_bulk_create_manager
 from usaspending_api.etl.submission_loader_helpers.disaster_emergency_fund_codes import get_disaster_emergency_fund
 from usaspending_api.etl.submission_loader_helpers.object_class import get_object_class
 from usaspending_api.etl.submission_loader_helpers.program_activities import get_program_activity
@@ -152,8 +152,11 @@ def get_file_b(submission_attributes, db_cursor):
     return data
 
 
-def load_file_b(submission_attributes, prg_act_obj_cls_data, db_cursor):
-    """ Process and load file B broker data (aka TAS balances by program activity and object class). """
+def load_file_b(submission_attributes, prg_act_obj_cls_data, db_cursor, copy_load=False):
+    """
+    Process and load file B broker data (aka TAS balances by program activity and object class).  copy_load
+    streams the rows into the table with COPY rather than batched INSERTs.
+    """
     reverse = re.compile(r"(_(cpe|fyb)$)|^transaction_obligated_amount$")
 
     # dictionary to capture TAS that were skipped and some metadata
@@ -164,7 +167,15 @@ def load_file_b(submission_attributes, prg_act_obj_cls_data, db_cursor):
 
     bulk_treasury_appropriation_account_tas_lookup(prg_act_obj_cls_data, db_cursor)
 
-    save_manager = BulkCreateManager(FinancialAccountsByProgramActivityObjectClass)
+    # File A has already been loaded so grab all of the submission's account balances at once
+    account_balances_by_tas = {}
+    submission_account_balances = AppropriationAccountBalances.objects.filter(
+        submission_id=submission_attributes.submission_id
+    )
+    for account_balances in submission_account_balances:
+        account_balances_by_tas.setdefault(account_balances.treasury_account_identifier_id, []).append(account_balances)
+
+    save_manager = get_bulk_create_manager(FinancialAccountsByProgramActivityObjectClass, copy_load)
     for row in prg_act_obj_cls_data:
         # Check and see if there is an entry for this TAS
         treasury_account, tas_rendering_label = get_treasury_appropriation_account_tas_lookup(row.get("tas_id"))
@@ -173,9 +184,14 @@ def load_file_b(submission_attributes, prg_act_obj_cls_data, db_cursor):
             continue
 
         # get the corresponding account balances row (aka "File A" record)
-        account_balances = AppropriationAccountBalances.objects.get(
-            treasury_account_identifier=treasury_account, submission_id=submission_attributes.submission_id
-        )
+        account_balances = account_balances_by_tas.get(treasury_account.treasury_account_identifier, [])
+        if len(account_balances) == 1:
+            account_balances = account_balances[0]
+        else:
+            # Raises the appropriate DoesNotExist or MultipleObjectsReturned
+            account_balances = AppropriationAccountBalances.objects.get(
+                treasury_account_identifier=treasury_account, submission_id=submission_attributes.submission_id
+            )
 
         financial_by_prg_act_obj_cls = FinancialAccountsByProgramActivityObjectClass()
 
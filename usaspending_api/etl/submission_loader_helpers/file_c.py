@@ -13,7 +13,7 @@ from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.submission_loader_helpers.skipped_tas import update_skipped_tas
 from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import get_bulk_create_manager
 from usaspending_api.etl.submission_loader_helpers.disaster_emergency_fund_codes import get_disaster_emergency_fund
 from usaspending_api.etl.submission_loader_helpers.object_class import get_object_class_row
 from usaspending_api.etl.submission_loader_helpers.program_activities import get_program_activity
@@ -117,9 +117,10 @@ def get_file_c(submission_attributes, db_cursor, chunk_size):
     return CertifiedAwardFinancial(submission_attributes, db_cursor, chunk_size)
 
 
-def load_file_c(submission_attributes, db_cursor, certified_award_financial):
+def load_file_c(submission_attributes, db_cursor, certified_award_financial, copy_load=False):
     """
-    Process and load file C broker data.
+    Process and load file C broker data.  copy_load streams the rows into the table with COPY rather than batched
+    INSERTs.
     Note: this should run AFTER the D1 and D2 files are loaded because we try to join to those records to retrieve some
     additional information about the awarding sub-tier agency.
     """
@@ -142,7 +143,9 @@ def load_file_c(submission_attributes, db_cursor, certified_award_financial):
 
     bulk_treasury_appropriation_account_tas_lookup(certified_award_financial.tas_ids, db_cursor)
 
-    _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse)
+    _save_file_c_rows(
+        certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse, copy_load
+    )
 
     update_c_to_d_linkages("contract", False, submission_attributes.submission_id)
     update_c_to_d_linkages("assistance", False, submission_attributes.submission_id)
@@ -157,8 +160,10 @@ def load_file_c(submission_attributes, db_cursor, certified_award_financial):
     logger.info(f"Skipped a total of {total_tas_skipped:,} TAS rows for File C")
 
 
-def _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse):
-    save_manager = BulkCreateManager(FinancialAccountsByAwards)
+def _save_file_c_rows(
+    certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse, copy_load=False
+):
+    save_manager = get_bulk_create_manager(FinancialAccountsByAwards, copy_load)
     for index, row in enumerate(certified_award_financial, 1):
         if not (index % 1000):
             logger.info(f"C File Load: Loading row {index:,} of {total_rows:,} ({datetime.now() - start_time})")
@@ -453,4 +453,13 @@ class TestWithMultipleDatabases(TransactionTestCase):
         # Confirm that submission 3 only received a certified_date change, not a reload.
         assert SubmissionAttributes.objects.get(submission_id=3).create_date == create_date_sub_3
 
+        # Nuke a couple of submissions and reload them using multiple workers.
+        SubmissionAttributes.objects.filter(submission_id__in=[1, 2]).delete()
+        assert SubmissionAttributes.objects.count() == 3
+        call_command("load_multiple_submissions", "--incremental", "--workers", 2)
+        assert SubmissionAttributes.objects.count() == 5
+        assert AppropriationAccountBalances.objects.count() == 5
+        assert FinancialAccountsByProgramActivityObjectClass.objects.count() == 7
+        assert FinancialAccountsByAwards.objects.count() == 11
+
         # Ok.  That's probably good enough for now.  Thanks for bearing with me.
@@ -258,6 +258,24 @@ class TestWithMultipleDatabases(TestCase):
 
         assert FinancialAccountsByAwards.objects.all().count() == 6
 
+    def test_load_submission_copy_load_matches_insert_load(self):
+        """ Loading File C with COPY should produce the same rows as batched INSERTs """
+
+        def _loaded_rows():
+            excluded = ("financial_accounts_by_awards_id", "create_date", "update_date")
+            fields = [f.attname for f in FinancialAccountsByAwards._meta.concrete_fields if f.attname not in excluded]
+            return sorted(FinancialAccountsByAwards.objects.values_list(*fields), key=str)
+
+        call_command("load_submission", "-9999")
+        insert_rows = _loaded_rows()
+
+        call_command("load_submission", "-9999", "--force-reload", "--copy-load")
+        copy_rows = _loaded_rows()
+
+        assert len(copy_rows) == 6
+        assert copy_rows == insert_rows
+        assert FinancialAccountsByAwards.objects.filter(create_date__isnull=True).count() == 0
+
 
 def _assemble_broker_tas_lookup_records() -> list:
     base_record = {
@@ -0,0 +1,108 @@
+import json
+import pytest
+
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
+from usaspending_api.etl.elasticsearch_loader_helpers import aggregate_key_functions as funcs
+
+
+def _record(**overrides):
+    record = {
+        "recipient_name": "ACME",
+        "recipient_unique_id": "123456789",
+        "recipient_hash": "f1a2b3c4-0000-0000-0000-000000000000",
+        "recipient_levels": ["P", "C"],
+        "awarding_toptier_agency_name": "Department of Transportation",
+        "awarding_toptier_agency_abbreviation": "DOT",
+        "awarding_toptier_agency_code": "069",
+        "awarding_toptier_agency_id": 1,
+        "awarding_subtier_agency_name": None,
+        "naics_code": "331122",
+        "naics_description": "Steel",
+        "pop_country_code": "USA",
+        "pop_country_name": "UNITED STATES",
+        "pop_state_code": "VA",
+        "pop_state_fips": "51",
+        "pop_state_name": "Virginia",
+        "pop_state_population": 8000000,
+        "pop_county_code": "059",
+        "pop_county_name": "Fairfax",
+        "pop_county_population": 1000000,
+        "pop_congressional_code": "11",
+        "pop_congressional_population": 750000,
+    }
+    record.update(overrides)
+    return record
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        funcs.award_recipient_agg_key,
+        funcs.transaction_recipient_agg_key,
+        funcs.awarding_toptier_agency_agg_key,
+        funcs.awarding_subtier_agency_agg_key,
+        funcs.naics_agg_key,
+        funcs.pop_country_agg_key,
+        funcs.pop_state_agg_key,
+        funcs.pop_county_agg_key,
+        funcs.pop_congressional_agg_key,
+    ],
+)
+def test_cached_agg_key_matches_original(func):
+    cached_func = funcs.cached_agg_key(func)
+    records = [
+        _record(),
+        _record(),  # cache hit
+        _record(recipient_levels=None, pop_state_code=None),
+        _record(recipient_levels=["R"], naics_code=None, awarding_subtier_agency_name="FAA"),
+    ]
+    del records[1]["awarding_toptier_agency_abbreviation"]  # optional agency fields may be absent
+
+    for record in records:
+        assert cached_func(record) == func(record)
+
+
+def test_only_low_cardinality_agg_keys_are_cached():
+    assert funcs.cached_agg_key(funcs.award_recipient_agg_key) is funcs.award_recipient_agg_key
+    assert funcs.cached_agg_key(funcs.transaction_recipient_agg_key) is funcs.transaction_recipient_agg_key
+    assert set(funcs.AGG_KEY_CACHE_SIZES) == set(funcs.AGG_KEY_INPUT_FIELDS)
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        funcs.award_recipient_agg_key,
+        funcs.transaction_recipient_agg_key,
+        funcs.awarding_toptier_agency_agg_key,
+        funcs.naics_agg_key,
+        funcs.pop_country_agg_key,
+        funcs.pop_state_agg_key,
+        funcs.pop_county_agg_key,
+        funcs.pop_congressional_agg_key,
+    ],
+)
+def test_compact_agg_key_decodes_to_json_values(func, settings):
+    records = [
+        _record(),
+        _record(recipient_levels=None, pop_county_population=None, naics_description=None),
+        _record(recipient_name="", awarding_toptier_agency_id=None, pop_country_name=""),
+        # Values the compact format can't hold as is are written as JSON within the key
+        _record(recipient_name="A\x1fB", recipient_levels=[], naics_code=331122, pop_state_population=1.5),
+    ]
+    del records[1]["awarding_toptier_agency_abbreviation"]  # optional agency fields may be absent
+
+    for record in records:
+        settings.ES_COMPACT_AGG_KEYS = False
+        json_key = func(record)
+        settings.ES_COMPACT_AGG_KEYS = True
+        compact_key = func(record)
+
+        assert decode_agg_key(compact_key) == decode_agg_key(json_key) == json.loads(json_key)
+        assert len(compact_key) < len(json_key)
+
+
+def test_compact_agg_keys_sort_on_first_value(settings):
+    settings.ES_COMPACT_AGG_KEYS = True
+    names = ["A\x1fB", None, "", "ACME", "ACME CORP", "ACME!", "ACME\u00c9", "ZETA"]
+    keys = [funcs.award_recipient_agg_key(_record(recipient_name=name)) for name in reversed(names)]
+    assert [decode_agg_key(key)["name"] for key in sorted(keys)] == names
@@ -3,6 +3,7 @@ from django.conf import settings
 
 from collections import OrderedDict
 from datetime import datetime, timezone
+from decimal import Decimal
 from model_mommy import mommy
 from pathlib import Path
 from usaspending_api.common.elasticsearch.client import instantiate_elasticsearch_client
@@ -15,10 +16,18 @@ from usaspending_api.etl.elasticsearch_loader_helpers import (
     transform_award_data,
     transform_transaction_data,
 )
+from usaspending_api.etl.elasticsearch_loader_helpers.checkpoint import PartitionCheckpoint
+from usaspending_api.etl.elasticsearch_loader_helpers import controller
+from usaspending_api.etl.elasticsearch_loader_helpers.controller import PipelineTracker
 from usaspending_api.etl.elasticsearch_loader_helpers.delete_data import (
     _check_awards_for_deletes,
     _lookup_deleted_award_ids,
+    _run_delete_by_query,
 )
+from usaspending_api.etl.elasticsearch_loader_helpers.extract_data import partition_bounds_from_quantiles
+from usaspending_api.etl.elasticsearch_loader_helpers.load_data import load_data_in_batches
+from usaspending_api.etl.elasticsearch_loader_helpers.transform_data import to_cents, transform_data
+from usaspending_api.etl.elasticsearch_loader_helpers.utilities import TaskSpec
 
 
 @pytest.fixture
@@ -198,3 +207,191 @@ def test_get_award_ids(award_data_fixture, elasticsearch_award_index):
     client = elasticsearch_award_index.client
     ids = _lookup_deleted_award_ids(client, id_list, award_config, index=elasticsearch_award_index.index_name)
     assert ids == ["CONT_AWD_IND12PB00323"]
+
+
+def test_load_data_in_batches_deletes_each_batch_before_indexing(monkeypatch):
+    events = []
+
+    def mock_delete(client, key, value_list, task_id, index):
+        events.append(("delete", value_list))
+
+    def mock_post(client, chunk, index_name, job_name=None, delete_before_index=True, delete_key="_id"):
+        assert delete_before_index is False
+        for doc in chunk:
+            events.append(("index", doc["_id"]))
+        return len(events), 0
+
+    monkeypatch.setattr(
+        "usaspending_api.etl.elasticsearch_loader_helpers.load_data.delete_docs_by_unique_key", mock_delete
+    )
+    monkeypatch.setattr("usaspending_api.etl.elasticsearch_loader_helpers.load_data.streaming_post_to_es", mock_post)
+    worker = TaskSpec(
+        name="test worker",
+        index="test-index",
+        sql=None,
+        view=None,
+        base_table=None,
+        base_table_id=None,
+        field_for_es_id="transaction_id",
+        primary_key="transaction_id",
+        partition_number=0,
+        is_incremental=True,
+        stream_batch_size=2,
+    )
+    batches = iter([[{"_id": 1}, {"_id": 2}], [{"_id": 3}]])
+
+    load_data_in_batches(worker, batches, None)
+
+    assert events == [("delete", [1, 2]), ("index", 1), ("index", 2), ("delete", [3]), ("index", 3)]
+
+
+def test_partition_bounds_from_quantiles():
+    assert partition_bounds_from_quantiles([10, 10, 50, None, 100], 1, 100) == [(1, 10), (11, 50), (51, 100)]
+    assert partition_bounds_from_quantiles([], 5, 5) == [(5, 5)]
+    assert partition_bounds_from_quantiles([1, 2, 3], 1, 4) == [(1, 1), (2, 2), (3, 3), (4, 4)]
+
+
+def test_pipeline_tracker_completes_partition_after_all_batches_indexed():
+    tracker = PipelineTracker()
+    tracker.record(("indexed", "worker a", 0, 5, 0))
+    tracker.record(("extracted", "worker a", 0, 2, 0.0))
+    assert tracker.completed == []
+    tracker.record(("extracted", "worker b", 1, 0, 0.0))
+    tracker.record(("indexed", "worker a", 0, 3, 1))
+
+    assert [(r.partition_number, r.record_count) for r in tracker.completed] == [(1, 0), (0, 9)]
+    assert (tracker.success, tracker.fail) == (8, 1)
+
+
+def _pipeline_test_task(partition_number, transform_func):
+    return TaskSpec(
+        name=f"task {partition_number}",
+        index="test-index",
+        sql="",
+        view="",
+        base_table="",
+        base_table_id="",
+        field_for_es_id="id",
+        primary_key="id",
+        partition_number=partition_number,
+        is_incremental=False,
+        transform_func=transform_func,
+        stream_batch_size=2,
+    )
+
+
+def _extract_pipeline_test_batches(task):
+    records = [{"id": i} for i in range(task.partition_number * 3)]  # 3 records for each partition number
+    for i in range(0, len(records), task.stream_batch_size):
+        yield records[i : i + task.stream_batch_size]
+
+
+def _transform_pipeline_test_records(task, records):
+    return [{**record, "transformed": True} for record in records]
+
+
+def _fail_pipeline_test_transform(task, records):
+    raise ValueError("bad record")
+
+
+def _load_pipeline_test_records(task, records, client):
+    assert all(record["transformed"] for record in records)
+    return len(records), 0
+
+
+def _run_pipeline(monkeypatch, tasks):
+    monkeypatch.setattr(controller, "extract_records_in_batches", _extract_pipeline_test_batches)
+    monkeypatch.setattr(controller, "load_data", _load_pipeline_test_records)
+    monkeypatch.setattr(controller, "instantiate_elasticsearch_client", lambda: None)
+    config = {
+        "index_name": "test-index",
+        "create_new_index": False,
+        "pipeline_queue_size": 2,
+        "extract_workers": 2,
+        "transform_workers": 2,
+        "index_workers": 2,
+    }
+    pipeline = controller.Controller(config)
+    pipeline.tasks = tasks
+    pipeline.partition_bounds = [(task.partition_number * 10 + 1, task.partition_number * 10 + 10) for task in tasks]
+    results = []
+    monkeypatch.setattr(pipeline, "checkpoint_partition", lambda result: result and results.append(result))
+    pipeline.dispatch_pipelined_tasks()
+    return sorted(results, key=lambda result: result.partition_number)
+
+
+def test_dispatch_pipelined_tasks(monkeypatch):
+    indexed_before = controller.total_doc_success.value
+    tasks = [_pipeline_test_task(partition_number, _transform_pipeline_test_records) for partition_number in range(5)]
+
+    results = _run_pipeline(monkeypatch, tasks)
+
+    assert [(result.partition_number, result.record_count) for result in results] == [(i, i * 3) for i in range(5)]
+    assert controller.total_doc_success.value - indexed_before == 30
+
+
+def test_dispatch_pipelined_tasks_aborts_on_error(monkeypatch):
+    tasks = [_pipeline_test_task(partition_number, _transform_pipeline_test_records) for partition_number in range(5)]
+    tasks[2] = _pipeline_test_task(2, _fail_pipeline_test_transform)
+
+    # Every process still shuts down, and partitions that weren't completed are reported as a failure
+    with pytest.raises(RuntimeError, match="One or more partitions failed"):
+        _run_pipeline(monkeypatch, tasks)
+
+
+def test_partition_checkpoint_round_trip(tmp_path):
+    checkpoint = PartitionCheckpoint("test-index", directory=str(tmp_path))
+    assert not checkpoint.exists()
+    checkpoint.partition_bounds = [(1, 10), (11, 20)]
+    checkpoint.save()
+    checkpoint.mark_complete(PartitionCheckpoint.partition_key(11, 20))
+    checkpoint.mark_complete(PartitionCheckpoint.partition_key(None, None, is_null_partition=True))
+
+    resumed = PartitionCheckpoint("test-index", directory=str(tmp_path))
+    resumed.load()
+    assert resumed.partition_bounds == [(1, 10), (11, 20)]
+    assert resumed.completed == {"11-20", "NULL"}
+
+    resumed.delete()
+    assert not resumed.exists()
+
+
+def test_transform_data_adds_cents_fields():
+    worker = TaskSpec(
+        name="worker",
+        index="test-index",
+        sql="",
+        view="",
+        base_table="",
+        base_table_id="",
+        field_for_es_id="id",
+        primary_key="id",
+        partition_number=0,
+        is_incremental=False,
+    )
+    records = [
+        {"id": 1, "obligation": Decimal("1234.56")},
+        {"id": 2, "obligation": -0.29},
+        {"id": 3, "obligation": None},
+    ]
+    records = transform_data(worker, records, {}, {}, [], cents_fields=["obligation"])
+    assert [record["obligation_cents"] for record in records] == [123456, -29, None]
+    assert to_cents(Decimal("0.005")) == 1
+
+
+def test_run_delete_by_query_retries_version_conflicts():
+    responses = iter(
+        [
+            {"deleted": 5, "version_conflicts": 2, "failures": []},
+            {"deleted": 2, "version_conflicts": 0, "failures": []},
+        ]
+    )
+    assert _run_delete_by_query(lambda: next(responses)) == 7
+
+    conflicted = {"deleted": 0, "version_conflicts": 1, "failures": []}
+    with pytest.raises(RuntimeError, match="version conflicts after 3 retries"):
+        _run_delete_by_query(lambda: conflicted)
+
+    failed = {"deleted": 1, "version_conflicts": 0, "failures": [{"cause": {"type": "es_rejected_execution"}}]}
+    with pytest.raises(RuntimeError, match="failed after deleting 1 documents"):
+        _run_delete_by_query(lambda: failed)
@@ -0,0 +1,106 @@
+"""
+Benchmark of the FPDS transaction loader's row by row mode against its batch mode (load_fpds_transactions
+--batch-load).  Each mode loads the same generated chunk of FPDS records twice: the first time every transaction and
+award is new, the second time every transaction is updated.  Only the load step is timed; the records are transformed
+into load objects beforehand, the same way for both modes.
+
+Everything is loaded in a transaction that is rolled back, but the benchmark still writes to the tables of the
+configured database, so run it against a scratch copy.  Run it from the root of the repo with the same environment
+as the loader:
+
+    python -m usaspending_api.etl.transaction_loaders.benchmark_fpds_loader --rows 15000
+"""
+import argparse
+import django
+import os
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+AWARD_KEY_TEMPLATE = "CONT_AWD_BENCHMARK{}_9700_-NONE-_-NONE-"
+
+
+def generate_broker_rows(row_count, transactions_per_award):
+    """Source procurement records shaped like those of the loader's integration test, a few per award"""
+    from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
+        transaction_fpds_boolean_columns,
+        transaction_fpds_nonboolean_columns,
+        transaction_normalized_nonboolean_columns,
+    )
+
+    action_date = datetime(2019, 10, 1)
+    rows = []
+    for row_number in range(row_count):
+        row = {**transaction_fpds_nonboolean_columns, **transaction_normalized_nonboolean_columns}
+        row.update({column: str(row_number % 2 == 0) for column in transaction_fpds_boolean_columns})
+        row.update(
+            {
+                # Negative ids and a BENCHMARK award key so the rows can't match records already in the database
+                "detached_award_procurement_id": -row_number - 1,
+                "detached_award_proc_unique": f"BENCHMARK_{row_number}",
+                "unique_award_key": AWARD_KEY_TEMPLATE.format(row_number // transactions_per_award),
+                "action_date": action_date + timedelta(days=row_number % 365),
+                "ordering_period_end_date": "2020-09-30 00:00:00",
+                "initial_report_date": "2019-10-01 00:00:00",
+                "solicitation_date": "2019-10-01 00:00:00",
+                "period_of_performance_star": "2019-10-01 00:00:00",
+                "period_of_performance_curr": "2020-09-30 00:00:00",
+                "created_at": action_date,
+                "updated_at": action_date,
+                "last_modified": action_date,
+                "federal_action_obligation": 1000 + row_number,
+                "base_exercised_options_val": 10203,
+                "base_and_all_options_value": 30201,
+                "high_comp_officer1_amount": 1000000,
+                "high_comp_officer2_amount": 2000000,
+                "high_comp_officer3_amount": 3000000,
+                "high_comp_officer4_amount": 4000000,
+                "high_comp_officer5_amount": 5000000,
+            }
+        )
+        rows.append(row)
+    return rows
+
+
+def time_load(load, broker_rows):
+    """Seconds the load function takes to load the rows; the load objects are built beforehand, outside the timing"""
+    from usaspending_api.etl.transaction_loaders import fpds_loader
+
+    load_objects = fpds_loader._transform_objects(broker_rows)
+    start = perf_counter()
+    award_ids = load(load_objects)
+    seconds = perf_counter() - start
+    if fpds_loader.failed_ids:
+        raise RuntimeError(f"{len(fpds_loader.failed_ids):,} records failed to load")
+    return seconds, len(award_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=15000, help="Size of the chunk, the loader's CHUNK_SIZE by default")
+    parser.add_argument("--transactions-per-award", type=int, default=4)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "usaspending_api.settings")
+    django.setup()
+    from django.db import transaction
+    from usaspending_api.etl.transaction_loaders import fpds_loader
+
+    broker_rows = generate_broker_rows(args.rows, args.transactions_per_award)
+    print(f"{args.rows:,} FPDS records, {args.transactions_per_award} per award")
+    for name, load in (
+        ("row by row", fpds_loader._load_transactions),
+        ("batch", fpds_loader._load_transactions_in_batch),
+    ):
+        with transaction.atomic():
+            for load_type in ("insert", "update"):
+                seconds, award_count = time_load(load, broker_rows)
+                print(
+                    f"{name} {load_type}: {seconds:.1f}s, {args.rows / seconds:,.0f} rows/s, "
+                    f"{award_count:,} awards touched"
+                )
+            transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,10 @@
 import psycopg2
 from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
+from usaspending_api.references.reference_data_cache import reference_data
 
 
-SUBTIER_AGENCY_LIST_CACHE = {}
-
-
+@reference_data("subtier_agency_list", version_key="reference_agency")
 def _fetch_reference_data():
-    global SUBTIER_AGENCY_LIST_CACHE
     with psycopg2.connect(dsn=get_database_dsn_string()) as connection:
         with connection.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
             sql = (
@@ -16,13 +14,10 @@ def _fetch_reference_data():
             )
 
             cursor.execute(sql)
-            SUBTIER_AGENCY_LIST_CACHE = {result["subtier_code"]: result for result in cursor.fetchall()}
+            return {result["subtier_code"]: result for result in cursor.fetchall()}
 
 
 def subtier_agency_list():
-    """Returns all rows from subtier_agency table. Does NOT refresh if called twice,
-    and does NOT make a copy that you can modify"""
-    if not SUBTIER_AGENCY_LIST_CACHE:
-        _fetch_reference_data()
-
-    return SUBTIER_AGENCY_LIST_CACHE.copy()
+    """Returns all rows from subtier_agency table, joined to agency, by subtier code. The mapping is a read-only
+    view shared by the whole process, reloaded when agencies change (see reference_data_cache)"""
+    return _fetch_reference_data.get()
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 import os
 import re
 import boto3
@@ -39,6 +39,21 @@ def format_value_for_sql(val, cur):
     return str(cur.mogrify("%s", (val,)), "utf-8")
 
 
+def format_value_for_copy(val):
+    """formats a value for a row in COPY's text format"""
+    if val is None:
+        return "\\N"
+    if isinstance(val, bool):
+        return "t" if val else "f"
+    if isinstance(val, (date, datetime)):
+        return val.isoformat()
+    if isinstance(val, (list, tuple)):
+        # Array literal with every element quoted, e.g. {"small_business","special_designations"}
+        elements = (str(element).replace("\\", "\\\\").replace('"', '\\"') for element in val)
+        val = "{{{}}}".format(",".join('"{}"'.format(element) for element in elements))
+    return str(val).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
 def format_bulk_insert_list_column_sql(cursor, load_objects, type):
     """creates formatted sql text to put into a bulk insert statement"""
     keys = load_objects[0][type].keys()
@@ -1,7 +1,7 @@
 import logging
 from psycopg2.extras import DictCursor
 from psycopg2 import Error
-from django.db import connection
+from django.db import connection, transaction
 
 from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
     transaction_fpds_nonboolean_columns,
@@ -20,6 +20,8 @@ from usaspending_api.etl.transaction_loaders.generic_loaders import (
     insert_transaction_normalized,
     insert_transaction_fpds,
     insert_award,
+    copy_load_objects_to_temp_table,
+    upsert_from_temp_table,
 )
 from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
 
@@ -80,11 +82,14 @@ def delete_stale_fpds(detached_award_procurement_ids):
         return awards_touched
 
 
-def load_fpds_transactions(chunk):
+def load_fpds_transactions(chunk, batch_load=False):
     """
     Run transaction load for the provided ids. This will create any new rows in other tables to support the transaction
     data, but does NOT update "secondary" award values like total obligations or C -> D linkages.
 
+    With `batch_load`, the chunk is loaded with set-based statements instead of row by row; if that fails, the chunk
+    is reloaded row by row so the failing records can be identified.
+
     returns ids for each award touched
     """
     with Timer() as timer:
@@ -94,7 +99,14 @@ def load_fpds_transactions(chunk):
             if broker_transactions:
                 load_objects = _transform_objects(broker_transactions)
 
-                retval = _load_transactions(load_objects)
+                if batch_load:
+                    try:
+                        retval = _load_transactions_in_batch(load_objects)
+                    except Error as e:
+                        logger.warning(f"Batch load failed, reloading the batch row by row.\nDetails: {e.pgerror}")
+                        retval = _load_transactions(load_objects)
+                else:
+                    retval = _load_transactions(load_objects)
     logger.info("batch completed in {}".format(timer.as_string(timer.elapsed)))
     return retval
 
@@ -192,6 +204,110 @@ def _load_transactions(load_objects):
     return list(ids_of_awards_created_or_updated)
 
 
+def _load_transactions_in_batch(load_objects):
+    """
+    Set-based equivalent of _load_transactions. Each table's portion of the load objects is staged in a temp table
+    with COPY and the awards and transactions are matched, inserted and updated with a few statements for the whole
+    batch rather than several round trips per transaction. New ids are drawn from the tables' sequences up front so
+    that staged rows can be linked to each other before anything is inserted.
+
+    returns ids for each award touched
+    """
+    connection.ensure_connection()
+    with transaction.atomic(), connection.connection.cursor() as cursor:
+        award_columns = copy_load_objects_to_temp_table(
+            cursor, load_objects, "award", "temp_fpds_award", "awards", extra_columns=["id"]
+        )
+        normalized_columns = copy_load_objects_to_temp_table(
+            cursor,
+            load_objects,
+            "transaction_normalized",
+            "temp_fpds_transaction_normalized",
+            "transaction_normalized",
+            extra_columns=["id", "award_id"],
+        )
+        fpds_columns = copy_load_objects_to_temp_table(
+            cursor,
+            load_objects,
+            "transaction_fpds",
+            "temp_fpds_transaction_fpds",
+            "transaction_fpds",
+            extra_columns=["transaction_id"],
+        )
+
+        # AWARD GET OR CREATE: match by unique_award_key, otherwise one new award per key, from its first transaction
+        cursor.execute(
+            "UPDATE temp_fpds_award t SET id = a.id "
+            "FROM ( "
+            "    SELECT DISTINCT ON (generated_unique_award_id) generated_unique_award_id, id "
+            "    FROM awards "
+            "    WHERE generated_unique_award_id IN (SELECT generated_unique_award_id FROM temp_fpds_award) "
+            "    ORDER BY generated_unique_award_id, id "
+            ") a "
+            "WHERE a.generated_unique_award_id = t.generated_unique_award_id"
+        )
+        cursor.execute(
+            "UPDATE temp_fpds_award t SET id = n.id "
+            "FROM ( "
+            "    SELECT generated_unique_award_id, nextval(pg_get_serial_sequence('awards', 'id')) AS id "
+            "    FROM (SELECT DISTINCT generated_unique_award_id FROM temp_fpds_award WHERE id IS NULL) k "
+            ") n "
+            "WHERE n.generated_unique_award_id = t.generated_unique_award_id AND t.id IS NULL "
+            "RETURNING t.id"
+        )
+        new_award_ids = {row[0] for row in cursor.fetchall()}
+        if new_award_ids:
+            column_sql = ",".join('"{}"'.format(column) for column in award_columns)
+            cursor.execute(
+                f"INSERT INTO awards (id,{column_sql}) "
+                f"SELECT DISTINCT ON (id) id,{column_sql} FROM temp_fpds_award WHERE id IN %s "
+                f"ORDER BY id, load_ordinal",
+                (tuple(new_award_ids),),
+            )
+
+        # TRANSACTION UPSERT: match by detached_award_proc_unique, otherwise a new transaction_normalized id per key
+        cursor.execute(
+            "UPDATE temp_fpds_transaction_normalized t SET award_id = a.id "
+            "FROM temp_fpds_award a WHERE a.load_ordinal = t.load_ordinal"
+        )
+        cursor.execute(
+            "UPDATE temp_fpds_transaction_normalized t SET id = f.transaction_id "
+            "FROM transaction_fpds f WHERE f.detached_award_proc_unique = t.transaction_unique_id"
+        )
+        cursor.execute(
+            "UPDATE temp_fpds_transaction_normalized t SET id = n.id "
+            "FROM ( "
+            "    SELECT transaction_unique_id, nextval(pg_get_serial_sequence('transaction_normalized', 'id')) AS id "
+            "    FROM (SELECT DISTINCT transaction_unique_id FROM temp_fpds_transaction_normalized WHERE id IS NULL) k "
+            ") n "
+            "WHERE n.transaction_unique_id = t.transaction_unique_id AND t.id IS NULL"
+        )
+        cursor.execute(
+            "UPDATE temp_fpds_transaction_fpds t SET transaction_id = n.id "
+            "FROM temp_fpds_transaction_normalized n WHERE n.load_ordinal = t.load_ordinal"
+        )
+        upsert_from_temp_table(
+            cursor,
+            "transaction_normalized",
+            "temp_fpds_transaction_normalized",
+            "id",
+            ["id", "award_id", *normalized_columns],
+        )
+        upsert_from_temp_table(
+            cursor,
+            "transaction_fpds",
+            "temp_fpds_transaction_fpds",
+            "detached_award_proc_unique",
+            ["transaction_id", *fpds_columns],
+        )
+
+        cursor.execute("SELECT DISTINCT award_id FROM temp_fpds_transaction_normalized")
+        ids_of_awards_created_or_updated = [row[0] for row in cursor.fetchall()]
+
+    logger.debug(f"batch loaded {len(load_objects):,} fpds transactions, creating {len(new_award_ids):,} awards")
+    return ids_of_awards_created_or_updated
+
+
 def _matching_award(cursor, load_object):
     """ Try to find an award for this transaction to belong to by unique_award_key"""
     find_matching_award_sql = "select id from awards where generated_unique_award_id = '{}'".format(
@@ -1,4 +1,12 @@
-from usaspending_api.etl.transaction_loaders.data_load_helpers import format_insert_or_update_column_sql
+from io import StringIO
+
+from usaspending_api.etl.transaction_loaders.data_load_helpers import (
+    format_insert_or_update_column_sql,
+    format_value_for_copy,
+)
+
+# Columns that keep their original value when an existing row is updated
+INSERT_ONLY_COLUMNS = ["create_date", "created_at"]
 
 
 def insert_award(cursor, load_object):
@@ -39,3 +47,52 @@ def insert_transaction_fpds(cursor, load_object):
     cursor.execute(transaction_fpds_sql)
     created_transaction_fpds = cursor.fetchall()
     return created_transaction_fpds
+
+
+def copy_load_objects_to_temp_table(cursor, load_objects, type, temp_table, source_table, extra_columns=()):
+    """
+    Stage the `type` portion of every load object in a temp table with a single COPY. The temp table has the same
+    column types as `source_table`, any `extra_columns` of `source_table` (left null for the caller to resolve), and a
+    "load_ordinal" column holding each row's position in `load_objects`. The table is dropped on commit.
+
+    Returns the list of columns that were copied
+    """
+    columns = [key for key in load_objects[0][type].keys() if key not in extra_columns]
+    column_sql = ",".join('"{}"'.format(column) for column in columns)
+    all_column_sql = ",".join('"{}"'.format(column) for column in [*columns, *extra_columns])
+
+    # Within an outer transaction a previous batch's temp table may still be around
+    cursor.execute("DROP TABLE IF EXISTS {}".format(temp_table))
+    cursor.execute(
+        "CREATE TEMPORARY TABLE {} ON COMMIT DROP AS SELECT {} FROM {} LIMIT 0".format(
+            temp_table, all_column_sql, source_table
+        )
+    )
+    cursor.execute("ALTER TABLE {} ADD COLUMN load_ordinal INTEGER".format(temp_table))
+
+    rows = StringIO()
+    for load_ordinal, load_object in enumerate(load_objects):
+        values = [format_value_for_copy(load_object[type][column]) for column in columns]
+        rows.write("\t".join([*values, str(load_ordinal)]) + "\n")
+    rows.seek(0)
+    cursor.copy_expert("COPY {} ({},load_ordinal) FROM STDIN".format(temp_table, column_sql), rows)
+
+    return columns
+
+
+def upsert_from_temp_table(cursor, table, temp_table, key_column, columns):
+    """
+    Insert or update `table` from the staged rows in `temp_table` in a single statement. When several staged rows
+    share a key, the last one staged wins, as it would if they were loaded one at a time.
+    """
+    column_sql = ",".join('"{}"'.format(column) for column in columns)
+    update_sql = ",".join(
+        '"{0}"=EXCLUDED."{0}"'.format(column) for column in columns if column not in INSERT_ONLY_COLUMNS
+    )
+    cursor.execute(
+        "INSERT INTO {table} ({columns}) "
+        "SELECT DISTINCT ON ({key}) {columns} FROM {temp_table} ORDER BY {key}, load_ordinal DESC "
+        "ON CONFLICT ({key}) DO UPDATE SET {updates}".format(
+            table=table, columns=column_sql, key=key_column, temp_table=temp_table, updates=update_sql
+        )
+    )
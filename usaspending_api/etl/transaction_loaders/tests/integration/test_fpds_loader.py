@@ -5,7 +5,7 @@ import pytest
 from django.core.management import call_command
 from model_mommy import mommy
 
-from usaspending_api.awards.models import Award, TransactionFPDS
+from usaspending_api.awards.models import Award, TransactionFPDS, TransactionNormalized
 from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
     transaction_fpds_nonboolean_columns,
     transaction_normalized_nonboolean_columns,
@@ -59,7 +59,8 @@ def _assemble_source_procurement_records(id_list):
 
 
 @pytest.mark.django_db
-def test_load_source_procurement_by_ids():
+@pytest.mark.parametrize("load_args", [[], ["--batch-load"]])
+def test_load_source_procurement_by_ids(load_args):
     """
     Simple end-to-end integration test to exercise the fpds loader given 3 records in an actual broker database
     to load into an actual usaspending database
@@ -68,7 +69,7 @@ def test_load_source_procurement_by_ids():
     _assemble_source_procurement_records(source_procurement_id_list)
 
     # Run core logic to be tested
-    call_command("load_fpds_transactions", "--ids", *source_procurement_id_list)
+    call_command("load_fpds_transactions", "--ids", *source_procurement_id_list, *load_args)
 
     # Lineage should trace back to the broker records
     usaspending_transactions = TransactionFPDS.objects.all()
@@ -114,3 +115,20 @@ def test_load_source_procurement_by_ids():
     assert transactions_by_id[101].fiscal_year == 2010
     assert transactions_by_id[201].fiscal_year == 2010
     assert transactions_by_id[301].fiscal_year == 2011
+
+
+@pytest.mark.django_db
+def test_batch_load_updates_existing_records():
+    """Reloading the same records in batch mode should update the existing transactions and award, not duplicate them"""
+    source_procurement_id_list = [101, 201, 301]
+    _assemble_source_procurement_records(source_procurement_id_list)
+
+    call_command("load_fpds_transactions", "--ids", *source_procurement_id_list, "--batch-load")
+    original_transaction_ids = set(TransactionFPDS.objects.values_list("transaction_id", flat=True))
+    original_award_ids = set(Award.objects.values_list("id", flat=True))
+
+    call_command("load_fpds_transactions", "--ids", *source_procurement_id_list, "--batch-load")
+
+    assert set(TransactionFPDS.objects.values_list("transaction_id", flat=True)) == original_transaction_ids
+    assert set(Award.objects.values_list("id", flat=True)) == original_award_ids
+    assert TransactionNormalized.objects.filter(award_id__in=original_award_ids).count() == 3
@@ -1,4 +1,10 @@
-from usaspending_api.etl.transaction_loaders.data_load_helpers import capitalize_if_string, false_if_null
+import datetime
+
+from usaspending_api.etl.transaction_loaders.data_load_helpers import (
+    capitalize_if_string,
+    false_if_null,
+    format_value_for_copy,
+)
 
 
 def test_capitalize_if_string():
@@ -14,3 +20,13 @@ def test_false_if_null():
     assert false_if_null(True)
     assert not false_if_null(False)
     assert not false_if_null(None)
+
+
+def test_format_value_for_copy():
+    assert format_value_for_copy(None) == "\\N"
+    assert format_value_for_copy(True) == "t"
+    assert format_value_for_copy(False) == "f"
+    assert format_value_for_copy(7) == "7"
+    assert format_value_for_copy(datetime.date(2010, 1, 2)) == "2010-01-02"
+    assert format_value_for_copy("tab\tnew\nline\\") == "tab\\tnew\\nline\\\\"
+    assert format_value_for_copy(["small_business", 'say "hi"']) == '{"small_business","say \\\\"hi\\\\""}'
@@ -1,4 +1,3 @@
-import json
 import logging
 import uuid
 
@@ -13,13 +12,14 @@ from rest_framework.views import APIView
 from usaspending_api.awards.v2.lookups.lookups import loan_type_mapping
 from usaspending_api.broker.helpers.get_business_categories import get_business_categories
 from usaspending_api.common.cache_decorator import cache_response
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
 from usaspending_api.common.elasticsearch.search_wrappers import TransactionSearch
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.recipient.models import RecipientProfile, RecipientLookup, DUNS
 from usaspending_api.recipient.v2.helpers import validate_year, reshape_filters, get_duns_business_types_mapping
 from usaspending_api.recipient.v2.lookups import RECIPIENT_LEVELS, SPECIAL_CASES
-from usaspending_api.references.models import RefCountryCode
+from usaspending_api.references.reference_data_cache import country_name_by_code
 from usaspending_api.search.models import TransactionSearch as TransactionSearchModel
 from usaspending_api.search.v2.elasticsearch_helper import (
     get_scaled_sum_aggregations,
@@ -120,8 +120,7 @@ def cleanup_location(location):
         location["country_code"] = "USA"
     # Country name generally isn't available with SAM data
     if location.get("country_code", None) and not location.get("country_name", None):
-        country_name = RefCountryCode.objects.filter(country_code=location["country_code"]).values("country_name")
-        location["country_name"] = country_name[0]["country_name"] if country_name else None
+        location["country_name"] = country_name_by_code.lookup(location["country_code"])
     # Older transactions have various formats for congressional code (13.0, 13, CA13)
     if location.get("congressional_code", None):
         congressional_code = location["congressional_code"]
@@ -285,7 +284,7 @@ def obtain_recipient_totals(recipient_id, children=False, year="latest"):
     for bucket in recipient_info_buckets:
         result = {}
         if children:
-            recipient_info = json.loads(bucket.get("key"))
+            recipient_info = decode_agg_key(bucket.get("key"))
             hash_with_level = recipient_info.get("hash_with_level") or None
             result = {
                 "recipient_hash": hash_with_level[:-2] if hash_with_level else None,
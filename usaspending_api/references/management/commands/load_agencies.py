@@ -12,6 +12,7 @@ from usaspending_api.common.etl import ETLQueryFile, ETLTable, mixins
 from usaspending_api.common.helpers.sql_helpers import get_connection, execute_sql
 from usaspending_api.common.helpers.text_helpers import standardize_nullable_whitespace as prep
 from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
+from usaspending_api.references.reference_data_cache import invalidate_reference_data
 from usaspending_api.etl.operations.federal_account.update_agency import (
     DOD_SUBSUMED_AIDS,
     update_federal_account_agency,
@@ -100,6 +101,7 @@ class Command(mixins.ETLMixin, BaseCommand):
                     t = Timer("Commit agency transaction")
                     t.log_starting_message()
                 t.log_success_message()
+                invalidate_reference_data("reference_agency")
             except Exception:
                 logger.error("ALL CHANGES ROLLED BACK DUE TO EXCEPTION")
                 raise
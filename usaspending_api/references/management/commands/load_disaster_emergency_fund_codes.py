@@ -11,6 +11,7 @@ from usaspending_api.common.etl import ETLTable, mixins, ETLTemporaryTable
 from usaspending_api.common.etl.operations import insert_missing_rows, update_changed_rows
 from usaspending_api.common.helpers.sql_helpers import get_connection
 from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
+from usaspending_api.references.reference_data_cache import invalidate_reference_data
 
 
 DEF_CODE_PATTERN = re.compile("[a-zA-Z0-9][a-zA-Z0-9]?")
@@ -63,6 +64,7 @@ class Command(mixins.ETLMixin, BaseCommand):
                     t = Timer("Commit transaction")
                     t.log_starting_message()
                 t.log_success_message()
+                invalidate_reference_data("reference_disaster_emergency_fund_code")
             except Exception:
                 logger.error("ALL CHANGES ROLLED BACK DUE TO EXCEPTION")
                 raise
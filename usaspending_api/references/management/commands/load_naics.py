@@ -8,6 +8,7 @@ from django.db import transaction
 from openpyxl import load_workbook
 
 from usaspending_api.references.models import NAICS
+from usaspending_api.references.reference_data_cache import invalidate_reference_data
 
 
 class Command(BaseCommand):
@@ -25,6 +26,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         load_naics(path=options["path"], append=options["append"])
+        invalidate_reference_data("reference_naics")
 
 
 def populate_naics_fields(ws, naics_year, path):
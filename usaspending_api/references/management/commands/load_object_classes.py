@@ -12,6 +12,7 @@ from usaspending_api.common.etl.operations import insert_missing_rows, update_ch
 from usaspending_api.common.helpers.sql_helpers import get_connection
 from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
 from usaspending_api.references.models import ObjectClass
+from usaspending_api.references.reference_data_cache import invalidate_reference_data
 
 
 OBJECT_CLASS_PATTERN = re.compile("[12]?[0-9]{3}")
@@ -77,6 +78,7 @@ class Command(mixins.ETLMixin, BaseCommand):
                     t = Timer("Commit transaction")
                     t.log_starting_message()
                 t.log_success_message()
+                invalidate_reference_data("reference_object_class")
             except Exception:
                 logger.error("ALL CHANGES ROLLED BACK DUE TO EXCEPTION")
                 raise
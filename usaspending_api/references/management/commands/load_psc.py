@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from usaspending_api.references.models import PSC
+from usaspending_api.references.reference_data_cache import invalidate_reference_data
 import os
 import logging
 from openpyxl import load_workbook
@@ -21,6 +22,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
 
         load_psc(fullpath=options["path"], update=options["update"])
+        invalidate_reference_data("reference_psc")
         self.logger.log(20, "Loaded PSC codes successfully.")
 
 
@@ -3,6 +3,7 @@ import logging
 from django.core.management.base import BaseCommand
 from usaspending_api.common.threaded_data_loader import ThreadedDataLoader
 from usaspending_api.references.models import RefCountryCode, ObjectClass, RefProgramActivity
+from usaspending_api.references.reference_data_cache import invalidate_reference_data
 
 
 logger = logging.getLogger("console")
@@ -33,3 +34,7 @@ class Command(BaseCommand):
 
         loader = ThreadedDataLoader(model_class=possible_models[model], collision_behavior="update")
         loader.load_from_file(path, encoding)
+
+        reference_data_versions = {"RefCountryCode": "reference_country_code", "ObjectClass": "reference_object_class"}
+        if model in reference_data_versions:
+            invalidate_reference_data(reference_data_versions[model])
@@ -11,6 +11,7 @@ from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
 from usaspending_api.common.retrieve_file_from_uri import SCHEMA_HELP_TEXT
 from usaspending_api.common.operations_reporter import OpsReporter
 from usaspending_api.references.models import Cfda
+from usaspending_api.references.reference_data_cache import invalidate_reference_data
 
 
 logger = logging.getLogger("console")
@@ -81,6 +82,8 @@ class Command(BaseCommand):
 
         logger.info("Comparing DataFrames")
         raise_status_code_3 = not load_cfda(database_df, external_data_df)
+        if not raise_status_code_3:
+            invalidate_reference_data("reference_cfda")
 
         Reporter["duration"] = perf_counter() - start
         Reporter["end_status"] = 3 if raise_status_code_3 else 0
@@ -88,14 +88,18 @@ class Agency(models.Model):
             subtier_code: an agency subtier code
 
         Returns:
-            an Agency instance
+            an Agency instance, shared with other callers through the reference data cache
 
         """
-        agencies = Agency.objects.filter(subtier_agency__subtier_code=subtier_code)
-        if agencies.count() == 1:
-            return agencies.first()
-        else:
-            return None
+        if subtier_code is None:
+            # Matches agencies without a subtier code, which the cache doesn't hold
+            agencies = Agency.objects.filter(subtier_agency__subtier_code=subtier_code)
+            return agencies.first() if agencies.count() == 1 else None
+
+        # Imported here because the cache module imports this one
+        from usaspending_api.references.reference_data_cache import agency_by_subtier_only
+
+        return agency_by_subtier_only.lookup(subtier_code)
 
     def __str__(self):
         stringrep = ""
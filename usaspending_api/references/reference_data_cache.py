@@ -0,0 +1,159 @@
+"""
+Process-wide cache of small, rarely changing reference tables (agencies, country codes, object classes, ...) for the
+ETL and API lookups that would otherwise query them for every record or request.
+
+Each dataset is loaded lazily into a read-only mapping on first use. A dataset is reloaded when:
+    - it is older than REFERENCE_DATA_CACHE_TTL_SECONDS, or
+    - its version changed. The version is the last load date the reference loaders record (as an external data type)
+      when they change the underlying table; each process checks it at most every
+      REFERENCE_DATA_CACHE_VERSION_CHECK_SECONDS.
+
+The mappings (and the model instances in them) are shared by every caller in the process and must not be modified.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from usaspending_api.broker.helpers.last_load_date import get_last_load_date, touch_last_load_date
+from usaspending_api.references.models import (
+    Agency,
+    Cfda,
+    DisasterEmergencyFundCode,
+    NAICS,
+    ObjectClass,
+    PSC,
+    RefCountryCode,
+)
+
+logger = logging.getLogger(__name__)
+
+_REFERENCE_DATA_CACHES: Dict[str, "ReferenceDataCache"] = {}
+
+
+class ReferenceDataCache:
+    def __init__(self, name: str, version_key: str, loader: Callable[[], Dict[Any, Any]]):
+        self.name = name
+        self.version_key = version_key
+        self.loader = loader
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._data: Optional[Mapping] = None
+        self._version = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+
+    def get(self) -> Mapping:
+        with self._lock:
+            now = time.monotonic()
+            if self._data is not None and now - self._loaded_at < settings.REFERENCE_DATA_CACHE_TTL_SECONDS:
+                if now - self._checked_at < settings.REFERENCE_DATA_CACHE_VERSION_CHECK_SECONDS:
+                    self.hits += 1
+                    return self._data
+                self.version_checks += 1
+                self._checked_at = now
+                if get_last_load_date(self.version_key) == self._version:
+                    self.hits += 1
+                    return self._data
+
+            self.misses += 1
+            start = time.perf_counter()
+            # Read the version first so a load that races with a reference loader is reloaded on the next check
+            self._version = get_last_load_date(self.version_key)
+            self._data = MappingProxyType(self.loader())
+            self._loaded_at = self._checked_at = time.monotonic()
+            logger.info(
+                f"Loaded {len(self._data):,} '{self.name}' reference records in {time.perf_counter() - start:.4f}s "
+                f"({self.hits:,} hits, {self.misses:,} misses)"
+            )
+            return self._data
+
+    def lookup(self, key, default=None):
+        return self.get().get(key, default)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def metrics(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "version_checks": self.version_checks}
+
+
+def reference_data(name: str, version_key: str):
+    """Decorator that registers a function returning a dict of reference data as a cached dataset"""
+
+    def register(loader: Callable[[], Dict[Any, Any]]) -> ReferenceDataCache:
+        _REFERENCE_DATA_CACHES[name] = ReferenceDataCache(name, version_key, loader)
+        return _REFERENCE_DATA_CACHES[name]
+
+    return register
+
+
+def invalidate_reference_data(version_key: str) -> None:
+    """
+    Called by reference loaders after they change a table: records a new version so every process reloads the
+    datasets built from it, and drops this process's copies right away.
+    """
+    touch_last_load_date(version_key)
+    for cache in _REFERENCE_DATA_CACHES.values():
+        if cache.version_key == version_key:
+            cache.invalidate()
+
+
+def clear_reference_data_caches() -> None:
+    """Drop this process's copy of every dataset, e.g. between tests"""
+    for cache in _REFERENCE_DATA_CACHES.values():
+        cache.invalidate()
+
+
+def reference_data_cache_metrics() -> Dict[str, dict]:
+    return {name: cache.metrics() for name, cache in _REFERENCE_DATA_CACHES.items()}
+
+
+@reference_data("agency_by_subtier_only", version_key="reference_agency")
+def agency_by_subtier_only():
+    """Agency for every subtier code that matches exactly one Agency (see Agency.get_by_subtier_only)"""
+    matches = {}
+    for agency in Agency.objects.select_related("subtier_agency").filter(subtier_agency__isnull=False):
+        matches.setdefault(agency.subtier_agency.subtier_code, []).append(agency)
+    return {code: agencies[0] for code, agencies in matches.items() if len(agencies) == 1}
+
+
+@reference_data("country_name_by_code", version_key="reference_country_code")
+def country_name_by_code():
+    return dict(RefCountryCode.objects.values_list("country_code", "country_name"))
+
+
+@reference_data("object_class_by_code", version_key="reference_object_class")
+def object_class_by_code():
+    return {(oc.object_class, oc.direct_reimbursable): oc for oc in ObjectClass.objects.all()}
+
+
+@reference_data("disaster_emergency_fund_code", version_key="reference_disaster_emergency_fund_code")
+def disaster_emergency_fund_code():
+    return {defc.code: defc for defc in DisasterEmergencyFundCode.objects.all()}
+
+
+@reference_data("cfda_by_number", version_key="reference_cfda")
+def cfda_by_number():
+    # Descending so that the lowest id wins for a duplicated program number, as with first()
+    cfdas = Cfda.objects.order_by("-id").values_list("id", "program_number", "program_title")
+    return {program_number: (cfda_id, program_title) for cfda_id, program_number, program_title in cfdas}
+
+
+@reference_data("psc_description_by_code", version_key="reference_psc")
+def psc_description_by_code():
+    return dict(PSC.objects.values_list("code", "description"))
+
+
+@reference_data("naics_description_by_code", version_key="reference_naics")
+def naics_description_by_code():
+    return dict(NAICS.objects.values_list("code", "description"))
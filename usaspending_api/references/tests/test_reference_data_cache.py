@@ -0,0 +1,42 @@
+import pytest
+
+from datetime import datetime, timezone
+from model_mommy import mommy
+
+from usaspending_api.broker.helpers.last_load_date import update_last_load_date
+from usaspending_api.references.models import RefCountryCode
+from usaspending_api.references.reference_data_cache import country_name_by_code, invalidate_reference_data
+
+
+@pytest.mark.django_db
+def test_reference_data_cache_reloads_on_invalidation():
+    mommy.make(RefCountryCode, country_code="USA", country_name="UNITED STATES")
+
+    assert country_name_by_code.lookup("USA") == "UNITED STATES"
+    RefCountryCode.objects.filter(country_code="USA").update(country_name="RENAMED")
+    assert country_name_by_code.lookup("USA") == "UNITED STATES"
+    assert country_name_by_code.metrics()["hits"] == 1
+
+    invalidate_reference_data("reference_country_code")
+    assert country_name_by_code.lookup("USA") == "RENAMED"
+    assert country_name_by_code.metrics()["misses"] == 2
+
+    with pytest.raises(TypeError):
+        country_name_by_code.get()["USA"] = "READ ONLY"
+
+
+@pytest.mark.django_db
+def test_reference_data_cache_reloads_on_new_version(settings):
+    settings.REFERENCE_DATA_CACHE_VERSION_CHECK_SECONDS = 0
+    invalidate_reference_data("reference_country_code")
+    mommy.make(RefCountryCode, country_code="CAN", country_name="CANADA")
+
+    assert country_name_by_code.lookup("CAN") == "CANADA"
+    RefCountryCode.objects.filter(country_code="CAN").update(country_name="RENAMED")
+
+    # Unchanged version: served from the cache
+    assert country_name_by_code.lookup("CAN") == "CANADA"
+
+    # Another process recorded a new version of the table
+    update_last_load_date("reference_country_code", datetime(2100, 1, 1, tzinfo=timezone.utc))
+    assert country_name_by_code.lookup("CAN") == "RENAMED"
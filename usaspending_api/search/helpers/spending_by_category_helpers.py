@@ -2,7 +2,13 @@ import logging
 from typing import Tuple, Optional
 
 from usaspending_api.recipient.models import StateData
-from usaspending_api.references.models import Agency, Cfda, PSC, RefCountryCode, NAICS
+from usaspending_api.references.models import Agency
+from usaspending_api.references.reference_data_cache import (
+    cfda_by_number,
+    country_name_by_code,
+    naics_description_by_code,
+    psc_description_by_code,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,30 +28,25 @@ def fetch_agency_tier_id_by_agency(agency_name: str, is_subtier: bool = False) -
 
 
 def fetch_cfda_id_title_by_number(cfda_number: str) -> Optional[Tuple[int, str]]:
-    columns = ["id", "program_title"]
-    result = Cfda.objects.filter(program_number=cfda_number).values(*columns).first()
+    result = cfda_by_number.lookup(cfda_number)
     if not result:
-        logger.warning("{} not found for cfda_number: {}".format(",".join(columns), cfda_number))
+        logger.warning("id,program_title not found for cfda_number: {}".format(cfda_number))
         return None, None
-    return result[columns[0]], result[columns[1]]
+    return result
 
 
 def fetch_psc_description_by_code(psc_code: str) -> Optional[str]:
-    columns = ["description"]
-    result = PSC.objects.filter(code=psc_code).values(*columns).first()
-    if not result:
-        logger.warning("{} not found for psc_code: {}".format(",".join(columns), psc_code))
+    if psc_code not in psc_description_by_code.get():
+        logger.warning("description not found for psc_code: {}".format(psc_code))
         return None
-    return result[columns[0]]
+    return psc_description_by_code.lookup(psc_code)
 
 
 def fetch_country_name_from_code(country_code: str) -> Optional[str]:
-    columns = ["country_name"]
-    result = RefCountryCode.objects.filter(country_code=country_code).values(*columns).first()
-    if not result:
-        logger.warning("{} not found for country_code: {}".format(",".join(columns), country_code))
+    if country_code not in country_name_by_code.get():
+        logger.warning("country_name not found for country_code: {}".format(country_code))
         return None
-    return result[columns[0]]
+    return country_name_by_code.lookup(country_code)
 
 
 def fetch_state_name_from_code(state_code: str) -> Optional[str]:
@@ -58,9 +59,7 @@ def fetch_state_name_from_code(state_code: str) -> Optional[str]:
 
 
 def fetch_naics_description_from_code(naics_code: str, passthrough: str = None) -> Optional[str]:
-    columns = ["description"]
-    result = NAICS.objects.filter(code=naics_code).values(*columns).first()
-    if not result:
-        logger.warning("{} not found for naics_code: {}".format(",".join(columns), naics_code))
+    if naics_code not in naics_description_by_code.get():
+        logger.warning("description not found for naics_code: {}".format(naics_code))
         return passthrough
-    return result[columns[0]]
+    return naics_description_by_code.lookup(naics_code)
@@ -5,6 +5,9 @@ from rest_framework import status
 from usaspending_api.common.helpers.generic_helper import get_time_period_message
 from usaspending_api.search.tests.data.search_filters_test_data import non_legacy_filters
 from usaspending_api.search.tests.data.utilities import setup_elasticsearch_test
+from usaspending_api.search.v2.views.spending_by_category_views.spending_by_category import (
+    AbstractSpendingByCategoryViewSet,
+)
 
 
 def test_success_with_all_filters(client, monkeypatch, elasticsearch_transaction_index, awards_and_transactions):
@@ -63,3 +66,34 @@ def test_correct_response_of_empty_list(client, monkeypatch, elasticsearch_trans
     }
     assert resp.status_code == status.HTTP_200_OK, "Failed to return 200 Response"
     assert resp.json() == expected_response
+
+
+def test_correct_response_with_composite_aggregation(
+    client, monkeypatch, elasticsearch_transaction_index, awards_and_transactions
+):
+    """Categories with more buckets than a terms aggregation can return are paged through instead"""
+
+    setup_elasticsearch_test(monkeypatch, elasticsearch_transaction_index)
+    monkeypatch.setattr(AbstractSpendingByCategoryViewSet, "exceeds_terms_aggregation_limit", lambda self: True)
+    monkeypatch.setattr(AbstractSpendingByCategoryViewSet, "composite_page_size", 1)
+
+    filters = {"time_period": [{"start_date": "2018-10-01", "end_date": "2020-09-30"}]}
+    resp = client.post(
+        "/api/v2/search/spending_by_category/naics",
+        content_type="application/json",
+        data=json.dumps({"filters": filters}),
+    )
+    assert resp.status_code == status.HTTP_200_OK, "Failed to return 200 Response"
+    assert resp.json()["results"] == [
+        {"amount": 500000.0, "code": "222220", "id": None, "name": "NAICS 2"},
+        {"amount": 50000.0, "code": "111110", "id": None, "name": "NAICS 1"},
+    ]
+
+    resp = client.post(
+        "/api/v2/search/spending_by_category/naics",
+        content_type="application/json",
+        data=json.dumps({"filters": filters, "limit": 1, "page": 2}),
+    )
+    assert resp.status_code == status.HTTP_200_OK, "Failed to return 200 Response"
+    assert resp.json()["page_metadata"]["hasPrevious"] is True
+    assert resp.json()["results"] == [{"amount": 50000.0, "code": "111110", "id": None, "name": "NAICS 1"}]
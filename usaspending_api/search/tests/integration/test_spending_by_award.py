@@ -1332,6 +1332,62 @@ def test_search_after(client, monkeypatch, spending_by_award_test_data, elastics
     assert resp.json().get("results") == expected_result, "Award Type Code filter does not match expected result"
 
 
+def _page_through_with_cursors(client, request):
+    results, cursor = [], None
+    for _ in range(10):
+        resp = client.post(
+            "/api/v2/search/spending_by_award",
+            content_type="application/json",
+            data=json.dumps({**request, "cursor": cursor}),
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        results.extend(resp.json()["results"])
+        cursor = resp.json()["page_metadata"]["cursor"]
+        assert (cursor is not None) == resp.json()["page_metadata"]["hasNext"]
+        if cursor is None:
+            return results
+    raise AssertionError("Cursor pagination did not stop")
+
+
+@pytest.mark.django_db
+def test_cursor_pagination(client, monkeypatch, spending_by_award_test_data, elasticsearch_award_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_award_index)
+
+    request = {
+        "filters": {"award_type_codes": ["A", "B", "C", "D"]},
+        "fields": ["Award ID"],
+        "limit": 1,
+        "sort": "Award ID",
+        "order": "asc",
+        "subawards": False,
+    }
+    results = _page_through_with_cursors(client, request)
+    assert [result["Award ID"] for result in results] == ["abc111", "abc222", "abc333"]
+
+    request = {
+        "filters": {"award_type_codes": ["A"]},
+        "fields": ["Sub-Award ID"],
+        "limit": 1,
+        "sort": "Sub-Award ID",
+        "subawards": True,
+    }
+    results = _page_through_with_cursors(client, request)
+    assert [result["internal_id"] for result in results] == ["66666", "33333", "22222", "11111"]
+
+    # Cursors only work with the request they came from
+    resp = client.post(
+        "/api/v2/search/spending_by_award",
+        content_type="application/json",
+        data=json.dumps({**request, "limit": 2}),
+    )
+    resp = client.post(
+        "/api/v2/search/spending_by_award",
+        content_type="application/json",
+        data=json.dumps({**request, "order": "asc", "cursor": resp.json()["page_metadata"]["cursor"]}),
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.django_db
 def test_no_0_covid_amounts(client, monkeypatch, spending_by_award_test_data, elasticsearch_award_index):
     setup_elasticsearch_test(monkeypatch, elasticsearch_award_index)
@@ -2,12 +2,17 @@ import itertools
 
 import pytest
 
+from elasticsearch_dsl import A, Q as ES_Q, Search
 from model_mommy import mommy
+from unittest.mock import Mock, patch
 
 from usaspending_api.search.tests.data.utilities import setup_elasticsearch_test
 from usaspending_api.search.v2.elasticsearch_helper import (
+    BucketCount,
     spending_by_transaction_count,
     get_download_ids,
+    get_sum_as_cents_aggregation,
+    get_top_buckets_by_sum,
     es_minimal_sanitize,
     swap_keys,
 )
@@ -140,3 +145,84 @@ def test_swap_keys():
         "action_date": "action_date",
         "federal_action_obligation": "federal_action_obligation",
     }
+
+
+def test_bucket_count():
+    search = Search(index="test-awards").filter(ES_Q("term", type="A"))
+    with patch("usaspending_api.search.v2.elasticsearch_helper.get_data_version", return_value="v1"):
+        bucket_count = BucketCount(search, "recipient_agg_key.hash")
+        assert bucket_count.value is None
+        assert bucket_count.size(maximum=9900) == 9900
+
+        # Collected with the search's other aggregations
+        bucket_count.add_to_search(search)
+        assert search.to_dict()["aggs"]["bucket_count"] == {
+            "cardinality": {"field": "recipient_agg_key.hash", "precision_threshold": 11000}
+        }
+        assert bucket_count.read_response({"bucket_count": {"value": 42}}) == 42
+
+        # The same count is then reused without adding the aggregation again
+        search = Search(index="test-awards").filter(ES_Q("term", type="A"))
+        bucket_count = BucketCount(search, "recipient_agg_key.hash")
+        assert bucket_count.size(maximum=9900) == 42
+        bucket_count.add_to_search(search)
+        assert "aggs" not in search.to_dict()
+
+        # A different query isn't
+        search = Search(index="test-awards").filter(ES_Q("term", type="B"))
+        assert BucketCount(search, "recipient_agg_key.hash").value is None
+
+    # Nor are counts from a previous data version
+    with patch("usaspending_api.search.v2.elasticsearch_helper.get_data_version", return_value="v2"):
+        search = Search(index="test-awards").filter(ES_Q("term", type="A"))
+        assert BucketCount(search, "recipient_agg_key.hash").value is None
+
+
+class _CompositeSearch(Search):
+    """Answers composite aggregations over 50 buckets with made up sums"""
+
+    sums = {f"key {i:02}": float(i * 37 % 50 // 2) for i in range(50)}
+    pages = 0
+
+    def handle_execute(self):
+        _CompositeSearch.pages += 1
+        composite = self.to_dict()["aggs"]["group_by_agg_key"]["composite"]
+        after = composite.get("after", {}).get("agg_key", "")
+        keys = sorted(key for key in self.sums if key > after)[: composite["size"]]
+        buckets = [{"key": {"agg_key": key}, "doc_count": 1, "sum_field": {"value": self.sums[key]}} for key in keys]
+        response = {"group_by_agg_key": {"buckets": buckets}}
+        if keys:
+            response["group_by_agg_key"]["after_key"] = {"agg_key": keys[-1]}
+        return Mock(aggs=Mock(to_dict=Mock(return_value=response)))
+
+
+def test_get_sum_as_cents_aggregation(settings):
+    settings.ES_SUM_PRECOMPUTED_FIELDS = False
+    assert get_sum_as_cents_aggregation("generated_pragmatic_obligation").to_dict() == {
+        "sum": {"field": "generated_pragmatic_obligation", "script": {"source": "_value * 100"}}
+    }
+
+    settings.ES_SUM_PRECOMPUTED_FIELDS = True
+    assert get_sum_as_cents_aggregation("generated_pragmatic_obligation").to_dict() == {
+        "sum": {"field": "generated_pragmatic_obligation_cents"}
+    }
+
+
+def test_get_top_buckets_by_sum(monkeypatch):
+    monkeypatch.setattr(_CompositeSearch, "pages", 0)
+    buckets = get_top_buckets_by_sum(
+        _CompositeSearch(), "naics_agg_key", A("sum", field="generated_pragmatic_obligation_cents"), 10, page_size=7
+    )
+
+    expected = sorted(_CompositeSearch.sums.items(), key=lambda item: (-item[1], item[0]))[:10]
+    assert [(bucket["key"], bucket["sum_field"]["value"]) for bucket in buckets] == expected
+    assert _CompositeSearch.pages == 8  # 50 buckets, 7 per page
+
+
+def test_get_top_buckets_by_sum_breaks_ties_on_key():
+    # Every sum is shared by two buckets, so an odd count keeps only one of the two with the smallest sum kept
+    sum_aggregation = A("sum", field="generated_pragmatic_obligation_cents")
+    ordered = sorted(_CompositeSearch.sums.items(), key=lambda item: (-item[1], item[0]))
+    for count in (1, 9, 11):
+        buckets = get_top_buckets_by_sum(_CompositeSearch(), "naics_agg_key", sum_aggregation, count, page_size=7)
+        assert [(bucket["key"], bucket["sum_field"]["value"]) for bucket in buckets] == ordered[:count]
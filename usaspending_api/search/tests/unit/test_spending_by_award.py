@@ -1,8 +1,14 @@
 import pytest
 
+from django.db.models import Q
+
 from usaspending_api.awards.v2.lookups.lookups import contract_subaward_mapping
 from usaspending_api.common.helpers.api_helper import raise_if_award_types_not_valid_subset, raise_if_sort_key_not_valid
-from usaspending_api.common.helpers.generic_helper import get_time_period_message
+from usaspending_api.common.helpers.generic_helper import (
+    decode_pagination_cursor,
+    encode_pagination_cursor,
+    get_time_period_message,
+)
 from usaspending_api.search.v2.views.spending_by_award import SpendingByAwardVisualizationViewSet, GLOBAL_MAP
 from usaspending_api.common.exceptions import UnprocessableEntityException, InvalidParameterException
 
@@ -22,6 +28,7 @@ def instantiate_view_for_tests():
         "sort_order": "desc",
         "upper_bound": 6,
     }
+    view.search_after = None
     return view
 
 
@@ -133,10 +140,40 @@ def test_populate_response():
     expected_dictionary = {
         "limit": 5,
         "results": ["item 1", "item 2"],
-        "page_metadata": {"page": 1, "hasNext": True},
+        "page_metadata": {"page": 1, "hasNext": True, "cursor": None},
         "messages": [get_time_period_message()],
     }
     assert view.populate_response(results=["item 1", "item 2"], has_next=True) == expected_dictionary
 
     expected_dictionary["results"] = []
     assert view.populate_response(results=[], has_next=True) == expected_dictionary
+
+
+def test_pagination_cursor():
+    context = {"filters": {"award_type_codes": ["A"]}, "sort_key": "Award ID", "sort_order": "desc"}
+    cursor = encode_pagination_cursor(["PIID1", None, 12], context)
+    assert decode_pagination_cursor(cursor, context) == ["PIID1", None, 12]
+
+    with pytest.raises(InvalidParameterException):
+        decode_pagination_cursor(cursor, {**context, "sort_order": "asc"})
+
+    with pytest.raises(InvalidParameterException):
+        decode_pagination_cursor("not a cursor", context)
+
+
+def test_keyset_filter():
+    keyset = SpendingByAwardVisualizationViewSet.keyset_filter(["piid", "subaward_id"], ["PIID1", 5], "desc")
+    assert str(keyset) == str(
+        Q(pk__in=[])
+        | (Q(piid__lt="PIID1") | Q(piid__isnull=True))
+        | (Q(piid="PIID1") & (Q(subaward_id__lt=5) | Q(subaward_id__isnull=True)))
+    )
+
+    # Nothing sorts after a NULL except other NULLs
+    keyset = SpendingByAwardVisualizationViewSet.keyset_filter(["piid", "subaward_id"], [None, 5], "asc")
+    assert str(keyset) == str(
+        Q(pk__in=[]) | (Q(piid__isnull=True) & (Q(subaward_id__gt=5) | Q(subaward_id__isnull=True)))
+    )
+
+    with pytest.raises(InvalidParameterException):
+        SpendingByAwardVisualizationViewSet.keyset_filter(["piid", "subaward_id"], [5], "asc")
@@ -1,16 +1,22 @@
+import heapq
 import logging
+import threading
+
+from collections import OrderedDict
 from decimal import Decimal
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from django.conf import settings
-from elasticsearch_dsl import A, Q as ES_Q
+from elasticsearch_dsl import A, Q as ES_Q, Search
 
 from usaspending_api.awards.v2.lookups.elasticsearch_lookups import (
     TRANSACTIONS_SOURCE_LOOKUP,
     INDEX_ALIASES_TO_AWARD_TYPES,
 )
+from usaspending_api.common.cache import get_data_version
 from usaspending_api.common.data_classes import Pagination
 from usaspending_api.common.elasticsearch.search_wrappers import TransactionSearch, AwardSearch, AccountSearch
+from usaspending_api.common.helpers.dict_helpers import fingerprint_nested_object
 from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.search.v2.es_sanitization import es_minimal_sanitize
 
@@ -213,18 +219,78 @@ def _get_number_of_unique_terms(search, field: str) -> int:
     return response_dict.get("field_count", {"value": 0})["value"]
 
 
+class BucketCount:
+    """
+    Number of unique terms (buckets) of a field in the documents matching a search, used to size the search's terms
+    aggregations and to refuse aggregations with too many buckets.
+
+    Rather than a separate cardinality search before the aggregation search, the count comes from a per-process cache
+    when the same index, query, and field were counted under the current API data version (see
+    usaspending_api.common.cache.get_data_version); otherwise add_to_search adds the cardinality aggregation next to
+    the terms aggregation and read_response picks it up.  Either way the endpoint makes a single round trip.  Until a
+    count is known, `value` is None and terms aggregations should be sized for the most buckets allowed.
+
+    NOTE: Counts below the precision_threshold are expected to be close to accurate (per the Elasticsearch
+          documentation), see _get_number_of_unique_terms.
+    """
+
+    _cache = OrderedDict()
+    _cache_lock = threading.Lock()
+    cache_max_entries = 10000
+
+    def __init__(self, search: Search, field: str, name: str = "bucket_count"):
+        self.field = field
+        self.name = name
+        self.data_version = get_data_version()
+        self.key = fingerprint_nested_object(
+            {"index": search._index, "query": search.to_dict().get("query"), "field": field}
+        )
+        self.value = None
+        if self.data_version is not None:
+            with self._cache_lock:
+                self.value = self._cache.get((self.data_version, self.key))
+
+    def size(self, maximum: int) -> int:
+        return maximum if self.value is None else self.value
+
+    def add_to_search(self, search: Search) -> None:
+        if self.value is None:
+            search.aggs.metric(self.name, A("cardinality", field=self.field, precision_threshold=11000))
+
+    def read_response(self, response: dict) -> int:
+        """Takes the aggregations of the response to the search from add_to_search"""
+        if self.value is None:
+            self.value = response.get(self.name, {"value": 0})["value"]
+            if self.data_version is not None:
+                with self._cache_lock:
+                    self._cache[(self.data_version, self.key)] = self.value
+                    while len(self._cache) > self.cache_max_entries:
+                        self._cache.popitem(last=False)
+        return self.value
+
+
+def get_sum_as_cents_aggregation(field_to_sum: str) -> A:
+    """
+    Sum of a dollar amount in cents.  With ES_SUM_PRECOMPUTED_FIELDS on this adds up the "<field_to_sum>_cents" copy
+    of the field that the loaders index as whole cents; otherwise a script scales each scaled_float value by 100.
+    """
+    if settings.ES_SUM_PRECOMPUTED_FIELDS:
+        return A("sum", field=f"{field_to_sum}_cents")
+    return A("sum", field=field_to_sum, script={"source": "_value * 100"})
+
+
 def get_scaled_sum_aggregations(field_to_sum: str, pagination: Optional[Pagination] = None) -> Dict[str, A]:
     """
     Creates a sum and bucket_sort aggregation that can be used for many different aggregations.
-    The sum aggregation scaled the values by 100 so that the scaled_floats are handled as integers to avoid
-    issues surrounding floats. This does mean that after retrieving results from Elasticsearch something
-    similar to the code below is needed to convert to two decimal places.
+    The sum aggregation adds up the field in cents (see get_sum_as_cents_aggregation) to avoid issues surrounding
+    floats. This does mean that after retrieving results from Elasticsearch something similar to the code below is
+    needed to convert to two decimal places.
 
         Example:
         Decimal(bucket.get("sum_field", {"value": 0})["value"]) / Decimal("100")
 
     """
-    sum_field = A("sum", field=field_to_sum, script={"source": "_value * 100"})
+    sum_field = get_sum_as_cents_aggregation(field_to_sum)
 
     if pagination:
         # Have to create a separate dictionary for the bucket_sort values since "from" is a reserved word
@@ -243,6 +309,65 @@ def get_scaled_sum_aggregations(field_to_sum: str, pagination: Optional[Paginati
         return {"sum_field": sum_field}
 
 
+class _ReversedOrder:
+    """Wraps a value so that it sorts in the reverse of its natural order"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def get_top_buckets_by_sum(
+    search: Search, field: str, sum_aggregation: A, count: int, page_size: int = 10000
+) -> List[dict]:
+    """
+    The `count` buckets of `field` with the largest sums, largest first, shaped like the buckets of a terms aggregation
+    with a "sum_field" metric.  Terms aggregations are limited to 10k buckets; this pages through every bucket with a
+    composite aggregation instead, a page per round trip, keeping only the top `count` buckets seen so far.  Meant for
+    fields with more buckets than a terms aggregation can return; for fewer a terms aggregation is a single search.
+    """
+    # Min-heap of (sum, reversed key, doc_count) so the bucket replaced is the one sorted last: the smallest sum, and of
+    # equal sums the largest key
+    top = []
+    after_key = None
+    pages = 0
+    while True:
+        composite_values = {"size": page_size, "sources": [{"agg_key": {"terms": {"field": field}}}]}
+        if after_key:
+            composite_values["after"] = after_key
+        page_search = search.extra(size=0)
+        page_search.aggs.bucket("group_by_agg_key", A("composite", **composite_values)).metric(
+            "sum_field", sum_aggregation
+        )
+        response = page_search.handle_execute().aggs.to_dict().get("group_by_agg_key", {})
+        pages += 1
+
+        buckets = response.get("buckets", [])
+        for bucket in buckets:
+            entry = (bucket["sum_field"]["value"], _ReversedOrder(bucket["key"]["agg_key"]), bucket["doc_count"])
+            if len(top) < count:
+                heapq.heappush(top, entry)
+            elif entry > top[0]:
+                heapq.heapreplace(top, entry)
+
+        after_key = response.get("after_key")
+        if not after_key or len(buckets) < page_size:
+            break
+
+    logger.info(f"Paged through the '{field}' buckets with {pages:,} composite aggregation searches")
+    return [
+        {"key": key.value, "doc_count": doc_count, "sum_field": {"value": value}}
+        for value, key, doc_count in sorted(top, reverse=True)
+    ]
+
+
 def get_summed_value_as_float(bucket: dict, field: str) -> float:
     """
     Elasticsearch commonly has problems handling the sum of floating point numbers (even if they are stored as
@@ -2,7 +2,7 @@ import copy
 
 from sys import maxsize
 from django.conf import settings
-from django.db.models import F
+from django.db.models import F, Q
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -40,12 +40,16 @@ from usaspending_api.common.cache_decorator import cache_response
 from usaspending_api.common.helpers.api_helper import raise_if_award_types_not_valid_subset, raise_if_sort_key_not_valid
 from usaspending_api.common.helpers.sql_helpers import execute_sql_to_ordered_dictionary
 from usaspending_api.common.query_with_filters import QueryWithFilters
-from usaspending_api.common.helpers.generic_helper import get_generic_filters_message
+from usaspending_api.common.helpers.generic_helper import (
+    decode_pagination_cursor,
+    encode_pagination_cursor,
+    get_generic_filters_message,
+)
 from usaspending_api.common.validator.award_filter import AWARD_FILTER_NO_RECIPIENT_ID
 from usaspending_api.common.validator.pagination import PAGINATION
 from usaspending_api.common.validator.tinyshield import TinyShield
 from usaspending_api.common.recipient_lookups import annotate_prime_award_recipient_id
-from usaspending_api.common.exceptions import UnprocessableEntityException
+from usaspending_api.common.exceptions import InvalidParameterException, UnprocessableEntityException
 from usaspending_api.submissions.models import SubmissionAttributes
 
 logger = logging.getLogger(__name__)
@@ -54,6 +58,7 @@ GLOBAL_MAP = {
     "award": {
         "award_semaphore": "type",
         "internal_id_fields": {"internal_id": "award_id"},
+        "unique_sort_field": "award_id",
         "elasticsearch_type_code_to_field_map": {
             **{award_type: CONTRACT_SOURCE_LOOKUP for award_type in contract_type_mapping},
             **{award_type: IDV_SOURCE_LOOKUP for award_type in idv_type_mapping},
@@ -63,6 +68,7 @@ GLOBAL_MAP = {
     },
     "subaward": {
         "minimum_db_fields": {"subaward_number", "piid", "fain", "award_type", "award_id"},
+        "unique_sort_field": "subaward_id",
         "api_to_db_mapping_list": [contract_subaward_mapping, grant_subaward_mapping],
         "award_semaphore": "award_type",
         "award_id_fields": ["award__piid", "award__fain"],
@@ -109,6 +115,17 @@ class SpendingByAwardVisualizationViewSet(APIView):
         raise_if_award_types_not_valid_subset(self.filters["award_type_codes"], self.is_subaward)
         raise_if_sort_key_not_valid(self.pagination["sort_key"], self.fields, self.is_subaward)
 
+        # Cursors are tied to everything that decides which records come next
+        self.cursor_context = {
+            "filters": json_request["filters"],
+            "sort_key": self.pagination["sort_key"],
+            "sort_order": self.pagination["sort_order"],
+            "subawards": self.is_subaward,
+        }
+        self.search_after = None
+        if json_request.get("cursor"):
+            self.search_after = decode_pagination_cursor(json_request["cursor"], self.cursor_context)
+
         if self.is_subaward:
             response = Response(self.create_response_for_subawards(self.construct_queryset()))
         else:
@@ -151,6 +168,7 @@ class SpendingByAwardVisualizationViewSet(APIView):
                 "required": False,
                 "allow_nulls": True,
             },
+            {"name": "cursor", "key": "cursor", "type": "text", "text_type": "search", "allow_nulls": True},
         ]
         models.extend(copy.deepcopy(AWARD_FILTER_NO_RECIPIENT_ID))
         models.extend(copy.deepcopy(PAGINATION))
@@ -165,17 +183,43 @@ class SpendingByAwardVisualizationViewSet(APIView):
         return "no intersection" in self.filters["award_type_codes"]
 
     def construct_queryset(self):
-        sort_by_fields = self.get_sort_by_fields()
-        database_fields = self.get_database_fields()
+        sort_by_fields = self.get_sort_by_fields() + [self.constants["unique_sort_field"]]
+        database_fields = self.get_database_fields() | set(sort_by_fields)
         base_queryset = self.constants["filter_queryset_func"](self.filters)
         queryset = self.annotate_queryset(base_queryset)
         queryset = self.custom_queryset_order_by(queryset, sort_by_fields, self.pagination["sort_order"])
-        return queryset.values(*list(database_fields))[self.pagination["lower_bound"] : self.pagination["upper_bound"]]
+        queryset = queryset.values(*list(database_fields))
+        if self.search_after is not None:
+            keyset = self.keyset_filter(sort_by_fields, self.search_after, self.pagination["sort_order"])
+            return queryset.filter(keyset)[: self.pagination["limit"] + 1]
+        return queryset[self.pagination["lower_bound"] : self.pagination["upper_bound"]]
+
+    @staticmethod
+    def keyset_filter(sort_field_names, last_values, order):
+        """
+        Records that come after the last_values of the previous page when ordered by sort_field_names with NULLS LAST
+        (see custom_queryset_order_by).  The last sort field must be unique and not null.  This is the keyset (aka
+        seek) equivalent of OFFSET: it reads the same number of index entries for page 1000 as for page 1.
+        """
+        if len(last_values) != len(sort_field_names):
+            raise InvalidParameterException("Field 'cursor' does not match this request")
+        after_lookup = "lt" if order == "desc" else "gt"
+        keyset = Q(pk__in=[])
+        equal_so_far = Q()
+        for field, value in zip(sort_field_names, last_values):
+            if value is None:
+                # NULLs sort last so nothing comes after one except other NULLs with a later tie breaker
+                equal_so_far &= Q(**{f"{field}__isnull": True})
+                continue
+            keyset |= equal_so_far & (Q(**{f"{field}__{after_lookup}": value}) | Q(**{f"{field}__isnull": True}))
+            equal_so_far &= Q(**{field: value})
+        return keyset
 
     def create_response_for_subawards(self, queryset):
         results = []
         rows = list(queryset)
-        for record in rows[: self.pagination["limit"]]:
+        page = rows[: self.pagination["limit"]]
+        for record in page:
             row = {k: record[v] for k, v in self.constants["internal_id_fields"].items()}
 
             for field in self.fields:
@@ -192,7 +236,12 @@ class SpendingByAwardVisualizationViewSet(APIView):
 
         results = self.add_award_generated_id_field(results)
 
-        return self.populate_response(results=results, has_next=len(rows) > self.pagination["limit"])
+        has_next = len(rows) > self.pagination["limit"]
+        cursor = None
+        if has_next:
+            sort_by_fields = self.get_sort_by_fields() + [self.constants["unique_sort_field"]]
+            cursor = encode_pagination_cursor([page[-1][field] for field in sort_by_fields], self.cursor_context)
+        return self.populate_response(results=results, has_next=has_next, cursor=cursor)
 
     def add_award_generated_id_field(self, records):
         """Obtain the generated_unique_award_id and add to response"""
@@ -228,7 +277,7 @@ class SpendingByAwardVisualizationViewSet(APIView):
             elif set(self.filters["award_type_codes"]) <= set(non_loan_assistance_type_mapping):
                 sort_by_fields = [non_loan_assist_mapping[self.pagination["sort_key"]]]
 
-        sort_by_fields.append("award_id")
+        sort_by_fields.append(self.constants["unique_sort_field"])
 
         return sort_by_fields
 
@@ -254,11 +303,11 @@ class SpendingByAwardVisualizationViewSet(APIView):
 
         return queryset.order_by(*order_by_list)
 
-    def populate_response(self, results: list, has_next: bool) -> dict:
+    def populate_response(self, results: list, has_next: bool, cursor: str = None) -> dict:
         return {
             "limit": self.pagination["limit"],
             "results": results,
-            "page_metadata": {"page": self.pagination["page"], "hasNext": has_next},
+            "page_metadata": {"page": self.pagination["page"], "hasNext": has_next, "cursor": cursor},
             "messages": get_generic_filters_message(
                 self.original_filters.keys(), [elem["name"] for elem in AWARD_FILTER_NO_RECIPIENT_ID]
             ),
@@ -278,24 +327,21 @@ class SpendingByAwardVisualizationViewSet(APIView):
                 "Using search_after functionality in Elasticsearch requires both"
                 " last_record_sort_value and last_record_unique_id."
             )
-        if record_num >= settings.ES_AWARDS_MAX_RESULT_WINDOW and (
-            self.last_record_unique_id is None and self.last_record_sort_value is None
-        ):
+        if self.search_after is None and self.last_record_unique_id is not None:
+            self.search_after = [self.last_record_sort_value, self.last_record_unique_id]
+        if record_num >= settings.ES_AWARDS_MAX_RESULT_WINDOW and self.search_after is None:
             raise UnprocessableEntityException(
                 f"Page #{self.pagination['page']} with limit {self.pagination['limit']} is over the maximum result"
-                f" limit {settings.ES_AWARDS_MAX_RESULT_WINDOW}. Please provide the 'last_record_sort_value' and"
-                " 'last_record_unique_id' to paginate sequentially."
-            )
-        # Search_after values are provided in the API request - use search after
-        if self.last_record_sort_value is not None and self.last_record_unique_id is not None:
-            search = (
-                AwardSearch()
-                .filter(filter_query)
-                .sort(*sorts)
-                .extra(search_after=[self.last_record_sort_value, self.last_record_unique_id])[
-                    : self.pagination["limit"] + 1
-                ]  # add extra result to check for next page
+                f" limit {settings.ES_AWARDS_MAX_RESULT_WINDOW}. Please provide the 'cursor' from the previous page to"
+                " paginate sequentially."
             )
+        # A cursor or search_after values are provided in the API request - use search after
+        if self.search_after is not None:
+            if len(self.search_after) != len(sorts):
+                raise InvalidParameterException("Field 'cursor' does not match this request")
+            # add extra result to check for next page
+            search = AwardSearch().filter(filter_query).sort(*sorts).extra(search_after=self.search_after)
+            search = search[: self.pagination["limit"] + 1]
         # no values, within result window, use regular elasticsearch
         else:
             search = AwardSearch().filter(filter_query).sort(*sorts)[record_num : record_num + self.pagination["limit"]]
@@ -355,8 +401,9 @@ class SpendingByAwardVisualizationViewSet(APIView):
 
         last_record_unique_id = None
         last_record_sort_value = None
+        cursor = None
         offset = 1
-        if self.last_record_unique_id is not None:
+        if self.search_after is not None:
             has_next = len(results) > self.pagination["limit"]
             offset = 2
         else:
@@ -366,8 +413,9 @@ class SpendingByAwardVisualizationViewSet(APIView):
             )
 
         if len(response) > 0 and has_next:
-            last_record_unique_id = response[len(response) - offset].meta.sort[1]
-            last_record_sort_value = response[len(response) - offset].meta.sort[0]
+            last_record_sort = list(response[len(response) - offset].meta.sort)
+            last_record_sort_value, last_record_unique_id = last_record_sort
+            cursor = encode_pagination_cursor(last_record_sort, self.cursor_context)
 
         return {
             "limit": self.pagination["limit"],
@@ -377,6 +425,7 @@ class SpendingByAwardVisualizationViewSet(APIView):
                 "hasNext": has_next,
                 "last_record_unique_id": last_record_unique_id,
                 "last_record_sort_value": str(last_record_sort_value),
+                "cursor": cursor,
             },
             "messages": [
                 get_generic_filters_message(
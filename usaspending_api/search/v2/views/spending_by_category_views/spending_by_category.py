@@ -23,8 +23,9 @@ from usaspending_api.common.validator.award_filter import AWARD_FILTER
 from usaspending_api.common.validator.pagination import PAGINATION
 from usaspending_api.common.validator.tinyshield import TinyShield
 from usaspending_api.search.v2.elasticsearch_helper import (
-    get_number_of_unique_terms_for_transactions,
+    BucketCount,
     get_scaled_sum_aggregations,
+    get_top_buckets_by_sum,
 )
 
 logger = logging.getLogger(__name__)
@@ -42,12 +43,14 @@ class AbstractSpendingByCategoryViewSet(APIView, metaclass=ABCMeta):
     Abstract class inherited by the different spending by category endpoints.
     """
 
+    bucket_count: Optional[BucketCount]
     category: Category
     filters: dict
     obligation_column: str
     pagination: Pagination
     subawards: bool
     high_cardinality_categories: List[str] = ["recipient_duns"]
+    composite_page_size: int = 10000
 
     @cache_response()
     def post(self, request: Request) -> Response:
@@ -131,28 +134,27 @@ class AbstractSpendingByCategoryViewSet(APIView, metaclass=ABCMeta):
         # an Elasticsearch cluster that has a "routing" equal to "self.category.agg_key"
         if self.category.name in self.high_cardinality_categories:
             # 10k is the maximum number of allowed buckets
+            self.bucket_count = None
             size = self.pagination.upper_limit
             shard_size = size
             sum_bucket_sort = sum_aggregations["sum_bucket_truncate"]
             group_by_agg_key_values = {"order": {"sum_field": "desc"}}
         else:
-            # Get count of unique buckets; terminate early if there are no buckets matching criteria
-            bucket_count = get_number_of_unique_terms_for_transactions(filter_query, f"{self.category.agg_key}.hash")
-            if bucket_count == 0:
+            # Count of unique buckets; terminate early if there are no buckets matching criteria.  When the count
+            # isn't known yet it is collected along with the aggregation, which is sized for the most buckets allowed
+            # (see query_elasticsearch_for_prime_awards for categories with more buckets than that)
+            self.bucket_count = BucketCount(search, f"{self.category.agg_key}.hash")
+            if self.bucket_count.value == 0:
                 return None
             else:
                 # Add 100 to make sure that we consider enough records in each shard for accurate results;
                 # Only needed for non high-cardinality fields since those are being routed
-                size = bucket_count
-                shard_size = bucket_count + 100
+                size = min(self.bucket_count.size(maximum=10000 - 100), 10000 - 100)
+                shard_size = size + 100
                 sum_bucket_sort = sum_aggregations["sum_bucket_sort"]
                 group_by_agg_key_values = {}
 
-        if shard_size > 10000:
-            logger.warning(f"Max number of buckets reached for aggregation key: {self.category.agg_key}.")
-            raise ElasticsearchConnectionException(
-                "Current filters return too many unique items. Narrow filters to return results."
-            )
+        self.raise_if_too_many_buckets(shard_size)
 
         # Define all aggregations needed to build the response
         group_by_agg_key_values.update({"field": self.category.agg_key, "size": size, "shard_size": shard_size})
@@ -164,19 +166,50 @@ class AbstractSpendingByCategoryViewSet(APIView, metaclass=ABCMeta):
         search.aggs.bucket("group_by_agg_key", group_by_agg_key).metric("sum_field", sum_field).pipeline(
             "sum_bucket_sort", sum_bucket_sort
         )
+        if self.bucket_count:
+            self.bucket_count.add_to_search(search)
 
         # Set size to 0 since we don't care about documents returned
         search.update_from_dict({"size": 0})
 
         return search
 
+    def raise_if_too_many_buckets(self, shard_size: int) -> None:
+        if shard_size > 10000:
+            logger.warning(f"Max number of buckets reached for aggregation key: {self.category.agg_key}.")
+            raise ElasticsearchConnectionException(
+                "Current filters return too many unique items. Narrow filters to return results."
+            )
+
+    def exceeds_terms_aggregation_limit(self) -> bool:
+        """Whether the category has more buckets than the terms aggregation can rank (a routed category never does)"""
+        return bool(self.bucket_count) and (self.bucket_count.value or 0) + 100 > 10000
+
     def query_elasticsearch_for_prime_awards(self, filter_query: ES_Q) -> list:
         search = self.build_elasticsearch_search_with_aggregations(filter_query)
         if search is None:
             return []
-        response = search.handle_execute()
-        results = self.build_elasticsearch_result(response.aggs.to_dict())
-        return results
+        if not self.exceeds_terms_aggregation_limit():
+            response = search.handle_execute().aggs.to_dict()
+            if self.bucket_count:
+                self.bucket_count.read_response(response)
+            if not self.exceeds_terms_aggregation_limit():
+                return self.build_elasticsearch_result(response)
+
+        # The terms aggregation was sized for the most buckets allowed and there are more, so its top sums can't be
+        # trusted.  Page through all of the buckets instead.  The first request to find that out has already run the
+        # terms aggregation for nothing; the count is then cached so later requests with the same filters come
+        # straight here.
+        logger.info(f"{self.bucket_count.value} buckets for '{self.category.agg_key}'; using composite aggregation")
+        buckets = get_top_buckets_by_sum(
+            TransactionSearch().filter(filter_query),
+            self.category.agg_key,
+            get_scaled_sum_aggregations("generated_pragmatic_obligation")["sum_field"],
+            count=self.pagination.upper_limit,
+            page_size=self.composite_page_size,
+        )
+        buckets = buckets[self.pagination.lower_limit : self.pagination.upper_limit]
+        return self.build_elasticsearch_result({"group_by_agg_key": {"buckets": buckets}})
 
     @abstractmethod
     def build_elasticsearch_result(self, response: dict) -> List[dict]:
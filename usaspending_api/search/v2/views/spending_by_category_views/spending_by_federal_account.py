@@ -1,11 +1,10 @@
-import json
-
 from abc import ABCMeta
 from decimal import Decimal
 from django.db.models import QuerySet
 from enum import Enum
 from typing import List
 
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
 from usaspending_api.search.v2.views.spending_by_category_views.spending_by_category import (
     Category,
     AbstractSpendingByCategoryViewSet,
@@ -27,7 +26,7 @@ class AbstractAccountViewSet(AbstractSpendingByCategoryViewSet, metaclass=ABCMet
         results = []
         account_info_buckets = response.get("group_by_agg_key", {}).get("buckets", [])
         for bucket in account_info_buckets:
-            account_info = json.loads(bucket.get("key"))
+            account_info = decode_agg_key(bucket.get("key"))
             results.append(
                 {
                     "amount": int(bucket.get("sum_field", {"value": 0})["value"]) / Decimal("100"),
@@ -1,11 +1,10 @@
-import json
-
 from abc import ABCMeta
 from decimal import Decimal
 from django.db.models import QuerySet, F
 from enum import Enum
 from typing import List
 
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
 from usaspending_api.references.models import Cfda
 from usaspending_api.search.helpers.spending_by_category_helpers import (
     fetch_cfda_id_title_by_number,
@@ -41,7 +40,7 @@ class AbstractIndustryCodeViewSet(AbstractSpendingByCategoryViewSet, metaclass=A
                 industry_code_info = {"code": bucket.get("key")}
                 cfda_code_list.append(industry_code_info["code"])
             else:
-                industry_code_info = json.loads(bucket.get("key"))
+                industry_code_info = decode_agg_key(bucket.get("key"))
 
             results.append(
                 {
@@ -1,9 +1,8 @@
-import json
-
 from decimal import Decimal
 from django.db.models import QuerySet, F, Case, When, Value, IntegerField
 from typing import List
 
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
 from usaspending_api.common.recipient_lookups import combine_recipient_hash_and_level
 from usaspending_api.recipient.models import RecipientProfile
 from usaspending_api.recipient.v2.lookups import SPECIAL_CASES
@@ -65,7 +64,7 @@ class RecipientDunsViewSet(AbstractSpendingByCategoryViewSet):
         results = []
         location_info_buckets = response.get("group_by_agg_key", {}).get("buckets", [])
         for bucket in location_info_buckets:
-            recipient_info = json.loads(bucket.get("key"))
+            recipient_info = decode_agg_key(bucket.get("key"))
 
             results.append(
                 {
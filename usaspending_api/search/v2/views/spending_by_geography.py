@@ -1,5 +1,4 @@
 import copy
-import json
 import logging
 
 from decimal import Decimal
@@ -18,6 +17,7 @@ from usaspending_api.awards.v2.filters.location_filter_geocode import geocode_fi
 from usaspending_api.awards.v2.filters.sub_award import subaward_filter
 from usaspending_api.common.api_versioning import api_transformations, API_TRANSFORM_FUNCTIONS
 from usaspending_api.common.cache_decorator import cache_response
+from usaspending_api.common.elasticsearch.aggregate_key import decode_agg_key
 from usaspending_api.common.elasticsearch.search_wrappers import TransactionSearch
 from usaspending_api.common.helpers.generic_helper import get_generic_filters_message
 from usaspending_api.common.query_with_filters import QueryWithFilters
@@ -26,10 +26,7 @@ from usaspending_api.common.validator.tinyshield import TinyShield
 from usaspending_api.references.abbreviations import code_to_state, fips_to_code, pad_codes
 from usaspending_api.references.models import PopCounty, PopCongressionalDistrict
 from usaspending_api.search.models import SubawardView
-from usaspending_api.search.v2.elasticsearch_helper import (
-    get_scaled_sum_aggregations,
-    get_number_of_unique_terms_for_transactions,
-)
+from usaspending_api.search.v2.elasticsearch_helper import BucketCount, get_scaled_sum_aggregations
 
 logger = logging.getLogger(__name__)
 API_VERSION = settings.API_VERSION
@@ -324,17 +321,19 @@ class SpendingByGeographyVisualizationViewSet(APIView):
         search = TransactionSearch().filter(filter_query)
 
         # Check number of unique terms (buckets) for performance and restrictions on maximum buckets allowed
-        bucket_count = get_number_of_unique_terms_for_transactions(filter_query, f"{self.agg_key}.hash")
+        self.bucket_count = BucketCount(search, f"{self.agg_key}.hash")
 
-        if bucket_count == 0:
+        if self.bucket_count.value == 0:
             return None
 
         # Add 100 to make sure that we consider enough records in each shard for accurate results
-        group_by_agg_key = A("terms", field=self.agg_key, size=bucket_count, shard_size=bucket_count + 100)
+        size = self.bucket_count.size(maximum=10000 - 100)
+        group_by_agg_key = A("terms", field=self.agg_key, size=size, shard_size=size + 100)
         sum_aggregations = get_scaled_sum_aggregations(self.obligation_column)
         sum_field = sum_aggregations["sum_field"]
 
         search.aggs.bucket("group_by_agg_key", group_by_agg_key).metric("sum_field", sum_field)
+        self.bucket_count.add_to_search(search)
 
         # Set size to 0 since we don't care about documents returned
         search.update_from_dict({"size": 0})
@@ -345,7 +344,7 @@ class SpendingByGeographyVisualizationViewSet(APIView):
         results = {}
         geo_info_buckets = response.get("group_by_agg_key", {}).get("buckets", [])
         for bucket in geo_info_buckets:
-            geo_info = json.loads(bucket.get("key"))
+            geo_info = decode_agg_key(bucket.get("key"))
 
             if self.geo_layer == GeoLayer.STATE:
                 display_name = (geo_info.get("state_name") or "").title()
@@ -382,8 +381,9 @@ class SpendingByGeographyVisualizationViewSet(APIView):
         search = self.build_elasticsearch_search_with_aggregation(filter_query)
         if search is None:
             return []
-        response = search.handle_execute()
-        results_dict = self.build_elasticsearch_result(response.aggs.to_dict())
+        response = search.handle_execute().aggs.to_dict()
+        self.bucket_count.read_response(response)
+        results_dict = self.build_elasticsearch_result(response)
 
         if self.geo_layer_filters:
             filtered_shape_codes = set(self.geo_layer_filters) & set(results_dict.keys())
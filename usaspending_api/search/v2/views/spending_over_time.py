@@ -33,6 +33,7 @@ from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.common.validator.award_filter import AWARD_FILTER
 from usaspending_api.common.validator.pagination import PAGINATION
 from usaspending_api.common.validator.tinyshield import TinyShield
+from usaspending_api.search.v2.elasticsearch_helper import get_sum_as_cents_aggregation
 
 logger = logging.getLogger(__name__)
 
@@ -113,7 +114,7 @@ class SpendingOverTimeVisualizationViewSet(APIView):
         group_by_time_period_agg = A(
             "date_histogram", field="fiscal_action_date", interval=interval, format="yyyy-MM-dd"
         )
-        sum_as_cents_agg = A("sum", field="generated_pragmatic_obligation", script={"source": "_value * 100"})
+        sum_as_cents_agg = get_sum_as_cents_aggregation("generated_pragmatic_obligation")
         sum_as_dollars_agg = A(
             "bucket_script", buckets_path={"sum_as_cents": "sum_as_cents"}, script="params.sum_as_cents / 100"
         )
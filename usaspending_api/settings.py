@@ -24,6 +24,17 @@ DOWNLOAD_TIMEOUT_MIN_LIMIT = 10
 # Default timeout for SQL statements in Django
 DEFAULT_DB_TIMEOUT_IN_SECONDS = int(os.environ.get("DEFAULT_DB_TIMEOUT_IN_SECONDS", 0))
 DOWNLOAD_DB_TIMEOUT_IN_HOURS = 4
+# Stream download query results through COPY ... TO STDOUT straight into the zip instead of psql + intermediate files
+DOWNLOAD_STREAMING_EXPORT = os.environ.get("DOWNLOAD_STREAMING_EXPORT", "").lower() in ["true", "1", "yes"]
+# Max number of a download's sources (e.g. contracts, assistance, sub-awards) exported from the DB at the same time.
+# Only applies to psql exports: with DOWNLOAD_STREAMING_EXPORT every source writes into the zip, so they run one by one
+DOWNLOAD_SOURCE_CONCURRENCY = int(os.environ.get("DOWNLOAD_SOURCE_CONCURRENCY", 1))
+# Number of processes compressing a download's split data files at once
+DOWNLOAD_ZIP_WORKERS = int(os.environ.get("DOWNLOAD_ZIP_WORKERS", 1))
+# zlib level (0-9) used to compress the data files of downloads; lower is faster but makes bigger zips
+DOWNLOAD_ZIP_COMPRESSION_LEVEL = (
+    int(os.environ["DOWNLOAD_ZIP_COMPRESSION_LEVEL"]) if os.environ.get("DOWNLOAD_ZIP_COMPRESSION_LEVEL") else None
+)
 CONNECTION_MAX_SECONDS = 10
 
 API_MAX_DATE = "2024-09-30"  # End of FY2024
@@ -137,6 +148,25 @@ ES_TRANSACTIONS_WRITE_ALIAS = "transaction-load-alias"
 ES_TIMEOUT = 90
 ES_REPOSITORY = ""
 ES_ROUTING_FIELD = "recipient_agg_key"
+ES_ETL_CHECKPOINT_DIR = os.environ.get("ES_ETL_CHECKPOINT_DIR", str(REPO_DIR / "es_etl_checkpoints"))
+# Each process shares its Elasticsearch clients (see usaspending_api/common/elasticsearch/client.py). Connections to
+# each node are kept alive for reuse, up to ES_CONNECTIONS_PER_NODE of them.  Sniffing discovers the other nodes of
+# the cluster; leave it off when ES_HOSTNAME is a load balancer or a hosted domain that hides its nodes.
+ES_CONNECTIONS_PER_NODE = int(os.environ.get("ES_CONNECTIONS_PER_NODE", 10))
+ES_SNIFF = os.environ.get("ES_SNIFF", "false").lower() == "true"
+ES_SNIFFER_TIMEOUT_SECONDS = int(os.environ.get("ES_SNIFFER_TIMEOUT_SECONDS", 60))
+# Write the "*_agg_key" fields in the compact format rather than JSON (see common/elasticsearch/aggregate_key.py).
+# Only turn on for loads that build new indexes; an existing index must be loaded with the format it was built with
+ES_COMPACT_AGG_KEYS = os.environ.get("ES_COMPACT_AGG_KEYS", "false").lower() == "true"
+# Sum the whole-cents copies of dollar amounts ("<field>_cents") and the final covid outlays that the loaders index,
+# rather than running a script for every summed document.  Only turn on once the transaction, award and covid19-faba
+# indexes have been reloaded with those fields: sums over an index without them are all 0
+ES_SUM_PRECOMPUTED_FIELDS = os.environ.get("ES_SUM_PRECOMPUTED_FIELDS", "false").lower() == "true"
+
+# Reference data cached per process (see usaspending_api/references/reference_data_cache.py) is reloaded after this
+# many seconds, or sooner when a reference loader records a new version; versions are checked at most this often
+REFERENCE_DATA_CACHE_TTL_SECONDS = int(os.environ.get("REFERENCE_DATA_CACHE_TTL_SECONDS", 60 * 60))
+REFERENCE_DATA_CACHE_VERSION_CHECK_SECONDS = int(os.environ.get("REFERENCE_DATA_CACHE_VERSION_CHECK_SECONDS", 60))
 
 # Grants API
 GRANTS_API_KEY = os.environ.get("GRANTS_API_KEY")
@@ -414,6 +444,20 @@ CACHE_ENVIRONMENTS = {
 # Set the usaspending-cache to whatever our environment cache dictates
 CACHES["usaspending-cache"] = CACHE_ENVIRONMENTS[CACHE_ENVIRONMENT]
 
+# Per-process cache of API responses in front of usaspending-cache (only used when usaspending-cache is enabled)
+API_LOCAL_CACHE_MAX_BYTES = int(os.environ.get("API_LOCAL_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+API_LOCAL_CACHE_TTL_SECONDS = int(os.environ.get("API_LOCAL_CACHE_TTL_SECONDS", 60))
+
+# Concurrent identical API requests wait up to this long for the first of them to cache its response.  Set
+# API_SINGLE_FLIGHT_CROSS_PROCESS to true to also coalesce requests handled by different processes.  It is off by
+# default because with single threaded workers (as uWSGI runs them) every waiting request holds its worker for up to
+# API_SINGLE_FLIGHT_WAIT_SECONDS, so a burst of identical slow requests can tie up most of the workers.
+API_SINGLE_FLIGHT_WAIT_SECONDS = int(os.environ.get("API_SINGLE_FLIGHT_WAIT_SECONDS", 30))
+API_SINGLE_FLIGHT_CROSS_PROCESS = os.environ.get("API_SINGLE_FLIGHT_CROSS_PROCESS", "false").lower() == "true"
+
+# Cached API responses are keyed on the version of the data behind them, which each process checks this often
+API_CACHE_DATA_VERSION_CHECK_SECONDS = int(os.environ.get("API_CACHE_DATA_VERSION_CHECK_SECONDS", 60))
+
 # DRF extensions
 REST_FRAMEWORK_EXTENSIONS = {
     # Not caching errors, these are logged to exceptions.log